@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Measure the reporting flow of ``plugin_helpers.Backend`` end to end against
+the fake Kiwi TCMS server from ``tcms_api.testing``::
+
+    PYTHONPATH=. python benchmarks/backend.py --latency 0.002
+
+For each number of synthetic test results, by default 100, 1000 and 10000,
+report wall time, number of RPC calls and HTTP requests, bytes on the wire
+and CPU time of the client. The server runs in other threads of the same
+process so its CPU time is not included.
+
+Use ``--save`` to append the results to a JSON file and ``--compare`` to
+show the change against the last matching run stored in such a file, e.g.
+one made with a previous version on the same machine::
+
+    git checkout master
+    PYTHONPATH=. python benchmarks/backend.py --save benchmarks/results/backend.json
+    git checkout my-branch
+    PYTHONPATH=. python benchmarks/backend.py --compare benchmarks/results/backend.json
+
+Timings depend on the machine so results aren't part of the repository,
+``benchmarks/results/`` is ignored by git.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from tcms_api import plugin_helpers
+from tcms_api.testing import FakeKiwiServer
+from tcms_api.version import __version__
+
+METRICS = (
+    "wall_seconds",
+    "cpu_seconds",
+    "rpc_calls",
+    "http_requests",
+    "bytes_sent",
+    "bytes_received",
+)
+
+
+def report_results(backend, count):
+    passed = backend.get_status_id("PASSED")
+    failed = backend.get_status_id("FAILED")
+
+    for number in range(count):
+        test_case, _ = backend.test_case_get_or_create(f"tests/test_{number}.py::test")
+        backend.add_test_case_to_plan(test_case["id"], backend.plan_id)
+        for execution in backend.add_test_case_to_run(test_case["id"], backend.run_id):
+            if number % 10:
+                backend.update_test_execution(execution["id"], passed)
+            else:
+                backend.update_test_execution(
+                    execution["id"], failed, "AssertionError: synthetic failure"
+                )
+
+    backend.finish_test_run()
+
+
+def measure(count, latency, protocol):
+    """
+    Report ``count`` results via a new backend against a new server.
+
+    :rtype: dict
+    """
+    with tempfile.TemporaryDirectory() as home:
+        with FakeKiwiServer(latency=latency) as server:
+            url = server.url.replace("xml-rpc", protocol)
+            with open(os.path.join(home, ".tcms.conf"), "w", encoding="utf-8") as file:
+                file.write(
+                    f"[tcms]\nurl = {url}\nusername = tester\npassword = password\n"
+                )
+
+            environment = {
+                "HOME": home,
+                "TCMS_PRODUCT": "Benchmark",
+                "TCMS_PRODUCT_VERSION": __version__,
+                "TCMS_BUILD": str(count),
+            }
+            with patch.dict(os.environ, environment):
+                backend = plugin_helpers.Backend(prefix="[benchmark]")
+                # statuses are cached per class, not per server
+                backend._statuses = {}  # pylint: disable=protected-access
+
+                wall = time.perf_counter()
+                cpu = time.thread_time()
+                backend.configure()
+                report_results(backend, count)
+                cpu = time.thread_time() - cpu
+                wall = time.perf_counter() - wall
+
+            transferred = backend.rpc.transfer_stats()
+            return {
+                "results": count,
+                "wall_seconds": wall,
+                "cpu_seconds": cpu,
+                "rpc_calls": sum(server.calls.values()),
+                "http_requests": server.requests,
+                "bytes_sent": transferred["sent"],
+                "bytes_received": transferred["received"],
+            }
+
+
+def load(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def find_baseline(runs, run):
+    for previous in reversed(runs):
+        if all(previous[key] == run[key] for key in ("protocol", "latency", "sizes")):
+            return previous
+    return None
+
+
+def print_run(run, baseline=None):
+    baseline_rows = {}
+    if baseline:
+        print(f"compared with tcms-api {baseline['version']} ({baseline['date']})")
+        baseline_rows = {row["results"]: row for row in baseline["measurements"]}
+
+    print(f"{'results':>8} " + " ".join(f"{metric:>16}" for metric in METRICS))
+    for row in run["measurements"]:
+        cells = []
+        for metric in METRICS:
+            value = row[metric]
+            cell = f"{value:.3f}" if isinstance(value, float) else str(value)
+            previous = baseline_rows.get(row["results"], {}).get(metric)
+            if previous:
+                cell += f" {(value - previous) / previous:+.0%}"
+            cells.append(f"{cell:>16}")
+        print(f"{row['results']:>8} " + " ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n", maxsplit=1)[0]
+    )
+    parser.add_argument(
+        "--sizes", default="100,1000,10000", help="comma separated numbers of results"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.001, help="seconds per HTTP request"
+    )
+    parser.add_argument(
+        "--protocol", choices=("xml-rpc", "json-rpc"), default="xml-rpc"
+    )
+    parser.add_argument("--save", metavar="PATH", help="append results to this file")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="compare with results in this file"
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    run = {
+        "version": __version__,
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "protocol": args.protocol,
+        "latency": args.latency,
+        "sizes": sizes,
+        "measurements": [measure(size, args.latency, args.protocol) for size in sizes],
+    }
+
+    baseline = find_baseline(load(args.compare), run) if args.compare else None
+    print_run(run, baseline)
+
+    if args.save:
+        runs = load(args.save)
+        runs.append(run)
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(runs, file, indent=2)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Measure the memory used by a large ``TestExecution.filter`` result as
+dictionaries, as compact records from ``tcms_api.records`` converted after
+parsing, like for JSON-RPC, and as records converted while parsing, like
+``FastUnmarshaller(compact_records=True)`` does::
+
+    PYTHONPATH=. python benchmarks/records.py --rows 100000
+
+The result is a synthetic XML-RPC response parsed the same way as a real
+one. Memory is measured with ``tracemalloc`` after the result has been
+parsed, respectively converted, and the peak while doing so. Converting
+after parsing retains less memory but the peak stays the same as for
+dictionaries, converting while parsing lowers the peak as well. The time
+spent parsing and converting is measured separately because tracing slows
+Python down.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from xmlrpc.client import dumps
+
+from tcms_api.records import compact
+from tcms_api.unmarshaller import FastUnmarshaller
+
+
+def execution(number):
+    started = datetime(2025, 1, 1) + timedelta(seconds=number)
+    return {
+        "id": number,
+        "assignee": 3,
+        "assignee__username": "tester",
+        "tested_by": 3,
+        "tested_by__username": "tester",
+        "case_text_version": 1,
+        "start_date": started,
+        "stop_date": started + timedelta(seconds=2),
+        "sortkey": number,
+        "run": 42,
+        "case": number,
+        "case__summary": f"tests/test_{number}.py::test",
+        "build": 7,
+        "build__name": "nightly",
+        "status": 4,
+        "status__name": "PASSED",
+        "status__icon": "fa fa-check-circle-o",
+        "status__color": "#92d400",
+    }
+
+
+def parse(response, compact_records=False):
+    unmarshaller = FastUnmarshaller(compact_records=compact_records)
+    unmarshaller.feed(response)
+    return unmarshaller.close()[0]
+
+
+def measure(response, load):
+    """
+    :return: bytes retained by the result, peak bytes and seconds spent
+             parsing and converting it
+    :rtype: tuple
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = load(response)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    gc.collect()
+    started = time.perf_counter()
+    load(response)
+    return retained, peak, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n", maxsplit=1)[0]
+    )
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    response = dumps(
+        ([execution(number) for number in range(args.rows)],), methodresponse=True
+    ).encode()
+
+    print(
+        f"{'result':>14} {'retained MiB':>14} {'bytes/row':>10} {'peak MiB':>10}"
+        f" {'seconds':>8} {'retained':>9} {'peak':>6}"
+    )
+    baseline = None
+    for name, load in (
+        ("dicts", parse),
+        ("records", lambda response: compact(parse(response))),
+        ("parsed records", lambda response: parse(response, compact_records=True)),
+    ):
+        retained, peak, elapsed = measure(response, load)
+        baseline = baseline or (retained, peak)
+        print(
+            f"{name:>14} {retained / 2**20:>14.1f} {retained // args.rows:>10}"
+            f" {peak / 2**20:>10.1f} {elapsed:>8.2f}"
+            f" {(retained - baseline[0]) / baseline[0]:>+9.0%}"
+            f" {(peak - baseline[1]) / baseline[1]:>+6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Compare tcms_api.unmarshaller.FastUnmarshaller with the XML-RPC decoder
+from the standard library on a large ``TestExecution.filter()`` result::
+
+    PYTHONPATH=. python benchmarks/unmarshaller.py --rows 50000
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+from xmlrpc.client import dumps
+
+from tcms_api.xmlrpc import CookieTransport
+
+sys.path.insert(0, os.path.dirname(__file__))
+# pylint: disable=wrong-import-position,wrong-import-order
+from wire_format import FakeResponse, best_of, test_executions  # noqa: E402
+
+
+def decode(transport, body):
+    return transport.parse_response(FakeResponse(body))
+
+
+def peak_memory(transport, body):
+    tracemalloc.start()
+    result = decode(transport, body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n", maxsplit=1)[0]
+    )
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    body = dumps(
+        (test_executions(args.rows),), methodresponse=True, allow_none=True
+    ).encode()
+
+    results = []
+    for name, fast in (("stdlib", False), ("fast", True)):
+        transport = CookieTransport(fast_unmarshaller=fast)
+        results.append(
+            (
+                name,
+                best_of(args.repeat, lambda t=transport: decode(t, body)),
+                peak_memory(transport, body),
+            )
+        )
+
+    print(f"Decoding {args.rows} rows ({len(body)} bytes), best of {args.repeat}")
+    print(f"{'unmarshaller':<14} {'seconds':>10} {'speedup':>8} {'peak MiB':>10}")
+    for name, seconds, peak in results:
+        print(
+            f"{name:<14} {seconds:>10.3f} {results[0][1] / seconds:>7.1f}x "
+            f"{peak / 1024 / 1024:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Compare the client side cost of XML-RPC and JSON-RPC when receiving large
+results, e.g. ``TestExecution.filter()`` returning many rows::
+
+    PYTHONPATH=. python benchmarks/wire_format.py --rows 50000
+"""
+
+import argparse
+import email.message
+import io
+import json
+import time
+from datetime import datetime, timedelta
+from xmlrpc.client import dumps as xml_dumps
+
+from tcms_api import jsonrpc
+from tcms_api.xmlrpc import CookieTransport
+
+
+class FakeResponse(io.BytesIO):
+    """
+    Quacks like ``http.client.HTTPResponse`` as far as
+    ``Transport.parse_response()`` is concerned.
+    """
+
+    def __init__(self, body):
+        super().__init__(body)
+        self.msg = email.message.Message()
+
+    def getheader(self, _name, default=None):  # pylint: disable=no-self-use
+        return default
+
+
+def test_executions(rows):
+    started = datetime(2025, 1, 1, 10, 0, 0)
+    return [
+        {
+            "id": pk,
+            "assignee": 3,
+            "assignee__username": "tester",
+            "tested_by": 3,
+            "tested_by__username": "tester",
+            "case_text_version": 1,
+            "start_date": started + timedelta(seconds=pk),
+            "stop_date": started + timedelta(seconds=pk + 1),
+            "sortkey": pk,
+            "run": pk // 100,
+            "case": pk,
+            "case__summary": f"Automated test case number {pk}",
+            "build": 1,
+            "build__name": "unspecified",
+            "status": 4,
+            "status__name": "PASSED",
+            "status__color": "#92d400",
+            "status__icon": "fa fa-check-circle-o",
+        }
+        for pk in range(rows)
+    ]
+
+
+def best_of(repeat, function):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n", maxsplit=1)[0]
+    )
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = test_executions(args.rows)
+    xml_body = xml_dumps((rows,), methodresponse=True, allow_none=True).encode()
+    json_body = jsonrpc.dumps({"jsonrpc": "2.0", "id": 1, "result": rows})
+
+    xml_transport = CookieTransport()
+    json_transport = CookieTransport(content_type=jsonrpc.JSON_CONTENT_TYPE)
+
+    results = [
+        (
+            "xml-rpc",
+            len(xml_body),
+            best_of(
+                args.repeat,
+                lambda: xml_transport.parse_response(FakeResponse(xml_body)),
+            ),
+        ),
+        (
+            "json-rpc (json)",
+            len(json_body),
+            best_of(
+                args.repeat,
+                lambda: json.loads(
+                    json_transport.parse_response(FakeResponse(json_body))
+                ),
+            ),
+        ),
+    ]
+    if jsonrpc.orjson is not None:
+        results.append(
+            (
+                "json-rpc (orjson)",
+                len(json_body),
+                best_of(
+                    args.repeat,
+                    lambda: jsonrpc.loads(
+                        json_transport.parse_response(FakeResponse(json_body))
+                    ),
+                ),
+            )
+        )
+
+    print(f"Decoding {args.rows} rows, best of {args.repeat}")
+    print(f"{'protocol':<20} {'bytes':>12} {'seconds':>10} {'speedup':>8}")
+    for name, size, seconds in results:
+        print(
+            f"{name:<20} {size:>12} {seconds:>10.3f} {results[0][2] / seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
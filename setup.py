@@ -45,6 +45,7 @@ setup(
     install_requires=get_install_requires("requirements.txt"),
     extras_require={
         "gssapi": ["gssapi"],
+        "orjson": ["orjson"],
     },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
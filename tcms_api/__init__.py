@@ -80,6 +80,20 @@ where ``EXAMPLE.COM`` matches the realm in your organization.
         import os
         print(os.path.expanduser('~/.tcms.conf'))
 
+    The config file is parsed once per process and again only after it
+    has been modified.
+
+Configuration may also be provided via environment variables, e.g. in
+containers, in which case no config file is read::
+
+    TCMS_URL=https://tcms.server/xml-rpc/
+    TCMS_USERNAME=your-username
+    TCMS_PASSWORD=your-password
+
+or ``TCMS_USE_KERBEROS=True`` instead of username and password. Arguments
+passed to ``TCMS()`` take precedence over environment variables which
+take precedence over config files.
+
 Connect to backend::
 
     from tcms_api import TCMS
@@ -96,6 +110,95 @@ arguments when initializing the TCMS() class::
     TCMS("https://kiwitcms.example.com/xml-rpc/", "api-bot", "keep-me-secret").exec
 
 
+The connection is configured via further keyword arguments to ``TCMS()``,
+or the keys with the same names in the config file. Unknown keyword
+arguments raise ``TypeError``.
+
+The object returned by ``TCMS().exec`` is safe to share between threads.
+Each RPC call checks out a keep-alive connection from a pool while all
+connections share the same session cookie. The pool is configured via:
+
+- ``pool_size`` - max number of connections per host, defaults to 10
+- ``pool_idle_timeout`` - seconds after which an idle connection is
+  closed instead of reused, defaults to 240
+
+Use ``rpc.pool_stats()`` to inspect how the pool is used.
+
+By default the XML-RPC protocol is used. Pass ``protocol="json-rpc"``
+or use a server URL ending in ``/json-rpc/`` to switch to JSON-RPC,
+see :py:mod:`tcms_api.jsonrpc`.
+
+Request bodies larger than ``compress_threshold`` bytes are gzip
+compressed, only use this if the server accepts compressed requests.
+Gzip encoded responses are accepted unless ``accept_gzip = False``.
+Use ``rpc.transfer_stats()`` to confirm the savings.
+
+XML-RPC responses are decoded with a faster unmarshaller which returns
+date & time values as :py:class:`tcms_api.unmarshaller.LazyDateTime`.
+Specify ``fast_unmarshaller = False`` to use the one from the
+standard library instead.
+
+Calls which fail because of transient errors, e.g. *503 Service
+Unavailable*, are retried up to ``max_retries`` times, defaults to 3,
+with jittered exponential backoff starting at ``retry_backoff``
+seconds. At most ``retry_budget`` seconds are spent waiting per call.
+Calls which may have been processed by the server are retried only
+for idempotent methods, see :py:mod:`tcms_api.retry`.
+
+The rate of calls to the server may be limited for the whole
+process with ``read_rate_limit``, ``write_rate_limit``,
+``rate_limit_burst`` and ``max_in_flight``, see
+:py:mod:`tcms_api.ratelimit` and ``rpc.rate_limit_stats()``.
+
+With ``adaptive_concurrency = True`` the number of concurrent calls,
+e.g. from ``rpc.map()`` or multiple threads, is adjusted between 1
+and ``max_concurrency``, defaults to ``pool_size``, depending on
+observed latency and error rate, see :py:mod:`tcms_api.concurrency`
+and ``rpc.concurrency_stats()``.
+
+Per-method metrics are available via ``rpc.stats()`` and
+``rpc.write_metrics(path)`` unless ``metrics = False``.
+
+Calls are recorded as spans when an exporter is configured via
+:py:func:`tcms_api.tracing.set_exporter`.
+
+With ``profile = True`` the time spent in each phase of a request is
+recorded, see ``rpc.phase_stats()`` and ``rpc.phase_report()``.
+
+With ``record = calls.jsonl.gz`` every request and response is
+written to that file. With ``replay = calls.jsonl.gz`` no server is
+contacted and requests are answered from the file, optionally
+delayed by the recorded latency multiplied by
+``replay_latency_scale``, see :py:mod:`tcms_api.replay`. This works
+with ``use_kerberos = True`` too, there is no Kerberos login then.
+
+With ``cache_ttl = 60`` results of ``*.filter`` and ``*.get`` calls
+are cached for 60 seconds in up to ``cache_max_bytes`` bytes of
+memory, 16 MiB by default. Writes made through the same connection
+drop the affected results, see :py:mod:`tcms_api.cache` and
+``rpc.cache_stats()``.
+
+With ``compact_records = True`` dictionaries in lists returned by the
+server, e.g. by ``*.filter``, are replaced with read-only records
+which share their field names and use less memory, see
+:py:mod:`tcms_api.records`.
+
+The connection survives ``fork()``, e.g. by ``multiprocessing`` or
+pytest-xdist. The child process opens its own sockets, replaces locks
+held by threads of the parent and keeps the session cookie. Rate
+limits apply to each process separately and calls made by the child
+aren't recorded, see :py:mod:`tcms_api.forking`. Use
+``rpc.process_pool()`` to distribute calls across worker processes.
+
+When ``use_kerberos = True`` you may also specify
+``kerberos_keep_alive = True``. Then, once a session has been
+established, connections are kept alive and SPNEGO negotiation is
+performed again only if the server responds with 401 Unauthorized.
+
+For asyncio applications use :py:class:`tcms_api.aio.AsyncTCMS`
+which accepts the same arguments.
+
+
 .. important::
 
     For a list of available RPC methods see
@@ -108,27 +211,158 @@ arguments when initializing the TCMS() class::
 """
 
 import os
+import threading
 from configparser import ConfigParser
-from datetime import datetime, timedelta
-
-try:
-    from distutils.util import strtobool  # pylint: disable=deprecated-module
-except ModuleNotFoundError:
-    from setuptools.dist import strtobool
 
+from tcms_api.batch import DEFAULT_BATCH_SIZE
+from tcms_api.callbudget import DEFAULT_THRESHOLD
+from tcms_api.jsonrpc import TCMSJsonrpc, TCMSKerbJsonrpc
+from tcms_api.parallel import ProcessPool
 from tcms_api.xmlrpc import TCMSXmlrpc, TCMSKerbXmlrpc
 
 
+def _strtobool(value):
+    """
+    Same as ``distutils.util.strtobool()`` which isn't available on
+    Python >= 3.12 while ``setuptools`` is very slow to import.
+    """
+    value = value.lower()
+    if value in ("y", "yes", "t", "true", "on", "1"):
+        return 1
+    if value in ("n", "no", "f", "false", "off", "0"):
+        return 0
+    raise ValueError(f"invalid truth value {value!r}")
+
+
+def _boolean(value):
+    if isinstance(value, str):
+        return bool(_strtobool(value))
+    return bool(value)
+
+
+# Connection options which may be passed as keyword arguments to TCMS()
+# or specified in the [tcms] section of the config file
+_OPTIONS = {
+    "pool_size": int,
+    "pool_idle_timeout": float,
+    "kerberos_keep_alive": _boolean,
+    "protocol": str,
+    "compress_threshold": int,
+    "accept_gzip": _boolean,
+    "fast_unmarshaller": _boolean,
+    "max_retries": int,
+    "retry_backoff": float,
+    "retry_budget": float,
+    "read_rate_limit": float,
+    "write_rate_limit": float,
+    "rate_limit_burst": int,
+    "max_in_flight": int,
+    "adaptive_concurrency": _boolean,
+    "max_concurrency": int,
+    "metrics": _boolean,
+    "profile": _boolean,
+    "record": str,
+    "replay": str,
+    "replay_latency_scale": float,
+    "cache_ttl": float,
+    "cache_max_bytes": int,
+    "compact_records": _boolean,
+}
+
+# Config files in order of preference, the first one which exists is used
+_CONFIG_PATHS = ("~/.tcms.conf", "/etc/tcms.conf", "c:/tcms.conf")
+
+# path: ((mtime, size), ConfigParser), see _read_config()
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+_PROTOCOLS = {
+    # protocol: (password client, Kerberos client)
+    "xml-rpc": (TCMSXmlrpc, TCMSKerbXmlrpc),
+    "json-rpc": (TCMSJsonrpc, TCMSKerbJsonrpc),
+}
+
+
+def _check_options(cls, options):
+    """
+    Raises ``TypeError`` for keyword arguments of ``cls()`` which aren't
+    connection options, e.g. misspelled ones.
+    """
+    for name in options:
+        if name not in _OPTIONS and name != "use_kerberos":
+            raise TypeError(
+                f"{cls.__name__}() got an unexpected keyword argument '{name}'"
+            )
+
+
+def _get_options(section):
+    """
+    Returns the known connection options found in a config section,
+    converted to their respective types.
+    """
+    options = {}
+    for name, convert in _OPTIONS.items():
+        value = section.get(name)
+        if value is not None:
+            options[name] = convert(value)
+    return options
+
+
+def _environment_config():
+    """
+    Returns the configuration from ``TCMS_URL``, ``TCMS_USERNAME``,
+    ``TCMS_PASSWORD`` and ``TCMS_USE_KERBEROS`` or None if ``TCMS_URL``
+    isn't set.
+    """
+    url = os.environ.get("TCMS_URL")
+    if not url:
+        return None
+
+    section = {"url": url}
+    for name in ("username", "password", "use_kerberos"):
+        value = os.environ.get(f"TCMS_{name.upper()}")
+        if value is not None:
+            section[name] = value
+    return {"tcms": section}
+
+
+def _read_config():
+    """
+    Returns the path and contents of the first config file which exists.
+    Files are parsed once and again only when they change.
+    """
+    for path in _CONFIG_PATHS:
+        path = os.path.expanduser(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        with _CONFIG_CACHE_LOCK:
+            cached = _CONFIG_CACHE.get(path)
+            if cached is None or cached[0] != version:
+                config = ConfigParser()
+                config.read(path)
+                cached = _CONFIG_CACHE[path] = (version, config)
+        return path, cached[1]
+
+    raise RuntimeError(f"Config file '{path}' not found")
+
+
 class _ConnectionProxy:
     def __init__(self, config):
-        self.__connected_since = datetime(2024, 1, 1, 0, 0)
         self.__connection = None
         self.__config = config
+        self.__lock = threading.Lock()
 
     @staticmethod
-    def server_url(config):
+    def server_url(config, protocol=None):
         """
         Returns the server URL and performs various sanity checks!
+
+        If ``protocol`` is specified the URL is rewritten to point to
+        the respective endpoint, otherwise it is returned as is.
         """
         # Make sure the server URL is set
         try:
@@ -136,53 +370,73 @@ class _ConnectionProxy:
         except (KeyError, AttributeError) as err:
             raise RuntimeError(f"No url found in {config}") from err
 
-        return config["tcms"]["url"].replace("json-rpc", "xml-rpc")
+        if protocol == "json-rpc":
+            return config["tcms"]["url"].replace("xml-rpc", "json-rpc")
+
+        if protocol == "xml-rpc":
+            return config["tcms"]["url"].replace("json-rpc", "xml-rpc")
+
+        if protocol is not None:
+            raise RuntimeError(f"Unsupported protocol '{protocol}'")
+
+        return config["tcms"]["url"]
 
     def create_connection(self):
         # try authentication credentials from Python arguments first
         if self.__config["tcms"]["url"]:
             config = self.__config
+            source = "arguments"
         else:
-            # if not provided then try reading from the filesystem
-            path = os.path.expanduser("~/.tcms.conf")
-
-            # Try system settings when the config does not exist in user directory
-            if not os.path.exists(path):
-                path = "/etc/tcms.conf"
-            if not os.path.exists(path):
-                path = "c:/tcms.conf"
-
-            if not os.path.exists(path):
-                raise RuntimeError(f"Config file '{path}' not found")
-
-            config = ConfigParser()
-            config.read(path)
+            # then environment variables and finally the filesystem
+            config = _environment_config()
+            source = "TCMS_USERNAME/TCMS_PASSWORD"
+            if config is None:
+                path, config = _read_config()
+                source = f"'{path}'"
+
+        # options passed as Python arguments take precedence
+        options = {}
+        if "tcms" in config:
+            options.update(_get_options(config["tcms"]))
+        options.update(_get_options(self.__config["tcms"]))
+
+        # protocol may be specified explicitly or inferred from the URL
+        protocol = options.pop("protocol", None)
+        server_url = self.server_url(config, protocol)
+        if protocol is None:
+            protocol = "json-rpc" if "json-rpc" in server_url else "xml-rpc"
+        password_client, kerberos_client = _PROTOCOLS[protocol]
 
         rpc_implementor = None
-        server_url = self.server_url(config)
-        if strtobool(config["tcms"].get("use_kerberos", "False")):
+        if _strtobool(config["tcms"].get("use_kerberos", "False")):
             # use Kerberos
-            rpc_implementor = TCMSKerbXmlrpc(None, None, server_url)
+            rpc_implementor = kerberos_client(None, None, server_url, **options)
         else:
             try:
                 # use password authentication
-                rpc_implementor = TCMSXmlrpc(
+                rpc_implementor = password_client(
                     config["tcms"]["username"],
                     config["tcms"]["password"],
                     server_url,
+                    **options,
                 )
             except KeyError as err:
-                raise RuntimeError(f"username/password required in '{path}'") from err
+                raise RuntimeError(f"username/password required in {source}") from err
 
-        self.__connected_since = datetime.now()
         return rpc_implementor.server
 
     def __getattr__(self, name):
         """
-        refresh the connection every 4 minutes to avoid an
-        `ssl.SSLEOFError: EOF occurred in violation of protocol` error with Python >= 3.10
-        In practice I've discovered that 5 minutes works as well, 6 minutes fails so
-        be more cautious and refresh the connection earlier!
+        The connection is created once and kept for the lifetime of this object.
+        Sockets which have been idle for longer than ``pool_idle_timeout`` are
+        closed instead of reused to avoid an
+        `ssl.SSLEOFError: EOF occurred in violation of protocol` error with
+        Python >= 3.10, so are idle sockets which the server has closed. If the
+        server drops a kept alive socket before the request has been sent it is
+        sent again on a new socket, keeping the existing session cookie. Once a
+        request has been sent it is retried only according to ``max_retries``
+        because the server may have processed it. Login is performed again only
+        when the server rejects the session.
 
         Side note: originally I thought this is related to calling
         context.set_alpn_protocols(['http/1.1']) inside http/client.py, introduced in
@@ -193,12 +447,256 @@ class _ConnectionProxy:
         # NOTE: Method only called for attributes which don't exist, iow
         # XML-RPC methods, see
         # https://medium.com/@satishgoda/python-attribute-access-using-getattr-and-getattribute-6401f7425ce6
-        if datetime.now() - self.__connected_since > timedelta(minutes=4):
-            self.__connection = self.create_connection()
-        elif self.__connection is None:
-            self.__connection = self.create_connection()
+        return self.connection().__getattr__(name)
+
+    def connection(self):
+        """
+        Returns the underlying :py:class:`tcms_api.xmlrpc.TCMSProxy`,
+        connecting if necessary. Safe to call from multiple threads.
+        """
+        with self.__lock:
+            if self.__connection is None:
+                self.__connection = self.create_connection()
+
+            return self.__connection
+
+    def batch(self, max_size=DEFAULT_BATCH_SIZE):
+        """
+        Returns a :py:class:`tcms_api.batch.Batch` object which packs RPC
+        calls into ``system.multicall`` requests::
+
+            with rpc.batch() as batch:
+                result = batch.TestExecution.update(execution_id, values)
+
+            print(result.result())
+
+        .. versionadded:: 15.1
+
+        :param max_size: Maximum number of calls per request
+        :type max_size: int
+        :rtype: tcms_api.batch.Batch
+        """
+        return self.connection().batch(max_size)
+
+    def profile(self, max_calls=None, threshold=DEFAULT_THRESHOLD):
+        """
+        Context manager which records every RPC call made through this
+        connection while it is active, together with its call site::
+
+            with rpc.profile() as profile:
+                backend.configure()
+
+            print(profile.report())
+            profile.assert_max_calls(10)
 
-        return self.__connection.__getattr__(name)
+        Repeated identical calls and calls made in a loop which could be
+        replaced by a single ``__in`` query or a batch are reported by
+        ``profile.findings()``, see :py:mod:`tcms_api.callbudget`.
+
+        .. versionadded:: 15.1
+
+        :param max_calls: If specified, raise ``AssertionError`` when the
+                          block makes more calls
+        :type max_calls: int
+        :param threshold: Minimum number of repetitions to report
+        :type threshold: int
+        :rtype: tcms_api.callbudget.CallProfile
+        """
+        return self.connection().profile(max_calls, threshold)
+
+    def map(self, methodname, iterable, workers=None):
+        """
+        Calls an RPC method once for each item of ``iterable`` from a pool
+        of threads and yields the results in the same order::
+
+            for executions in rpc.map("TestExecution.filter", queries, workers=8):
+                print(executions)
+
+        Tuples are passed as positional arguments, any other item as the
+        only argument. Single calls may be started in the background with
+        ``rpc.Model.method.submit(...)`` which returns a
+        ``concurrent.futures.Future``, see :py:mod:`tcms_api.parallel`.
+
+        .. versionadded:: 15.1
+
+        :param methodname: Name of the RPC method, e.g. ``TestCase.filter``
+        :type methodname: str
+        :param workers: Number of threads, defaults to ``pool_size``
+        :type workers: int
+        :rtype: generator
+        """
+        return self.connection().map(methodname, iterable, workers)
+
+    def process_pool(self, workers=None):
+        """
+        Returns a :py:class:`tcms_api.parallel.ProcessPool` whose worker
+        processes connect with the same configuration as this object, each
+        with its own connection::
+
+            with rpc.process_pool(workers=4) as pool:
+                for executions in pool.map("TestExecution.filter", queries):
+                    print(executions)
+
+        Use it when parsing large results keeps a CPU busy. For calls which
+        mostly wait on the server ``rpc.map()`` is cheaper.
+
+        .. versionadded:: 15.1
+
+        :param workers: Number of processes, defaults to the number of CPUs
+        :type workers: int
+        :rtype: tcms_api.parallel.ProcessPool
+        """
+        return ProcessPool(workers, **self.__config["tcms"])
+
+    def stats(self):
+        """
+        Returns the number of calls, errors, bytes sent and received,
+        reconnects and a latency histogram for each RPC method called
+        through this connection, see :py:mod:`tcms_api.metrics`.
+
+        .. versionadded:: 15.1
+
+        :return: Metrics by method name or ``None`` if collection is disabled
+        :rtype: dict
+        """
+        metrics = self.connection().metrics
+        if metrics is None:
+            return None
+        return metrics.stats()
+
+    def write_metrics(self, path):
+        """
+        Writes the metrics returned by :py:meth:`stats` to ``path`` in the
+        Prometheus text exposition format.
+
+        .. versionadded:: 15.1
+
+        :param path: Name of the file which is atomically replaced
+        :type path: str
+        """
+        metrics = self.connection().metrics
+        if metrics is None:
+            raise RuntimeError("Metrics collection is disabled")
+        metrics.write_prometheus(path)
+
+    def phase_stats(self):
+        """
+        Returns percentiles of the duration of each phase of a request,
+        i.e. DNS lookup, TCP connect, TLS handshake, sending, waiting for
+        the server and parsing the response, together with the slowest
+        calls, see :py:mod:`tcms_api.profiling`.
+
+        .. versionadded:: 15.1
+
+        :return: Statistics or ``None`` if profiling isn't enabled
+        :rtype: dict
+        """
+        profiler = self.connection()("transport").profiler
+        if profiler is None:
+            return None
+        return profiler.stats()
+
+    def phase_report(self):
+        """
+        Returns :py:meth:`phase_stats` as a human readable table.
+
+        .. versionadded:: 15.1
+
+        :rtype: str
+        """
+        profiler = self.connection()("transport").profiler
+        if profiler is None:
+            raise RuntimeError("Profiling is disabled")
+        return profiler.report()
+
+    def pool_stats(self):
+        """
+        Returns configuration and usage counters of the connection pool.
+
+        .. versionadded:: 15.1
+
+        :rtype: dict
+        """
+        return self.connection()("transport").pool.stats()
+
+    def transfer_stats(self):
+        """
+        Returns the number of bytes sent and received on the wire and
+        before compression, respectively after decompression.
+
+        .. versionadded:: 15.1
+
+        :rtype: dict
+        """
+        return self.connection()("transport").transfer_stats()
+
+    def rate_limit_stats(self):
+        """
+        Returns the number of calls which passed through the rate limiter,
+        how many of them had to wait and for how many seconds in total,
+        separately for reads and writes, see :py:mod:`tcms_api.ratelimit`.
+        The limiter is shared by all connections to the same server in
+        this process.
+
+        .. versionadded:: 15.1
+
+        :return: Statistics or ``None`` if rate limiting isn't enabled
+        :rtype: dict
+        """
+        limiter = self.connection().rate_limiter
+        if limiter is None:
+            return None
+        return limiter.stats()
+
+    def concurrency_stats(self):
+        """
+        Returns the current limit of concurrent calls and the most recent
+        decisions of the adaptive concurrency controller, see
+        :py:mod:`tcms_api.concurrency`.
+
+        .. versionadded:: 15.1
+
+        :return: Statistics or ``None`` if adaptive concurrency isn't enabled
+        :rtype: dict
+        """
+        concurrency = self.connection().concurrency
+        if concurrency is None:
+            return None
+        return concurrency.stats()
+
+    def cache_stats(self):
+        """
+        Returns the number of calls answered from the cache, the number of
+        calls which reached the server and the number and size of cached
+        results, see :py:mod:`tcms_api.cache`.
+
+        .. versionadded:: 15.1
+
+        :return: Statistics or ``None`` if caching isn't enabled
+        :rtype: dict
+        """
+        cache = self.connection().cache
+        if cache is None:
+            return None
+        return cache.stats()
+
+    def connection_stats(self):
+        """
+        Returns how many times a dropped socket has been re-opened, how
+        many times the client had to log in again because the server
+        rejected the session and how many calls have been retried after
+        a transient error.
+
+        .. versionadded:: 15.1
+
+        :rtype: dict
+        """
+        connection = self.connection()
+        return {
+            "reconnects": connection("transport").reconnects,
+            "relogins": connection.relogins,
+            "retries": connection.retry_policy.retries,
+        }
 
 
 class TCMS:  # pylint: disable=too-few-public-methods
@@ -207,12 +705,14 @@ class TCMS:  # pylint: disable=too-few-public-methods
     parses user configuration using a utilities class!
     """
 
-    def __init__(self, url=None, username=None, password=None):
+    def __init__(self, url=None, username=None, password=None, **options):
+        _check_options(type(self), options)
         self.config = {
             "tcms": {
                 "url": url,
                 "username": username,
                 "password": password,
+                **options,
             }
         }
 
@@ -230,5 +730,28 @@ class TCMS:  # pylint: disable=too-few-public-methods
 
             Starting with tcms-api v12.9.1 this property is automatically refreshed
             every 4 minutes to avoid SSL connection timeout errors!
+            Starting with tcms-api v15.1 the session is kept instead. Only
+            sockets which the server has dropped are re-opened and login is
+            performed again only if the server rejects the session, see
+            ``rpc.connection_stats()``. A method which is rejected again
+            right after logging in is missing permissions and doesn't cause
+            further logins until the session changes.
+
+        Keyword arguments passed to ``TCMS()``, or keys with the same names
+        in the config file, configure the connection, see :py:mod:`tcms_api`
+        for details:
+
+        - ``pool_size``, ``pool_idle_timeout`` - the connection pool
+        - ``protocol`` - ``xml-rpc`` or ``json-rpc``
+        - ``compress_threshold``, ``accept_gzip``, ``fast_unmarshaller`` -
+          encoding of requests and responses
+        - ``max_retries``, ``retry_backoff``, ``retry_budget`` - retries
+        - ``read_rate_limit``, ``write_rate_limit``, ``rate_limit_burst``,
+          ``max_in_flight`` - rate limits
+        - ``adaptive_concurrency``, ``max_concurrency`` - concurrent calls
+        - ``metrics``, ``profile`` - metrics and phase timings
+        - ``record``, ``replay``, ``replay_latency_scale`` - recordings
+        - ``cache_ttl``, ``cache_max_bytes``, ``compact_records`` - results
+        - ``kerberos_keep_alive`` - Kerberos connections
         """
         return _ConnectionProxy(self.config)
@@ -0,0 +1,545 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+# pylint: disable=protected-access,too-few-public-methods
+
+"""
+asyncio client for Kiwi TCMS. RPC methods are called the same way as with
+:py:class:`tcms_api.TCMS` but return awaitables::
+
+    import asyncio
+    from tcms_api.aio import AsyncTCMS
+
+    async def main():
+        async with AsyncTCMS().exec as rpc:
+            test_cases = await rpc.TestCase.filter({"pk": 46490})
+
+            # calls are sent concurrently over at most `pool_size` sockets
+            results = await asyncio.gather(
+                *[
+                    rpc.TestExecution.update(execution_id, {"status": 4})
+                    for execution_id in execution_ids
+                ]
+            )
+
+    asyncio.run(main())
+
+Configuration, protocol and authentication are the same as for
+:py:class:`tcms_api.TCMS`. Logging in is performed by the synchronous
+client in a worker thread, including Kerberos, after that RPC calls are
+sent over asyncio streams and share its session cookie.
+
+Each socket carries one request at a time. At most ``pool_size`` sockets
+are opened and further calls wait for one of them to become available.
+
+Rate limits, retries, metrics, tracing, caching and ``compact_records``
+apply the same way as for :py:class:`tcms_api.TCMS`, rate limits are
+shared with synchronous clients for the same server. Waiting doesn't block
+the event loop. Metrics of asyncio calls don't include bytes on the wire
+and ``adaptive_concurrency`` doesn't apply to them.
+"""
+
+import asyncio
+import itertools
+import ssl
+import time
+import urllib.parse
+import zlib
+from http import HTTPStatus
+from http.client import RemoteDisconnected, parse_headers
+from io import BytesIO
+from xmlrpc.client import Fault, ProtocolError, _Method, dumps, gzip_encode
+
+from tcms_api import _ConnectionProxy, _check_options
+from tcms_api import jsonrpc
+from tcms_api.records import compact
+from tcms_api.tracing import TRACER, current_span
+from tcms_api.xmlrpc import _RECONNECT_ERRORS, XML_CONTENT_TYPE
+
+# errors which mean that the server has dropped a keep-alive connection
+_ASYNC_RECONNECT_ERRORS = _RECONNECT_ERRORS + (asyncio.IncompleteReadError,)
+
+
+class _StaleConnection(Exception):
+    """
+    A kept alive connection was closed by the server before the request
+    could be sent, so it is safe to send it on a new connection.
+    """
+
+
+async def _read_headers(reader):
+    lines = []
+    while True:
+        line = await reader.readline()
+        lines.append(line)
+        if line in (b"\r\n", b"\n", b""):
+            return parse_headers(BytesIO(b"".join(lines)))
+
+
+async def _read_chunked(reader):
+    chunks = []
+    while True:
+        size = int((await reader.readline()).split(b";", 1)[0], 16)
+        if size == 0:
+            # skip trailers
+            await _read_headers(reader)
+            return b"".join(chunks)
+
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+async def read_response(reader):
+    """
+    Read an HTTP/1.1 response from an asyncio stream.
+
+    :return: status, reason, headers, body and whether the server will
+             keep the connection open
+    :rtype: tuple
+    """
+    line = await reader.readline()
+    if not line:
+        raise RemoteDisconnected("Remote end closed connection without response")
+
+    version, status, reason = (line.decode("iso-8859-1").strip().split(" ", 2) + [""])[
+        :3
+    ]
+    headers = await _read_headers(reader)
+    keep_alive = (
+        version == "HTTP/1.1" and headers.get("Connection", "").lower() != "close"
+    )
+
+    if headers.get("Transfer-Encoding", "").lower() == "chunked":
+        body = await _read_chunked(reader)
+    elif "Content-Length" in headers:
+        body = await reader.readexactly(int(headers["Content-Length"]))
+    else:
+        body = await reader.read()
+        keep_alive = False
+
+    if headers.get("Content-Encoding", "").lower() == "gzip":
+        body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+
+    return int(status), reason, headers, body, keep_alive
+
+
+class AsyncTransport:  # pylint: disable=too-many-instance-attributes
+    """
+    Sends requests over asyncio streams on behalf of a
+    :py:class:`tcms_api.xmlrpc.CookieTransport`, sharing its cookies,
+    compression settings, unmarshaller and authentication headers.
+
+    Keep-alive connections are reused. At most ``pool_size`` of them are
+    open at the same time and further requests wait for a free one.
+    Connections idle for longer than ``pool_idle_timeout`` are closed
+    instead of reused.
+
+    :param transport: The synchronous transport used to log in
+    :type transport: tcms_api.xmlrpc.CookieTransport
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.size = transport.pool.size
+        self.idle_timeout = transport.pool.idle_timeout
+        self.reconnects = 0
+        # list of (reader, writer, last used timestamp)
+        self._idle = []
+        self._semaphore = None
+
+    def _slots(self):
+        # created lazily because older Python versions bind it to the
+        # event loop which is current at creation time
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+        return self._semaphore
+
+    async def _connect(self, host):
+        parts = urllib.parse.urlsplit("//" + host)
+        context = None
+        if self.transport.scheme == "https":
+            context = getattr(self.transport, "context", None)
+            if context is None:
+                context = ssl.create_default_context()
+
+        return await asyncio.open_connection(
+            parts.hostname,
+            parts.port or (443 if context else 80),
+            ssl=context,
+        )
+
+    async def _acquire(self, host, fresh):
+        """
+        :return: reader, writer and whether the connection has been used
+                 before
+        :rtype: tuple
+        """
+        now = time.monotonic()
+        while self._idle and not fresh:
+            reader, writer, last_used = self._idle.pop()
+            if now - last_used <= self.idle_timeout and not reader.at_eof():
+                return reader, writer, True
+
+            writer.close()
+
+        reader, writer = await self._connect(host)
+        return reader, writer, False
+
+    def close(self):
+        """
+        Close all idle connections.
+        """
+        while self._idle:
+            self._idle.pop()[1].close()
+
+    def _build_request(self, host, handler, request_body, extra_headers):
+        headers = [
+            ("Host", host),
+            ("Content-Type", self.transport.content_type),
+            ("User-Agent", self.transport.user_agent),
+        ]
+        headers.extend(self.transport._headers)
+        headers.extend(extra_headers)
+        if self.transport.accept_gzip_encoding:
+            headers.append(("Accept-Encoding", "gzip"))
+        if not getattr(self.transport, "keep_alive", True):
+            headers.append(("Connection", "close"))
+
+        cookie = self.transport.cookies.header(
+            host, handler, secure=self.transport.scheme == "https"
+        )
+        if cookie:
+            headers.append(("Cookie", cookie))
+
+        threshold = self.transport.encode_threshold
+        if threshold is not None and threshold < len(request_body):
+            headers.append(("Content-Encoding", "gzip"))
+            request_body = gzip_encode(request_body)
+        headers.append(("Content-Length", str(len(request_body))))
+
+        lines = [f"POST {handler} HTTP/1.1"]
+        lines.extend(f"{name}: {value}" for name, value in headers)
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + request_body
+
+    async def request(self, host, handler, request_body, extra_headers=()):
+        """
+        Send a request and return the response body.
+
+        :raises xmlrpc.client.ProtocolError: if the response status isn't 200
+        """
+        async with self._slots():
+            try:
+                return await self._single_request(
+                    host, handler, request_body, extra_headers
+                )
+            except _StaleConnection:
+                pass
+
+            # the broken socket has been closed, other idle sockets were
+            # opened around the same time so don't trust them either
+            self.reconnects += 1
+            self.close()
+            return await self._single_request(
+                host, handler, request_body, extra_headers, fresh=True
+            )
+
+    async def _single_request(  # pylint: disable=too-many-arguments
+        self, host, handler, request_body, extra_headers, fresh=False
+    ):
+        negotiate = False
+        while True:
+            headers = list(extra_headers)
+            headers.extend(self.transport.auth_headers(host, negotiate))
+            status, reason, response_headers, body = await self._send(
+                host, self._build_request(host, handler, request_body, headers), fresh
+            )
+
+            # the server doesn't accept the Kerberos session anymore
+            if (
+                status == HTTPStatus.UNAUTHORIZED
+                and getattr(self.transport, "keep_alive", False)
+                and not negotiate
+            ):
+                negotiate = True
+                continue
+
+            if status != HTTPStatus.OK:
+                raise ProtocolError(
+                    host + handler, status, reason, dict(response_headers.items())
+                )
+
+            self.transport.cookies.update(
+                response_headers.get_all("Set-Cookie", []), host, handler
+            )
+            return body
+
+    async def _send(self, host, request, fresh):
+        reader, writer, reused = await self._acquire(host, fresh)
+        sent = False
+        try:
+            writer.write(request)
+            await writer.drain()
+            sent = True
+            status, reason, headers, body, keep_alive = await read_response(reader)
+        except _ASYNC_RECONNECT_ERRORS as error:
+            writer.close()
+            # once the request has been sent the server may have processed
+            # it, sending it again is up to the caller
+            if reused and not sent:
+                raise _StaleConnection from error
+            raise
+        except BaseException:
+            # includes cancellation, the connection is in an unknown state
+            writer.close()
+            raise
+
+        if keep_alive:
+            self._idle.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+
+        return status, reason, headers, body
+
+
+class AsyncTCMSProxy:
+    """
+    Awaitable counterpart of :py:class:`tcms_api.xmlrpc.TCMSProxy`.
+    Logs in again, in a worker thread, when the server no longer accepts
+    the current session.
+
+    :param server: A proxy which has already logged in
+    :type server: tcms_api.xmlrpc.TCMSProxy
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = AsyncTransport(server("transport"))
+        self._host = server._ServerProxy__host
+        self._handler = server._ServerProxy__handler
+        self._json = self.transport.transport.content_type != XML_CONTENT_TYPE
+        self._ids = itertools.count(1)
+        self._login_lock = None
+
+    def __getattr__(self, name):
+        return _Method(self._request, name)
+
+    async def _request(self, methodname, params):
+        if self.server.cache is None:
+            return await self.__compacted_request(methodname, params)
+
+        return await self.server.cache.async_call(
+            self.__compacted_request, methodname, params
+        )
+
+    async def __compacted_request(self, methodname, params):
+        result = await self.__traced_request(methodname, params)
+        if not self.server.compact_records or methodname.startswith("system."):
+            return result
+
+        return compact(result)
+
+    async def __traced_request(self, methodname, params):
+        if TRACER.exporter is None:
+            return await self.__measured_request(methodname, params)
+
+        with TRACER.span(methodname, host=self._host):
+            return await self.__measured_request(methodname, params)
+
+    async def __measured_request(self, methodname, params):
+        if self.server.metrics is None:
+            return await self.__authenticated_request(methodname, params)
+
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await self.__authenticated_request(methodname, params)
+            failed = False
+            return result
+        finally:
+            self.server.metrics.record(
+                methodname, time.perf_counter() - started, failed
+            )
+
+    async def __authenticated_request(self, methodname, params):
+        relogins = self.server.relogins
+        try:
+            return await self.__send(methodname, params)
+        except Fault as fault:
+            if not self.server._should_relogin(methodname, fault, relogins):
+                raise
+            rejected = fault
+
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+
+        # the same decision as for synchronous calls, made in a worker
+        # thread because logging in blocks
+        async with self._login_lock:
+            relogins = await asyncio.get_running_loop().run_in_executor(
+                None, self.server._relogin, relogins, rejected
+            )
+
+        try:
+            return await self.__send(methodname, params)
+        except Fault as fault:
+            self.server._rejected_after_relogin(methodname, fault, relogins)
+            raise
+
+    async def __send(self, methodname, params):
+        headers = [("Referer", f"{methodname}@{self._host}")]
+        span = current_span()
+        if span is not None:
+            headers.extend(span.headers())
+
+        retry_policy = self.server.retry_policy
+        if retry_policy is None:
+            return await self.__limited_call(methodname, params, headers)
+
+        return await retry_policy.async_call(
+            lambda: self.__limited_call(methodname, params, headers),
+            methodname,
+            params,
+            self.server,
+            sleep=asyncio.sleep,
+        )
+
+    async def __limited_call(self, methodname, params, headers):
+        rate_limiter = self.server.rate_limiter
+        if rate_limiter is None:
+            return await self._call(methodname, params, headers)
+
+        async with rate_limiter.async_limit(methodname, params, sleep=asyncio.sleep):
+            return await self._call(methodname, params, headers)
+
+    async def _call(self, methodname, params, headers):
+        """
+        Marshal the call, send it to the server and return the unmarshalled
+        result.
+        """
+        if self._json:
+            request_body = jsonrpc.dumps(
+                jsonrpc.make_request(methodname, params, next(self._ids))
+            )
+        else:
+            request_body = dumps(
+                params,
+                methodname,
+                encoding=self.server._ServerProxy__encoding,
+                allow_none=self.server._ServerProxy__allow_none,
+            ).encode(self.server._ServerProxy__encoding, "xmlcharrefreplace")
+
+        body = await self.transport.request(
+            self._host, self._handler, request_body, headers
+        )
+
+        if self._json:
+            return jsonrpc.get_result(jsonrpc.loads(body))
+
+        parser, unmarshaller = self.transport.transport.getparser(
+            self.server.compact_records and not methodname.startswith("system.")
+        )
+        parser.feed(body)
+        parser.close()
+        response = unmarshaller.close()
+        if len(response) == 1:
+            response = response[0]
+        return response
+
+    def close(self):
+        """
+        Close all idle connections.
+        """
+        self.transport.close()
+
+
+class _AsyncConnectionProxy:
+    def __init__(self, config):
+        self.__sync = _ConnectionProxy(config)
+        self.__proxy = None
+        self.__lock = None
+
+    async def connection(self):
+        """
+        Returns the underlying :py:class:`AsyncTCMSProxy`, connecting
+        and logging in if necessary.
+        """
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+
+        async with self.__lock:
+            if self.__proxy is None:
+                server = await asyncio.get_running_loop().run_in_executor(
+                    None, self.__sync.connection
+                )
+                self.__proxy = AsyncTCMSProxy(server)
+
+            return self.__proxy
+
+    def __getattr__(self, name):
+        return _Method(self.__request, name)
+
+    async def __request(self, methodname, params):
+        connection = await self.connection()
+        return await connection._request(methodname, params)
+
+    async def __aenter__(self):
+        await self.connection()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close all idle connections.
+        """
+        if self.__proxy is not None:
+            self.__proxy.close()
+
+    def connection_stats(self):
+        """
+        Returns how many times a dropped socket has been re-opened and
+        how many times the client had to log in again because the server
+        rejected the session.
+
+        :rtype: dict
+        """
+        if self.__proxy is None:
+            return {"reconnects": 0, "relogins": 0}
+
+        return {
+            "reconnects": self.__proxy.transport.reconnects,
+            "relogins": self.__proxy.server.relogins,
+        }
+
+
+class AsyncTCMS:
+    """
+    Same as :py:class:`tcms_api.TCMS` but RPC methods return awaitables.
+
+    .. versionadded:: 15.1
+    """
+
+    def __init__(self, url=None, username=None, password=None, **options):
+        _check_options(type(self), options)
+        self.config = {
+            "tcms": {
+                "url": url,
+                "username": username,
+                "password": password,
+                **options,
+            }
+        }
+
+    @property
+    def exec(self):
+        """
+        Property that returns an awaitable proxy on which you can call
+        various server-side functions::
+
+            rpc = AsyncTCMS().exec
+            test_cases = await rpc.TestCase.filter({"pk": 46490})
+
+        The connection is created and login is performed on the first call.
+        Use ``async with`` or call ``rpc.close()`` to close idle connections
+        when done.
+        """
+        return _AsyncConnectionProxy(self.config)
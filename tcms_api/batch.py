@@ -0,0 +1,174 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+# pylint: disable=protected-access
+
+"""
+Batching of RPC calls. Instead of one HTTP round trip per call, calls are
+packed into ``system.multicall`` requests (native batch requests for
+JSON-RPC)::
+
+    rpc = TCMS().exec
+
+    with rpc.batch(max_size=100) as batch:
+        results = [
+            batch.TestExecution.update(execution_id, {"status": status_id})
+            for execution_id in execution_ids
+        ]
+
+    for result in results:
+        if result.fault:
+            print(result.fault)
+        else:
+            print(result.result())
+
+A call which fails doesn't abort the rest of the batch, its fault is
+available via :py:attr:`BatchResult.fault`. If the server doesn't support
+``system.multicall`` the calls are sent one by one. If sending the batch
+fails, e.g. because of a network error, the error is raised by
+:py:meth:`Batch.flush` and set as the fault of each call without a result.
+"""
+
+from xmlrpc.client import Fault, _Method
+
+from tcms_api.records import compact
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def _is_method_not_found(fault):
+    return fault.faultCode == -32601 or "system.multicall" in str(fault.faultString)
+
+
+class BatchResult:
+    """
+    Placeholder for the result of a call added to a :py:class:`Batch`.
+    It is filled in when the batch is sent to the server.
+    """
+
+    def __init__(self, methodname, params):
+        self.methodname = methodname
+        self.params = params
+        self.done = False
+        self.fault = None
+        self._value = None
+
+    def __repr__(self):
+        return f"<BatchResult {self.methodname} done={self.done}>"
+
+    def _set(self, value=None, fault=None):
+        self._value = value
+        self.fault = fault
+        self.done = True
+
+    def result(self):
+        """
+        :return: The value returned by the server
+        :raises RuntimeError: if the batch hasn't been sent yet
+        :raises xmlrpc.client.Fault: if the call failed, or the error
+                                     which prevented sending it
+        """
+        if not self.done:
+            raise RuntimeError(f"{self.methodname}() hasn't been sent yet")
+
+        if self.fault is not None:
+            raise self.fault
+
+        return self._value
+
+
+class Batch:
+    """
+    Collects RPC calls and sends them to the server in groups of up to
+    ``max_size`` calls. Usually used as a context manager, pending calls are
+    sent when the ``with`` block exits without an exception.
+
+    :param proxy: The proxy used to send calls
+    :type proxy: tcms_api.xmlrpc.TCMSProxy
+    :param max_size: Maximum number of calls per ``system.multicall`` request
+    :type max_size: int
+    """
+
+    def __init__(self, proxy, max_size=DEFAULT_BATCH_SIZE):
+        if max_size < 1:
+            raise ValueError(f"Batch size must be a positive number, not {max_size}")
+
+        self._proxy = proxy
+        self._pending = []
+        self.max_size = max_size
+        # None means the server hasn't been asked yet
+        self.multicall_supported = None
+
+    def __getattr__(self, name):
+        return _Method(self.__add, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+    def __add(self, methodname, params):
+        result = BatchResult(methodname, params)
+        self._pending.append(result)
+        if len(self._pending) >= self.max_size:
+            self.flush()
+        return result
+
+    def flush(self):
+        """
+        Send all pending calls to the server.
+        """
+        calls, self._pending = self._pending, []
+        if not calls:
+            return
+
+        try:
+            responses = None
+            if self.multicall_supported is not False:
+                responses = self._multicall(calls)
+
+            if responses is None:
+                self._send_one_by_one(calls)
+                return
+        except Exception as error:
+            # don't leave callers without a result
+            for call in calls:
+                if not call.done:
+                    call._set(fault=error)
+            raise
+
+        for call, response in zip(calls, responses):
+            if isinstance(response, dict):
+                call._set(fault=Fault(response["faultCode"], response["faultString"]))
+            elif self._proxy.compact_records:
+                call._set(value=compact(response[0]))
+            else:
+                call._set(value=response[0])
+
+    def _multicall(self, calls):
+        """
+        :return: The responses or ``None`` if the server doesn't support
+                 ``system.multicall``
+        """
+        try:
+            responses = self._proxy.system.multicall(
+                [
+                    {"methodName": call.methodname, "params": list(call.params)}
+                    for call in calls
+                ]
+            )
+        except Fault as fault:
+            if self.multicall_supported or not _is_method_not_found(fault):
+                raise
+            self.multicall_supported = False
+            return None
+
+        self.multicall_supported = True
+        return responses
+
+    def _send_one_by_one(self, calls):
+        for call in calls:
+            try:
+                call._set(value=getattr(self._proxy, call.methodname)(*call.params))
+            except Fault as fault:
+                call._set(fault=fault)
@@ -0,0 +1,242 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Caching of read-only RPC calls, used by
+:py:class:`tcms_api.xmlrpc.TCMSProxy`::
+
+    rpc = TCMS(cache_ttl=60).exec
+
+    for _ in range(100):
+        # only the first call reaches the server
+        rpc.Priority.filter({})
+
+    print(rpc.cache_stats())
+
+Results of ``*.filter`` and ``*.get`` calls are kept for ``cache_ttl``
+seconds, keyed by method name and arguments. When the cached results
+would take more than ``cache_max_bytes`` bytes of memory the least
+recently used ones are evicted. Callers receive copies so modifying a
+result doesn't modify the cache.
+
+``Model.create``, ``Model.update`` and ``Model.remove`` calls made through
+the same connection drop the cached results of ``Model``. Other calls
+which modify data, e.g. ``TestRun.add_case``, may change several models
+and drop all cached results. Changes made by other clients are visible
+only after the results expire.
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+
+from tcms_api import forking
+from tcms_api.ratelimit import is_read
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# methods whose results are cached
+CACHED_METHODS = ["*.filter", "*.get"]
+
+# methods which only modify the records of their own model
+MODEL_WRITES = ("create", "update", "remove")
+
+
+def _key(methodname, params):
+    return methodname, json.dumps(params, sort_keys=True, default=str)
+
+
+def _copy(value):
+    """
+    :return: A copy of lists and dictionaries in ``value``, other values,
+             including :py:class:`tcms_api.records.Record`, are immutable
+             and returned as they are
+    """
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _size(value):
+    """
+    :return: Approximate number of bytes used by ``value``
+    :rtype: int
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_size(key) + _size(item) for key, item in value.items())
+    elif isinstance(value, list):
+        size += sum(_size(item) for item in value)
+    elif isinstance(value, tuple):
+        # records iterate over their field names, which are shared
+        size += sum(_size(item) for item in tuple.__iter__(value))
+    return size
+
+
+class ResponseCache:  # pylint: disable=too-many-instance-attributes
+    """
+    Least recently used cache of RPC results which expire after ``ttl``
+    seconds.
+
+    :param ttl: Seconds after which a result is fetched again
+    :type ttl: float
+    :param max_bytes: Approximate maximum size of all cached results
+    :type max_bytes: int
+    :param clock: Returns the current time in seconds
+    :type clock: callable
+    """
+
+    def __init__(self, ttl, max_bytes=DEFAULT_MAX_BYTES, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires, size, model, result), least recently used first
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # model -> number of times its results have been dropped, a result
+        # fetched while that happens is not cached
+        self._generations = {}
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evicted": 0,
+            "invalidated": 0,
+        }
+        forking.register(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def call(self, function, methodname, params):
+        """
+        Return a cached result or call ``function`` and cache its result.
+        Calls which modify data drop cached results once they return, also
+        results of reads which were in progress at the same time.
+        """
+        if not is_read(methodname, params):
+            try:
+                return function(methodname, params)
+            finally:
+                self._invalidate_for(methodname, params)
+
+        if not any(fnmatchcase(methodname, pattern) for pattern in CACHED_METHODS):
+            return function(methodname, params)
+
+        hit, value = self._lookup(methodname, params)
+        if hit:
+            return value
+
+        result = function(methodname, params)
+        self._store(*value, result)
+        return result
+
+    async def async_call(self, function, methodname, params):
+        """
+        Same as :py:meth:`call` for a coroutine ``function``.
+        """
+        if not is_read(methodname, params):
+            try:
+                return await function(methodname, params)
+            finally:
+                self._invalidate_for(methodname, params)
+
+        if not any(fnmatchcase(methodname, pattern) for pattern in CACHED_METHODS):
+            return await function(methodname, params)
+
+        hit, value = self._lookup(methodname, params)
+        if hit:
+            return value
+
+        result = await function(methodname, params)
+        self._store(*value, result)
+        return result
+
+    def _lookup(self, methodname, params):
+        """
+        :return: ``True`` and a copy of the cached result or ``False`` and
+                 the arguments for :py:meth:`_store` except the result
+        :rtype: tuple
+        """
+        key = _key(methodname, params)
+        model = methodname.split(".")[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return True, _copy(entry[3])
+
+            if entry is not None:
+                self._counters["expired"] += 1
+                self._remove(key)
+            self._counters["misses"] += 1
+            generation = self._generations.get(model, 0), self._generations.get(None, 0)
+        return False, (key, model, generation)
+
+    def _store(self, key, model, generation, result):
+        cached = _copy(result)
+        size = _size(cached)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if generation != (
+                self._generations.get(model, 0),
+                self._generations.get(None, 0),
+            ):
+                return
+
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self.clock() + self.ttl, size, model, cached)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._counters["evicted"] += 1
+
+    def _remove(self, key):
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _invalidate_for(self, methodname, params):
+        if methodname == "system.multicall":
+            for call in params[0] if params else []:
+                if not is_read(call["methodName"]):
+                    self._invalidate_for(call["methodName"], call["params"])
+            return
+
+        model, _, name = methodname.rpartition(".")
+        self.invalidate(model if name in MODEL_WRITES else None)
+
+    def invalidate(self, model=None):
+        """
+        Drop the cached results of ``model``, e.g. ``TestCase``, or all
+        cached results when ``model`` is ``None``.
+        """
+        with self._lock:
+            self._generations[model] = self._generations.get(model, 0) + 1
+            for key in list(self._entries):
+                if model is None or self._entries[key][2] == model:
+                    self._remove(key)
+                    self._counters["invalidated"] += 1
+
+    def stats(self):
+        """
+        :return: Number of hits, misses, expired, evicted and invalidated
+                 results together with the number and size of cached results
+        :rtype: dict
+        """
+        with self._lock:
+            result = dict(self._counters)
+            result["entries"] = len(self._entries)
+            result["bytes"] = self._bytes
+            result["ttl"] = self.ttl
+            result["max_bytes"] = self.max_bytes
+        return result
@@ -0,0 +1,284 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Profiling of the number of RPC calls made by a piece of code::
+
+    rpc = TCMS().exec
+
+    with rpc.profile() as profile:
+        for case_id in case_ids:
+            rpc.TestCase.filter({"pk": case_id})
+
+    print(profile.report())
+
+Every call made through the connection while the block runs, from any
+thread, is recorded together with the place in the calling code, i.e.
+the first frame outside of ``tcms_api`` or in
+:py:mod:`tcms_api.plugin_helpers`. Calls are grouped by method and by the
+shape of their arguments, i.e. the argument structure without values.
+:py:meth:`CallProfile.findings` flags identical calls made repeatedly
+and calls made in a loop from the same place which could be a single
+``__in`` query or a batch via ``rpc.batch()``.
+
+In tests, limit the number of calls for a workload::
+
+    with rpc.profile(max_calls=5):
+        backend.configure()
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import xmlrpc.client
+from collections import Counter
+from concurrent import futures
+from contextlib import contextmanager
+
+from tcms_api import forking
+
+# identical calls or calls from the same place made at least this many
+# times are reported
+DEFAULT_THRESHOLD = 3
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_PLUGIN_HELPERS = os.path.join(_PACKAGE_DIR, "plugin_helpers.py")
+_SKIPPED = (
+    _PACKAGE_DIR + os.sep,
+    os.path.dirname(os.path.abspath(futures.__file__)) + os.sep,
+    os.path.abspath(xmlrpc.client.__file__),
+    os.path.abspath(threading.__file__),
+)
+
+
+def call_site(depth=1):
+    """
+    :return: ``file:line function`` of the code which made an RPC call
+    :rtype: str
+    """
+    frame = sys._getframe(depth)  # pylint: disable=protected-access
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename == _PLUGIN_HELPERS or not filename.startswith(_SKIPPED):
+            return f"{filename}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+def shape(value):
+    """
+    :return: The structure of ``value`` with type names instead of values,
+             e.g. ``{"pk": int}``
+    :rtype: str
+    """
+    if isinstance(value, dict):
+        items = ", ".join(f'"{key}": {shape(value[key])}' for key in sorted(value))
+        return "{" + items + "}"
+    if isinstance(value, (list, tuple)):
+        return "[...]" if value else "[]"
+    return type(value).__name__
+
+
+def _canonical(params):
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class ProfiledCall:  # pylint: disable=too-few-public-methods
+    """
+    A single RPC call. ``duration`` is in seconds and includes retries.
+    """
+
+    __slots__ = ("methodname", "params", "site", "duration", "failed")
+
+    def __init__(self, methodname, params, site):
+        self.methodname = methodname
+        self.params = params
+        self.site = site
+        self.duration = None
+        self.failed = False
+
+    @property
+    def shape(self):
+        return f"{self.methodname}({', '.join(shape(param) for param in self.params)})"
+
+
+def _suggestion(calls):
+    """
+    Suggest how calls of the same shape from the same place could be
+    replaced by a single call.
+    """
+    methodname = calls[0].methodname
+    first = calls[0].params
+    if (
+        methodname.endswith(".filter")
+        and len(first) == 1
+        and isinstance(first[0], dict)
+    ):
+        varying = {
+            key
+            for call in calls
+            for key, value in call.params[0].items()
+            if first[0].get(key) != value
+        }
+        if len(varying) == 1:
+            key = varying.pop()
+            if not key.endswith("__in"):
+                key = "pk" if key == "id" else key
+                return f'{methodname}({{"{key}__in": [...]}})'
+
+    return "rpc.batch()"
+
+
+class CallProfile:
+    """
+    Calls recorded by :py:meth:`tcms_api.xmlrpc.TCMSProxy.profile`.
+
+    :param threshold: Minimum number of repetitions to report
+    :type threshold: int
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def record(self, call):
+        with self._lock:
+            self.calls.append(call)
+
+    def __len__(self):
+        return len(self.calls)
+
+    def by_method(self):
+        """
+        :return: Number of calls per method name
+        :rtype: collections.Counter
+        """
+        return Counter(call.methodname for call in self.calls)
+
+    def by_shape(self):
+        """
+        :return: Number of calls per method name and argument shape
+        :rtype: collections.Counter
+        """
+        return Counter(call.shape for call in self.calls)
+
+    def findings(self):
+        """
+        :return: Repeated identical calls (``duplicate``) and calls of the
+                 same shape from the same place (``loop``), most frequent
+                 first, with a suggestion how to replace them
+        :rtype: list
+        """
+        identical = {}
+        loops = {}
+        for call in list(self.calls):
+            identical.setdefault((call.methodname, _canonical(call.params)), []).append(
+                call
+            )
+            loops.setdefault((call.shape, call.site), []).append(call)
+
+        findings = []
+        for (methodname, params), calls in identical.items():
+            if len(calls) >= self.threshold:
+                findings.append(
+                    {
+                        "kind": "duplicate",
+                        "call": f"{methodname}{params}",
+                        "count": len(calls),
+                        "sites": sorted({call.site for call in calls}),
+                        "suggestion": "cache the result",
+                    }
+                )
+
+        for (call_shape, site), calls in loops.items():
+            distinct = {_canonical(call.params) for call in calls}
+            if len(distinct) >= self.threshold:
+                findings.append(
+                    {
+                        "kind": "loop",
+                        "call": call_shape,
+                        "count": len(calls),
+                        "sites": [site],
+                        "suggestion": _suggestion(calls),
+                    }
+                )
+
+        return sorted(findings, key=lambda finding: -finding["count"])
+
+    def report(self):
+        """
+        :return: Calls per method and shape followed by the findings
+        :rtype: str
+        """
+        duration = sum(call.duration or 0 for call in self.calls)
+        lines = [f"{len(self.calls)} calls, {duration:.3f} seconds"]
+        for call_shape, count in self.by_shape().most_common():
+            lines.append(f"{count:>8} {call_shape}")
+
+        for finding in self.findings():
+            lines.append("")
+            lines.append(
+                f"{finding['kind']}: {finding['call']} x {finding['count']}, "
+                f"try {finding['suggestion']}"
+            )
+            lines.extend(f"    at {site}" for site in finding["sites"])
+
+        return "\n".join(lines) + "\n"
+
+    def assert_max_calls(self, max_calls, methodname=None):
+        """
+        :raises AssertionError: if more than ``max_calls`` calls, of
+                                ``methodname`` if specified, were made
+        """
+        count = self.by_method()[methodname] if methodname else len(self.calls)
+        if count > max_calls:
+            raise AssertionError(
+                f"{count} calls{' of ' + methodname if methodname else ''} "
+                f"made, expected at most {max_calls}\n{self.report()}"
+            )
+
+
+class CallRecorder:
+    """
+    Keeps the active profiles of a proxy and records calls into them.
+    """
+
+    def __init__(self):
+        self.profiles = []
+        self._lock = threading.Lock()
+        forking.register(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile(self, max_calls=None, threshold=DEFAULT_THRESHOLD):
+        profile = CallProfile(threshold)
+        with self._lock:
+            self.profiles.append(profile)
+        try:
+            yield profile
+        finally:
+            with self._lock:
+                self.profiles.remove(profile)
+
+        if max_calls is not None:
+            profile.assert_max_calls(max_calls)
+
+    def call(self, function, methodname, params):
+        """
+        Call ``function`` and record it into all active profiles.
+        """
+        call = ProfiledCall(methodname, params, call_site())
+        started = time.perf_counter()
+        try:
+            return function(methodname, params)
+        except Exception:
+            call.failed = True
+            raise
+        finally:
+            call.duration = time.perf_counter() - started
+            for profile in list(self.profiles):
+                profile.record(call)
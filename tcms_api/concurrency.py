@@ -0,0 +1,177 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Adaptive limit of concurrent RPC calls, used by
+:py:class:`tcms_api.xmlrpc.TCMSProxy` when ``adaptive_concurrency = True``.
+
+The limit follows the additive increase/multiplicative decrease (AIMD)
+scheme used by TCP congestion control. After every window of completed
+calls the average latency is compared to the lowest latency observed so
+far:
+
+- when the error rate or latency rises the limit is halved;
+- when latency stays flat and calls had to wait for a free slot the limit
+  grows by one;
+- otherwise it is kept.
+
+Threads which call the proxy concurrently, e.g. via ``rpc.map()``, wait
+when the limit has been reached. Every decision is recorded so it may be
+charted, see :py:meth:`AdaptiveConcurrency.stats`.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.client import HTTPException
+from xmlrpc.client import ProtocolError
+
+from tcms_api import forking
+
+# number of decisions kept for inspection
+_HISTORY_SIZE = 100
+
+
+class AdaptiveConcurrency:  # pylint: disable=too-many-instance-attributes
+    """
+    :param max_limit: Upper bound of the limit, usually the size of the
+                      connection pool
+    :type max_limit: int
+    :param min_limit: Lower bound of the limit
+    :type min_limit: int
+    :param initial_limit: Limit before any calls have completed, defaults
+                          to half of ``max_limit``
+    :type initial_limit: int
+    :param window: Minimum number of completed calls between decisions,
+                   at least ``limit`` calls complete between decisions
+    :type window: int
+    :param latency_tolerance: Latency is considered to rise when the average
+                              of a window exceeds the baseline this many times
+    :type latency_tolerance: float
+    :param error_threshold: Error rate of a window above which the limit
+                            is decreased
+    :type error_threshold: float
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        max_limit,
+        *,
+        min_limit=1,
+        initial_limit=None,
+        window=10,
+        latency_tolerance=2.0,
+        error_threshold=0.1,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.window = window
+        self.latency_tolerance = latency_tolerance
+        self.error_threshold = error_threshold
+        self.limit = float(
+            min(max_limit, max(min_limit, initial_limit or max_limit // 2))
+        )
+        self.baseline = None
+        self.decisions = deque(maxlen=_HISTORY_SIZE)
+
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._samples = []
+        # did any call wait for a free slot during the current window
+        self._saturated = False
+        forking.register(self)
+
+    def _after_fork(self):
+        # calls in flight belong to threads of the parent, the limit is kept
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._samples = []
+        self._saturated = False
+
+    @contextmanager
+    def slot(self):
+        """
+        Context manager which waits until fewer than ``limit`` calls are in
+        flight and records the latency and outcome of the call made inside
+        of it. Server faults count as successful calls, transport errors
+        count as failures.
+        """
+        with self._condition:
+            if self._in_flight >= int(self.limit):
+                self._saturated = True
+                while self._in_flight >= int(self.limit):
+                    self._condition.wait()
+            self._in_flight += 1
+
+        started = time.monotonic()
+        failed = False
+        try:
+            yield
+        except (ProtocolError, OSError, HTTPException):
+            failed = True
+            raise
+        finally:
+            self._completed(time.monotonic() - started, failed)
+
+    def _completed(self, latency, failed):
+        with self._condition:
+            self._in_flight -= 1
+            self._samples.append((latency, failed))
+            if len(self._samples) >= max(self.window, int(self.limit)):
+                self._decide()
+            self._condition.notify_all()
+
+    def _decide(self):
+        successful = [latency for latency, failed in self._samples if not failed]
+        error_rate = 1 - len(successful) / len(self._samples)
+        latency = sum(successful) / len(successful) if successful else None
+        self._samples = []
+
+        if latency is not None:
+            if self.baseline is None or latency < self.baseline:
+                self.baseline = latency
+            else:
+                # let the baseline follow lasting changes slowly
+                self.baseline += (latency - self.baseline) * 0.05
+
+        if error_rate > self.error_threshold:
+            reason = "errors"
+        elif latency is not None and latency > self.baseline * self.latency_tolerance:
+            reason = "latency"
+        elif self._saturated:
+            reason = "increase"
+        else:
+            reason = "keep"
+
+        previous = self.limit
+        if reason in ("errors", "latency"):
+            self.limit = max(float(self.min_limit), self.limit / 2)
+        elif reason == "increase":
+            self.limit = min(float(self.max_limit), self.limit + 1)
+        self._saturated = False
+
+        self.decisions.append(
+            {
+                "time": time.time(),
+                "reason": reason,
+                "previous_limit": int(previous),
+                "limit": int(self.limit),
+                "latency": latency,
+                "baseline": self.baseline,
+                "error_rate": error_rate,
+            }
+        )
+
+    def stats(self):
+        """
+        :return: Current limit, number of calls in flight, baseline latency
+                 and the most recent decisions, oldest first
+        :rtype: dict
+        """
+        with self._condition:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self._in_flight,
+                "baseline": self.baseline,
+                "decisions": list(self.decisions),
+            }
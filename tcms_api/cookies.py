@@ -0,0 +1,232 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Cookie storage used by :py:class:`tcms_api.xmlrpc.CookieTransport`.
+
+Cookies are keyed by domain, path and name so a cookie which the server
+sets again replaces the previous value instead of being sent twice. Expired
+cookies are dropped and the ``Cookie`` header never grows beyond
+``max_header_size`` bytes, no matter how many responses the process
+receives. Cookies with the ``Secure`` attribute are only sent over HTTPS.
+"""
+
+import threading
+import time
+import urllib.parse
+from email.utils import parsedate_to_datetime
+
+# limits recommended as a minimum by RFC 6265, section 6.1
+DEFAULT_MAX_COOKIES = 50
+DEFAULT_MAX_HEADER_SIZE = 4096
+
+
+def split_host(host):
+    """
+    :return: The lower case hostname from ``host[:port]``
+    :rtype: str
+    """
+    return urllib.parse.urlsplit("//" + host).hostname or ""
+
+
+def _default_path(path):
+    # RFC 6265, section 5.1.4
+    path = urllib.parse.urlsplit(path).path
+    if not path.startswith("/") or path.count("/") == 1:
+        return "/"
+    return path[: path.rindex("/")]
+
+
+def _domain_match(hostname, domain, host_only):
+    if hostname == domain:
+        return True
+    return not host_only and hostname.endswith("." + domain)
+
+
+def _path_match(path, cookie_path):
+    if path == cookie_path:
+        return True
+    return path.startswith(cookie_path) and (
+        cookie_path.endswith("/") or path[len(cookie_path)] == "/"
+    )
+
+
+def _parse(header):
+    """
+    :return: name, value and lower case attributes of a ``Set-Cookie``
+             header, name is empty if the header is invalid
+    :rtype: tuple
+    """
+    pair, *attributes = header.split(";")
+    name, separator, value = pair.partition("=")
+    if not separator:
+        return "", "", {}
+
+    options = {}
+    for attribute in attributes:
+        key, _, option = attribute.partition("=")
+        options[key.strip().lower()] = option.strip()
+    return name.strip(), value.strip(), options
+
+
+def _expires(options):
+    # Max-Age takes precedence over Expires, RFC 6265, section 5.3
+    try:
+        if "max-age" in options:
+            return time.time() + int(options["max-age"])
+        if "expires" in options:
+            return parsedate_to_datetime(options["expires"]).timestamp()
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class _Cookie:  # pylint: disable=too-few-public-methods
+    __slots__ = ("value", "expires", "host_only", "secure", "created")
+
+    def __init__(self, value, expires, host_only, secure):
+        self.value = value
+        self.expires = expires
+        self.host_only = host_only
+        self.secure = secure
+        self.created = time.monotonic()
+
+
+class CookieJar:
+    """
+    A thread-safe store of cookies keyed by ``(domain, path, name)``.
+
+    :param max_cookies: When more cookies are stored the oldest ones are
+                        removed
+    :type max_cookies: int
+    :param max_header_size: Maximum length of the ``Cookie`` header, cookies
+                            which don't fit are not sent
+    :type max_header_size: int
+    """
+
+    def __init__(
+        self, max_cookies=DEFAULT_MAX_COOKIES, max_header_size=DEFAULT_MAX_HEADER_SIZE
+    ):
+        self.max_cookies = max_cookies
+        self.max_header_size = max_header_size
+        self._lock = threading.Lock()
+        self._cookies = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._cookies)
+
+    def set(  # pylint: disable=too-many-arguments
+        self,
+        name,
+        value,
+        domain,
+        path="/",
+        *,
+        expires=None,
+        host_only=True,
+        secure=False,
+    ):
+        """
+        Store a cookie, replacing any cookie with the same domain, path and
+        name. A cookie whose ``expires`` timestamp is in the past is removed.
+        A ``secure`` cookie is only sent over HTTPS.
+        """
+        key = (domain.lower().lstrip("."), path or "/", name)
+        with self._lock:
+            self._cookies.pop(key, None)
+            if expires is not None and expires <= time.time():
+                return
+
+            self._cookies[key] = _Cookie(value, expires, host_only, secure)
+            while len(self._cookies) > self.max_cookies:
+                # dicts keep insertion order, the first cookie is the oldest
+                del self._cookies[next(iter(self._cookies))]
+
+    def update(self, set_cookie_headers, host, path="/"):
+        """
+        Store the cookies from the ``Set-Cookie`` headers of a response to
+        a request for ``path`` on ``host``.
+        """
+        hostname = split_host(host)
+        for header in set_cookie_headers:
+            name, value, options = _parse(header)
+            if not name:
+                continue
+
+            domain = options.get("domain", "").lower().lstrip(".")
+            if domain and not _domain_match(hostname, domain, False):
+                # a server may not set cookies for other domains
+                continue
+
+            cookie_path = options.get("path", "")
+            if not cookie_path.startswith("/"):
+                cookie_path = _default_path(path)
+
+            self.set(
+                name,
+                value,
+                domain or hostname,
+                cookie_path,
+                expires=_expires(options),
+                host_only=not domain,
+                secure="secure" in options,
+            )
+
+    def _matching(self, host, path, secure):
+        hostname = split_host(host)
+        path = urllib.parse.urlsplit(path).path or "/"
+        now = time.time()
+
+        matching = []
+        with self._lock:
+            for key, cookie in list(self._cookies.items()):
+                if cookie.expires is not None and cookie.expires <= now:
+                    del self._cookies[key]
+                    continue
+
+                domain, cookie_path, name = key
+                if (
+                    (secure or not cookie.secure)
+                    and _domain_match(hostname, domain, cookie.host_only)
+                    and _path_match(path, cookie_path)
+                ):
+                    matching.append((cookie_path, cookie.created, name, cookie.value))
+
+        # RFC 6265, section 5.4: longer paths first, then older cookies first
+        matching.sort(key=lambda item: (-len(item[0]), item[1]))
+        return [(name, value) for _, _, name, value in matching]
+
+    def get(self, name, host, path="/", secure=False):
+        """
+        :return: The value of the cookie which would be sent to ``host``,
+                 over HTTPS if ``secure``, or ``None``
+        :rtype: str
+        """
+        for cookie_name, value in self._matching(host, path, secure):
+            if cookie_name == name:
+                return value
+        return None
+
+    def header(self, host, path="/", secure=False):
+        """
+        :return: Value of the ``Cookie`` header for a request to ``path``
+                 on ``host``, over HTTPS if ``secure``, at most
+                 ``max_header_size`` characters long
+        :rtype: str
+        """
+        pairs = []
+        size = 0
+        for name, value in self._matching(host, path, secure):
+            pair = f"{name}={value}"
+            if size + len(pair) + 2 > self.max_header_size:
+                continue
+            pairs.append(pair)
+            size += len(pair) + 2
+        return "; ".join(pairs)
+
+    def clear(self):
+        """
+        Remove all cookies.
+        """
+        with self._lock:
+            self._cookies.clear()
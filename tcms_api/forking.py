@@ -0,0 +1,36 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Fork safety of objects which hold sockets, locks or files.
+
+A child process created with ``os.fork()`` inherits sockets and files
+which the parent keeps using and locks which may have been held by
+threads that don't exist in the child. Objects call :py:func:`register`
+when they are created and their ``_after_fork()`` method is called in
+each child process forked afterwards to replace them. Counters and
+session cookies are kept.
+
+Limits, e.g. ``read_rate_limit``, apply to each process separately.
+"""
+
+import os
+import weakref
+
+_INSTANCES = weakref.WeakSet()
+
+
+def register(instance):
+    """
+    Call ``instance._after_fork()`` in child processes forked while
+    ``instance`` is alive.
+    """
+    _INSTANCES.add(instance)
+
+
+def _after_fork_in_child():
+    for instance in list(_INSTANCES):
+        instance._after_fork()  # pylint: disable=protected-access
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
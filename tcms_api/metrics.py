@@ -0,0 +1,219 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Per-method metrics collected by :py:class:`tcms_api.xmlrpc.TCMSProxy`::
+
+    rpc = TCMS().exec
+    ...
+    print(rpc.stats()["TestExecution.update"])
+    rpc.write_metrics("/var/lib/node_exporter/tcms-api.prom")
+
+For each RPC method the number of calls, failed calls, bytes sent and
+received on the wire, reconnects and a latency histogram are recorded.
+Latency includes retries and waiting in the rate limiter.
+
+Every thread records into its own shard which no other thread writes to so
+recording doesn't take any locks. Shards are summed up when the metrics
+are read. The shard of a thread which has exited is added to a common
+total and released. Disable collection with ``metrics = False``.
+"""
+
+import os
+import tempfile
+import threading
+import weakref
+from bisect import bisect_left
+
+from tcms_api import forking
+
+# upper bounds of the latency histogram buckets in seconds, the same as
+# the default buckets of the Prometheus client libraries
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# positions in the list of counters kept for each method
+_CALLS = 0
+_ERRORS = 1
+_LATENCY = 2
+_SENT = 3
+_RECEIVED = 4
+_RECONNECTS = 5
+_BUCKETS = 6
+_SIZE = _BUCKETS + len(LATENCY_BUCKETS) + 1
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _add(totals, shard):
+    for methodname, counters in shard.items():
+        total = totals.setdefault(methodname, [0] * _SIZE)
+        for index, value in enumerate(counters):
+            total[index] += value
+
+
+class _Owner:  # pylint: disable=too-few-public-methods
+    """
+    Kept in the thread-local storage of the thread which owns a shard, it
+    is freed when the thread exits.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire(metrics_ref, shard):
+    metrics = metrics_ref()
+    if metrics is not None:
+        metrics._retire(shard)  # pylint: disable=protected-access
+
+
+class Metrics:
+    """
+    Collects metrics about RPC calls per method name.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+        # counters of shards whose threads have exited
+        self._retired = {}
+        forking.register(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def record(  # pylint: disable=too-many-arguments
+        self, methodname, latency, failed=False, *, sent=0, received=0, reconnects=0
+    ):
+        """
+        Record a completed call. Safe to call from any thread without
+        taking locks.
+        """
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            self._local.owner = _Owner()
+            weakref.finalize(self._local.owner, _retire, weakref.ref(self), shard)
+            with self._lock:
+                self._shards.append(shard)
+
+        counters = shard.get(methodname)
+        if counters is None:
+            counters = shard[methodname] = [0] * _SIZE
+
+        counters[_CALLS] += 1
+        counters[_ERRORS] += failed
+        counters[_LATENCY] += latency
+        counters[_SENT] += sent
+        counters[_RECEIVED] += received
+        counters[_RECONNECTS] += reconnects
+        counters[_BUCKETS + bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def _retire(self, shard):
+        with self._lock:
+            _add(self._retired, shard)
+            self._shards = [item for item in self._shards if item is not shard]
+
+    def _totals(self):
+        with self._lock:
+            shards = list(self._shards)
+            totals = {
+                methodname: list(counters)
+                for methodname, counters in self._retired.items()
+            }
+
+        for shard in shards:
+            # the owning thread may add methods while the shard is read
+            _add(totals, dict(shard))
+        return totals
+
+    def stats(self):
+        """
+        :return: Metrics for each method name. ``latency_buckets`` maps the
+                 upper bound of each bucket to the number of calls which
+                 took at most that long, like a Prometheus histogram.
+        :rtype: dict
+        """
+        stats = {}
+        for methodname, counters in sorted(self._totals().items()):
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(
+                LATENCY_BUCKETS + (float("inf"),), counters[_BUCKETS:]
+            ):
+                cumulative += count
+                buckets[bound] = cumulative
+
+            stats[methodname] = {
+                "calls": counters[_CALLS],
+                "errors": counters[_ERRORS],
+                "latency_sum": counters[_LATENCY],
+                "latency_buckets": buckets,
+                "bytes_sent": counters[_SENT],
+                "bytes_received": counters[_RECEIVED],
+                "reconnects": counters[_RECONNECTS],
+            }
+        return stats
+
+    def prometheus(self):
+        """
+        :return: Metrics in the Prometheus text exposition format
+        :rtype: str
+        """
+        stats = self.stats()
+        lines = []
+
+        def counter(name, key, description):
+            lines.append(f"# HELP tcms_api_rpc_{name} {description}")
+            lines.append(f"# TYPE tcms_api_rpc_{name} counter")
+            for methodname, values in stats.items():
+                lines.append(
+                    f'tcms_api_rpc_{name}{{method="{_escape(methodname)}"}} {values[key]}'
+                )
+
+        counter("calls_total", "calls", "Number of RPC calls.")
+        counter("errors_total", "errors", "Number of failed RPC calls.")
+        counter("request_bytes_total", "bytes_sent", "Bytes sent on the wire.")
+        counter("response_bytes_total", "bytes_received", "Bytes received on the wire.")
+        counter("reconnects_total", "reconnects", "Number of re-opened sockets.")
+
+        lines.append("# HELP tcms_api_rpc_latency_seconds Latency of RPC calls.")
+        lines.append("# TYPE tcms_api_rpc_latency_seconds histogram")
+        for methodname, values in stats.items():
+            label = f'method="{_escape(methodname)}"'
+            for bound, count in values["latency_buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f'tcms_api_rpc_latency_seconds_bucket{{{label},le="{le}"}} {count}'
+                )
+            lines.append(
+                f"tcms_api_rpc_latency_seconds_sum{{{label}}} {values['latency_sum']}"
+            )
+            lines.append(
+                f"tcms_api_rpc_latency_seconds_count{{{label}}} {values['calls']}"
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """
+        Write the metrics in the Prometheus text format to ``path``. The
+        file is replaced atomically so it may be read by the node exporter
+        textfile collector at any time.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, suffix=".tmp", delete=False
+        ) as temporary:
+            temporary.write(self.prometheus())
+        os.replace(temporary.name, path)
+
+    def clear(self):
+        """
+        Reset all metrics.
+        """
+        with self._lock:
+            self._retired.clear()
+            for shard in self._shards:
+                shard.clear()
@@ -0,0 +1,269 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Concurrent RPC calls from a thread pool::
+
+    rpc = TCMS().exec
+
+    # start a call in the background
+    future = rpc.TestRun.filter.submit({"plan": 1})
+
+    # results are returned in the same order as the arguments
+    for executions in rpc.map("TestExecution.filter", queries, workers=8):
+        print(executions)
+
+Worker threads share the same proxy. Each call checks out its own
+keep-alive connection from the pool of the transport while all connections
+share the session cookie so there is no additional login. Use ``pool_size``
+at least as large as the number of workers, otherwise workers wait for a
+free connection.
+
+When parsing large results keeps a CPU busy use worker processes instead,
+each with its own connection::
+
+    with rpc.process_pool(workers=4) as pool:
+        for executions in pool.map("TestExecution.filter", queries):
+            print(executions)
+"""
+
+import contextvars
+import importlib
+import os
+import pickle
+from collections import deque
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+from xmlrpc.client import Fault, ProtocolError, _Method
+
+# connection of a ProcessPool worker process, see _connect()
+_WORKER_RPC = None
+
+
+class Method(_Method):
+    """
+    An RPC method which can also be called in the background via
+    :py:meth:`submit`.
+
+    :param executor: Callable which returns the executor used by
+                     :py:meth:`submit`
+    :type executor: callable
+    """
+
+    def __init__(self, send, name, executor):
+        super().__init__(send, name)
+        self._executor = executor
+
+    def __getattr__(self, name):
+        return Method(
+            self._Method__send,  # pylint: disable=no-member
+            f"{self._Method__name}.{name}",  # pylint: disable=no-member
+            self._executor,
+        )
+
+    def submit(self, *args):
+        """
+        Call the method in a worker thread.
+
+        :rtype: concurrent.futures.Future
+        """
+        # the call becomes a child of the current tracing span
+        context = contextvars.copy_context()
+        return self._executor().submit(context.run, self, *args)
+
+
+def _ordered_results(submit, iterable, ahead):
+    """
+    Submit a call for each item of ``iterable``, staying at most ``ahead``
+    calls in front of the results, and yield the results in order.
+    """
+    pending = deque()
+    try:
+        for args in iterable:
+            if not isinstance(args, tuple):
+                args = (args,)
+            pending.append(submit(*args))
+
+            if len(pending) >= ahead:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def map_calls(method, iterable, workers):
+    """
+    Call ``method`` once for each item of ``iterable`` using up to
+    ``workers`` threads and yield the results in the same order. Tuples are
+    passed as positional arguments, any other item as the only argument.
+
+    Items are consumed from ``iterable`` only a little ahead of the results
+    being yielded so it may be a generator of unknown length. An exception
+    raised by a call is raised when its result is reached and remaining
+    calls are cancelled.
+
+    :rtype: generator
+    """
+    if workers < 1:
+        raise ValueError(f"Number of workers must be positive, not {workers}")
+
+    def submit(*args):
+        # the call becomes a child of the current tracing span
+        context = contextvars.copy_context()
+        return executor.submit(context.run, method, *args)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from _ordered_results(submit, iterable, 2 * workers)
+
+
+def _connect(args, options):
+    global _WORKER_RPC  # pylint: disable=global-statement
+    # tcms_api imports this module
+    _WORKER_RPC = importlib.import_module("tcms_api").TCMS(*args, **options).exec
+
+
+class WorkerError(Exception):
+    """
+    Raised instead of an exception from a worker process which can't be
+    sent back to the calling process.
+
+    :param type_name: Qualified name of the original exception type
+    :type type_name: str
+    :param message: Message of the original exception
+    :type message: str
+    """
+
+    def __init__(self, type_name, message):
+        super().__init__(type_name, message)
+        self.type_name = type_name
+        self.message = message
+
+    def __str__(self):
+        return f"{self.type_name}: {self.message}"
+
+
+class _PicklableFault(Fault):
+    """
+    ``Fault`` can't be unpickled because it doesn't pass its arguments to
+    ``Exception.__init__()``. This one is unpickled as a ``Fault``.
+    """
+
+    def __reduce__(self):
+        return (Fault, (self.faultCode, self.faultString))
+
+
+class _PicklableProtocolError(ProtocolError):
+    """
+    Same as :py:class:`_PicklableFault` for ``ProtocolError``.
+    """
+
+    def __reduce__(self):
+        return (
+            ProtocolError,
+            (self.url, self.errcode, self.errmsg, dict(self.headers or {})),
+        )
+
+
+def _picklable(error):
+    """
+    :return: An exception which is unpickled in the calling process as
+             ``error`` or, if that isn't possible, as a
+             :py:class:`WorkerError`. An exception which fails to unpickle
+             breaks the whole process pool.
+    """
+    if isinstance(error, Fault):
+        return _PicklableFault(error.faultCode, error.faultString)
+    if isinstance(error, ProtocolError):
+        return _PicklableProtocolError(
+            error.url, error.errcode, error.errmsg, error.headers
+        )
+
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:  # pylint: disable=broad-exception-caught
+        return WorkerError(type(error).__qualname__, str(error))
+    return error
+
+
+def _call(methodname, args, transform):
+    method = _WORKER_RPC
+    for name in methodname.split("."):
+        method = getattr(method, name)
+
+    try:
+        result = method(*args)
+        if transform is not None:
+            result = transform(result)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        picklable = _picklable(error)
+        if picklable is error:
+            raise
+        raise picklable from None
+    return result
+
+
+class ProcessPool:
+    """
+    Calls RPC methods from worker processes. Each worker connects and logs
+    in once, with the same arguments as ``TCMS()``, and parses responses
+    itself so large results don't keep the calling process busy. Results
+    are sent back pickled.
+
+    :param workers: Number of processes, defaults to the number of CPUs
+    :type workers: int
+    :param transform: Module level function applied to each result in the
+                      worker, e.g. to keep only the fields which are needed
+    :type transform: callable
+
+    ``Fault`` and ``ProtocolError`` raised by a call are raised again by its
+    future. Other exceptions which can't be pickled are raised as
+    :py:class:`WorkerError`.
+    """
+
+    def __init__(self, workers=None, url=None, username=None, password=None, **options):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"Number of workers must be positive, not {workers}")
+
+        self.workers = workers
+        # concurrent.futures imports multiprocessing on first access
+        self._executor = futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_connect,
+            initargs=((url, username, password), options),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Wait for pending calls and stop the worker processes.
+        """
+        self._executor.shutdown()
+
+    def submit(self, methodname, *args, transform=None):
+        """
+        Call ``methodname`` in a worker process.
+
+        :rtype: concurrent.futures.Future
+        """
+        return self._executor.submit(_call, methodname, args, transform)
+
+    def map(self, methodname, iterable, transform=None):
+        """
+        Same as :py:func:`map_calls` using worker processes.
+
+        :rtype: generator
+        """
+        return _ordered_results(
+            lambda *args: self.submit(methodname, *args, transform=transform),
+            iterable,
+            2 * self.workers,
+        )
@@ -7,6 +7,7 @@ from datetime import datetime
 from functools import lru_cache as cache
 
 from . import TCMS
+from .tracing import traced
 from .version import __version__
 
 
@@ -87,6 +88,7 @@ class Backend:
 
             print(f"{verb}: {obj_prefix}-{obj_id}")
 
+    @traced
     def configure(self):
         """
         This method is reading all the configs from the environment
@@ -174,6 +176,7 @@ class Backend:
                 self._statuses[name] = self.get_status_id_fallback(name)
         return self._statuses[name]
 
+    @traced
     def get_product_id(self, plan_id):
         """
         Return a ``tcms.management.models.Product`` PK.
@@ -227,6 +230,7 @@ class Backend:
 
         return product_id, product_name
 
+    @traced
     def get_version_id(self, product_id):
         """
         Return a ``tcms.management.models.Version`` (PK, name).
@@ -275,6 +279,7 @@ class Backend:
 
         return version[0]["id"], version_val
 
+    @traced
     def get_build_id(self, version_id):
         """
         Return a ``tcms.management.models.Build`` (PK, name).
@@ -362,6 +367,7 @@ class Backend:
         """
         return os.environ.get("TCMS_DEFAULT_TESTER_ID")
 
+    @traced
     def get_plan_id(self, run_id):
         """
         If a TestRun with PK `run_id` exists then return the TestPlan to
@@ -429,6 +435,7 @@ class Backend:
         self.log_info(False, "TP", result[0]["plan"])
         return result[0]["plan"]
 
+    @traced
     def get_run_id(self):
         """
         If `$TCMS_RUN_ID` is specified then assume the caller knows
@@ -477,6 +484,7 @@ class Backend:
         self.log_info(was_added, "TR", run_id)
         return int(run_id)
 
+    @traced
     def finish_test_run(self):
         """
         .. important::
@@ -496,6 +504,7 @@ class Backend:
             },
         )
 
+    @traced
     def test_case_get_or_create(self, summary):
         """
         Search for a TestCase with the specified `summary` and Product.
@@ -537,6 +546,7 @@ class Backend:
 
         return test_case[0], created
 
+    @traced
     def add_test_case_to_plan(self, case_id, plan_id):
         """
         Add a TestCase to a TestPlan if it is not already there!
@@ -554,6 +564,7 @@ class Backend:
         if not self.rpc.TestCase.filter({"pk": case_id, "plan": plan_id}):
             self.rpc.TestPlan.add_case(plan_id, case_id)
 
+    @traced
     def add_test_case_to_run(self, case_id, run_id):
         """
         Add a TestCase to a TestRun if it is not already there!
@@ -576,6 +587,7 @@ class Backend:
         return result
 
     # pylint: disable=too-many-arguments,too-many-positional-arguments
+    @traced
     def update_test_execution(
         self,
         test_execution_id,
@@ -617,6 +629,7 @@ class Backend:
         if comment:
             self.add_comment(test_execution_id, comment)
 
+    @traced
     def add_comment(self, test_execution_id, comment):
         """
         Add comment string to TestExecution without changing the status
@@ -0,0 +1,231 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Breakdown of request latency into phases, enabled with ``profile = True``::
+
+    rpc = TCMS().exec
+    ...
+    print(rpc.phase_report())
+
+The transport timestamps each phase of every HTTP request:
+
+- ``dns`` - resolving the host name, only for new connections
+- ``connect`` - opening the TCP connection, only for new connections
+- ``tls`` - the TLS handshake, only for new HTTPS connections
+- ``send`` - sending headers and request body
+- ``wait`` - waiting for the status line and headers of the response
+- ``parse`` - reading, decompressing and parsing the response body
+
+:py:meth:`Profiler.stats` reports percentiles for each phase and the
+slowest calls together with their method names. Unlike the former
+``VERBOSE`` flag nothing is printed, the raw data of individual calls is
+still available via ``http.client`` debugging.
+"""
+
+import heapq
+import itertools
+import socket
+import threading
+import time
+from collections import deque
+from http.client import HTTPConnection, HTTPSConnection
+
+from tcms_api import forking
+
+PHASES = ("dns", "connect", "tls", "send", "wait", "parse")
+
+DEFAULT_TOP = 10
+
+# number of most recent samples per phase used to compute percentiles
+DEFAULT_MAX_SAMPLES = 10000
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(ordered, percent):
+    """
+    :param ordered: Sorted, non-empty list of values
+    :type ordered: list
+    :return: The value below which ``percent`` of the values fall, using
+             the nearest-rank method
+    :rtype: float
+    """
+    rank = max(1, -(-percent * len(ordered) // 100))
+    return ordered[int(rank) - 1]
+
+
+class ProfiledHTTPConnection(HTTPConnection):
+    """
+    An ``HTTPConnection`` which records in ``timings`` how long resolving
+    the host name and opening the socket took.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = {}
+        self._create_connection = self._timed_create_connection
+
+    def _timed_create_connection(self, address, timeout, source_address=None):
+        host, port = address
+        started = time.perf_counter()
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        self.timings["dns"] = resolved - started
+
+        error = None
+        for *family_type_proto, _, sockaddr in addresses:
+            sock = None
+            try:
+                sock = socket.socket(*family_type_proto)
+                # pylint: disable-next=protected-access
+                if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                    sock.settimeout(timeout)
+                if source_address:
+                    sock.bind(source_address)
+                # the whole address, IPv6 link-local ones need the scope ID
+                sock.connect(sockaddr)
+            except OSError as err:
+                error = err
+                if sock is not None:
+                    sock.close()
+                continue
+
+            self.timings["connect"] = time.perf_counter() - resolved
+            return sock
+
+        raise error
+
+
+class ProfiledHTTPSConnection(HTTPSConnection, ProfiledHTTPConnection):
+    """
+    An ``HTTPSConnection`` which also records the duration of the TLS
+    handshake in ``timings``.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        elapsed = time.perf_counter() - started
+        self.timings["tls"] = (
+            elapsed - self.timings.get("dns", 0) - self.timings.get("connect", 0)
+        )
+
+
+class Profiler:
+    """
+    Aggregates the phases of requests made by a transport.
+
+    :param top: Number of slowest calls to keep
+    :type top: int
+    :param max_samples: Number of most recent samples per phase used to
+                        compute percentiles
+    :type max_samples: int
+    """
+
+    def __init__(self, top=DEFAULT_TOP, max_samples=DEFAULT_MAX_SAMPLES):
+        self.top = top
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = {phase: deque(maxlen=max_samples) for phase in PHASES}
+        self._counts = dict.fromkeys(PHASES, 0)
+        self._slowest = []
+        self._sequence = itertools.count()
+        forking.register(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def record(self, methodname, phases):
+        """
+        Record the phases of a single request.
+
+        :param methodname: Name of the RPC method, may be ``None``
+        :type methodname: str
+        :param phases: Duration in seconds of each phase which took place
+        :type phases: dict
+        """
+        total = sum(phases.values())
+        entry = (total, next(self._sequence), methodname, phases)
+        with self._lock:
+            for phase, duration in phases.items():
+                self._samples[phase].append(duration)
+                self._counts[phase] += 1
+
+            if len(self._slowest) < self.top:
+                heapq.heappush(self._slowest, entry)
+            elif self._slowest and total > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def stats(self):
+        """
+        :return: ``phases`` maps each phase to the number of requests in
+                 which it took place and percentiles of its duration over
+                 the most recent samples, ``slowest`` lists the slowest
+                 requests, the slowest first
+        :rtype: dict
+        """
+        with self._lock:
+            samples = {phase: sorted(values) for phase, values in self._samples.items()}
+            counts = dict(self._counts)
+            slowest = sorted(self._slowest, reverse=True)
+
+        phases = {}
+        for phase in PHASES:
+            ordered = samples[phase]
+            phases[phase] = {"count": counts[phase]}
+            for percent in PERCENTILES:
+                phases[phase][f"p{percent}"] = (
+                    percentile(ordered, percent) if ordered else None
+                )
+            phases[phase]["max"] = ordered[-1] if ordered else None
+
+        return {
+            "phases": phases,
+            "slowest": [
+                {"method": methodname, "total": total, "phases": dict(durations)}
+                for total, _, methodname, durations in slowest
+            ],
+        }
+
+    def report(self):
+        """
+        :return: :py:meth:`stats` as a human readable table, durations are
+                 in milliseconds
+        :rtype: str
+        """
+        stats = self.stats()
+
+        def milliseconds(value):
+            return "-" if value is None else f"{value * 1000:.1f}"
+
+        columns = [f"p{percent}" for percent in PERCENTILES] + ["max"]
+        lines = [f"{'phase':<8} {'count':>8} " + " ".join(f"{c:>9}" for c in columns)]
+        for phase, values in stats["phases"].items():
+            lines.append(
+                f"{phase:<8} {values['count']:>8} "
+                + " ".join(f"{milliseconds(values[c]):>9}" for c in columns)
+            )
+
+        if stats["slowest"]:
+            lines.append("")
+            lines.append("slowest calls:")
+        for call in stats["slowest"]:
+            phases = ", ".join(
+                f"{phase}={milliseconds(duration)}"
+                for phase, duration in call["phases"].items()
+            )
+            lines.append(
+                f"{milliseconds(call['total']):>9} {call['method'] or '?'} ({phases})"
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """
+        Discard all samples.
+        """
+        with self._lock:
+            for values in self._samples.values():
+                values.clear()
+            self._counts = dict.fromkeys(PHASES, 0)
+            self._slowest = []
@@ -0,0 +1,257 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Client side rate limiting, used by :py:class:`tcms_api.xmlrpc.TCMSProxy`.
+
+All proxies in a process which talk to the same server, including the
+asyncio client from :py:mod:`tcms_api.aio`, share one
+:py:class:`RateLimiter`. It combines a token bucket for reads, one for
+writes and a cap on the number of calls in flight. Calls which exceed the
+limits wait, the time spent waiting is reported by
+:py:meth:`RateLimiter.stats`. When a proxy is created with different
+limits the shared limiter is reconfigured, the last limits apply to all
+proxies for that server.
+
+Enable it with the following keyword arguments to ``TCMS()`` or keys with
+the same names in the config file:
+
+- ``read_rate_limit`` - max number of read calls per second
+- ``write_rate_limit`` - max number of other calls per second
+- ``rate_limit_burst`` - number of calls which may be sent at once before
+  the rate limits apply, defaults to 1
+- ``max_in_flight`` - max number of calls waiting for a response
+"""
+
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from fnmatch import fnmatchcase
+
+from tcms_api import forking
+
+# methods which only read data, all others are writes
+READ_METHODS = [
+    "Auth.*",
+    "*.filter",
+    "*.get_*",
+    "*.comments",
+    "*.history",
+    "*.properties",
+    "system.*",
+]
+
+# seconds between attempts of coroutines to take a slot for a call in flight
+_SLOT_POLL_INTERVAL = 0.005
+
+
+def is_read(methodname, params=()):
+    """
+    :return: ``True`` if the method only reads data. ``system.multicall``
+             is a read when all of the calls it contains are.
+    :rtype: bool
+    """
+    if methodname == "system.multicall":
+        return all(
+            is_read(call["methodName"]) for call in (params[0] if params else [])
+        )
+    return any(fnmatchcase(methodname, pattern) for pattern in READ_METHODS)
+
+
+class TokenBucket:  # pylint: disable=too-few-public-methods
+    """
+    Allows ``rate`` calls per second on average and up to ``burst`` calls
+    at once. Callers reserve a token and sleep until it becomes available,
+    which serves them in order of arrival.
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError(f"Rate must be a positive number, not {rate}")
+
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.sleep = time.sleep
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        forking.register(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take a token without waiting for it.
+
+        :return: Number of seconds until the token becomes available, the
+                 caller must wait that long before making the call
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self):
+        """
+        Take a token, waiting for it if necessary.
+
+        :return: Number of seconds spent waiting
+        :rtype: float
+        """
+        wait = self.reserve()
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """
+    Token buckets for reads and writes and a cap on the number of calls in
+    flight. A limit of ``None`` disables it.
+    """
+
+    def __init__(self, read_rate=None, write_rate=None, burst=1, max_in_flight=None):
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counters = {
+            kind: {"calls": 0, "waited": 0.0, "waited_calls": 0}
+            for kind in ("read", "write")
+        }
+        self.configure(read_rate, write_rate, burst, max_in_flight)
+        forking.register(self)
+
+    def _after_fork(self):
+        # calls in flight belong to threads of the parent
+        self._lock = threading.Lock()
+        self._slots = (
+            threading.BoundedSemaphore(self.max_in_flight)
+            if self.max_in_flight
+            else None
+        )
+        self._in_flight = 0
+
+    def configure(self, read_rate=None, write_rate=None, burst=1, max_in_flight=None):
+        """
+        Replace the limits. Calls in flight are not affected, they release
+        their slot to the limits they were admitted under.
+        """
+        self._buckets = {
+            "read": TokenBucket(read_rate, burst) if read_rate else None,
+            "write": TokenBucket(write_rate, burst) if write_rate else None,
+        }
+        self.max_in_flight = max_in_flight
+        self._slots = (
+            threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        )
+
+    def _admitted(self, kind, started):
+        waited = time.monotonic() - started
+        with self._lock:
+            counters = self._counters[kind]
+            counters["calls"] += 1
+            counters["waited"] += waited
+            # ignore the time it takes to acquire free locks
+            if waited > 0.001:
+                counters["waited_calls"] += 1
+            self._in_flight += 1
+
+    def _finished(self, slots):
+        with self._lock:
+            self._in_flight -= 1
+        if slots is not None:
+            slots.release()
+
+    @contextmanager
+    def limit(self, methodname, params=()):
+        """
+        Context manager which waits until the call may be sent and keeps
+        it counted as in flight until the block exits.
+        """
+        kind = "read" if is_read(methodname, params) else "write"
+        started = time.monotonic()
+
+        bucket, slots = self._buckets[kind], self._slots
+        if bucket is not None:
+            bucket.acquire()
+        if slots is not None:
+            slots.acquire()
+
+        self._admitted(kind, started)
+        try:
+            yield
+        finally:
+            self._finished(slots)
+
+    @asynccontextmanager
+    async def async_limit(self, methodname, params=(), *, sleep):
+        """
+        Same as :py:meth:`limit` for coroutines which share the limits with
+        threads. The event loop isn't blocked, instead ``sleep``, e.g.
+        ``asyncio.sleep``, is awaited while the call has to wait.
+        """
+        kind = "read" if is_read(methodname, params) else "write"
+        started = time.monotonic()
+
+        bucket, slots = self._buckets[kind], self._slots
+        if bucket is not None:
+            wait = bucket.reserve()
+            if wait:
+                await sleep(wait)
+        if slots is not None:
+            # the slot is released by _finished()
+            # pylint: disable-next=consider-using-with
+            while not slots.acquire(blocking=False):
+                await sleep(_SLOT_POLL_INTERVAL)
+
+        self._admitted(kind, started)
+        try:
+            yield
+        finally:
+            self._finished(slots)
+
+    def stats(self):
+        """
+        :return: Number of calls, number of calls which had to wait and total
+                 seconds spent waiting for reads and writes, and the number
+                 of calls in flight
+        :rtype: dict
+        """
+        with self._lock:
+            stats = {kind: dict(counters) for kind, counters in self._counters.items()}
+            stats["in_flight"] = self._in_flight
+            stats["max_in_flight"] = self.max_in_flight
+            return stats
+
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def shared_limiter(host, **limits):
+    """
+    :return: The :py:class:`RateLimiter` shared by all proxies for ``host``
+             in this process or ``None`` when no limits are specified. When
+             ``limits`` differ from those of the previous call the shared
+             limiter is reconfigured, so they apply to all proxies for
+             ``host``, also those created before.
+    :rtype: RateLimiter
+    """
+    if not any(
+        limits.get(name) for name in ("read_rate", "write_rate", "max_in_flight")
+    ):
+        return None
+
+    key = tuple(sorted(limits.items()))
+    with _LIMITERS_LOCK:
+        limiter_key, limiter = _LIMITERS.get(host, (None, None))
+        if limiter is None:
+            limiter = RateLimiter(**limits)
+        elif limiter_key != key:
+            limiter.configure(**limits)
+        _LIMITERS[host] = (key, limiter)
+        return limiter
@@ -0,0 +1,186 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Compact representation of large results::
+
+    rpc = TCMS(compact_records=True).exec
+
+    for execution in rpc.TestExecution.filter({"run__plan": 1}):
+        print(execution["id"], execution.status__name)
+
+Each dictionary in a list returned by the server is replaced with a
+:py:class:`Record`, a tuple of its values. The field names are stored
+once per distinct set of fields instead of once per row and string
+values which repeat between rows, e.g. ``status__name``, are stored once
+per result. Records are read-only
+and support ``row["field"]``, ``row.field``, ``row.get()``, ``keys()``,
+``values()`` and ``items()``. Use :py:meth:`Record.to_dict` or
+:py:func:`to_dicts` where a ``dict`` is required, e.g. for
+``json.dumps()``.
+
+.. note::
+
+    XML-RPC responses decoded by
+    :py:class:`tcms_api.unmarshaller.FastUnmarshaller` are converted while
+    they are being parsed, each row as soon as it is complete, so the
+    dictionaries of all rows never exist at the same time. JSON-RPC
+    responses and responses decoded by the standard library are
+    converted after they have been parsed.
+"""
+
+import threading
+
+# field names -> Record subclass
+_SCHEMAS = {}
+_SCHEMAS_LOCK = threading.Lock()
+
+
+def schema(fields):
+    """
+    :param fields: Field names in order
+    :type fields: tuple
+    :return: The :py:class:`Record` subclass for rows with these fields,
+             created once per distinct tuple of names
+    :rtype: type
+    """
+    record_class = _SCHEMAS.get(fields)
+    if record_class is None:
+        with _SCHEMAS_LOCK:
+            record_class = _SCHEMAS.get(fields)
+            if record_class is None:
+                record_class = type(
+                    "Record",
+                    (Record,),
+                    {
+                        "__slots__": (),
+                        "_fields": fields,
+                        "_index": {
+                            name: position for position, name in enumerate(fields)
+                        },
+                    },
+                )
+                _SCHEMAS[fields] = record_class
+    return record_class
+
+
+def _rebuild(fields, values):
+    return schema(fields)(values)
+
+
+class Record(tuple):
+    """
+    Read-only row whose field names are shared with all rows of the same
+    schema, see :py:func:`schema`.
+
+    Unlike a tuple it behaves like a ``dict`` when iterated over, compared
+    with a ``dict`` or checked with ``in``. Fields whose names collide with
+    methods, e.g. ``count``, are only accessible as ``row["count"]``.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._index[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __getattr__(self, name):
+        try:
+            return tuple.__getitem__(self, self._index[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self._fields == other._fields and self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash((self._fields, self.values()))
+
+    def __reduce__(self):
+        return (_rebuild, (self._fields, self.values()))
+
+    def __repr__(self):
+        return f"Record({self.to_dict()!r})"
+
+    def get(self, key, default=None):
+        position = self._index.get(key)
+        if position is None:
+            return default
+        return tuple.__getitem__(self, position)
+
+    def keys(self):
+        return self._fields
+
+    def values(self):
+        return tuple(tuple.__iter__(self))
+
+    def items(self):
+        return zip(self._fields, tuple.__iter__(self))
+
+    def to_dict(self):
+        """
+        :return: A new dictionary with the same fields
+        :rtype: dict
+        """
+        return dict(zip(self._fields, tuple.__iter__(self)))
+
+
+def to_record(row, strings):
+    """
+    :param row: A dictionary returned by the server
+    :type row: dict
+    :param strings: String values seen so far in the same result, equal
+                    strings in ``row`` are replaced with these objects
+    :type strings: dict
+    :rtype: Record
+    """
+    return schema(tuple(row))(
+        strings.setdefault(value, value) if isinstance(value, str) else value
+        for value in row.values()
+    )
+
+
+def compact(result):
+    """
+    Replace each dictionary in ``result``, if it is a list, with a
+    :py:class:`Record`. The list is modified in place so each dictionary
+    can be freed as soon as it has been converted. Equal strings in
+    different rows are replaced with the same object.
+
+    :return: ``result``
+    """
+    if not isinstance(result, list):
+        return result
+
+    strings = {}
+    for position, row in enumerate(result):
+        if isinstance(row, dict):
+            result[position] = to_record(row, strings)
+    return result
+
+
+def to_dicts(rows):
+    """
+    :return: Rows with records converted back to dictionaries
+    :rtype: list
+    """
+    return [row.to_dict() if isinstance(row, Record) else row for row in rows]
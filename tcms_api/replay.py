@@ -0,0 +1,333 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Recording of RPC traffic and replaying it without a server. Record a
+workload against a real server::
+
+    rpc = TCMS(record="calls.jsonl.gz").exec
+
+and later replay it, e.g. on a laptop, with half of the recorded latency::
+
+    rpc = TCMS(replay="calls.jsonl.gz", replay_latency_scale=0.5).exec
+
+The file contains one JSON object per request with the method name, the
+request body, the response and how long the request took. It is gzip
+compressed when its name ends with ``.gz``. Responses are stored after
+decompression. During replay each request is answered with the next
+recorded response for the same request body or, if there is none,
+because e.g. parameters contain timestamps, for the same method. The
+last response is repeated when a request is made more often than it has
+been recorded. Responses are parsed by the client the same way as
+responses from the server, only the network is left out.
+
+Credentials are not recorded: parameters and results of ``Auth.login``
+and cookie values are replaced with ``[redacted]``. ``Auth.login`` is
+replayed by method name.
+"""
+
+import gzip
+import json
+import os
+import threading
+import weakref
+from collections import deque
+from http.client import HTTPMessage
+from io import BytesIO
+from xmlrpc.client import Fault, dumps, loads
+
+from tcms_api import forking
+
+# methods whose parameters and results are credentials
+REDACTED_METHODS = ("Auth.login",)
+
+REDACTED = "[redacted]"
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")  # pylint: disable=consider-using-with
+
+
+def _is_json(body):
+    return body.lstrip()[:1] in (b"{", b"[")
+
+
+def parse_request(body):
+    """
+    :return: The method name of an XML-RPC or JSON-RPC request body and a
+             key which is the same for requests with the same method and
+             parameters
+    :rtype: tuple
+    """
+    if not _is_json(body):
+        _, methodname = loads(body)
+        return methodname, body.decode()
+
+    payload = json.loads(body)
+    if isinstance(payload, list):
+        methodname = "system.multicall"
+        for item in payload:
+            item.pop("id", None)
+    else:
+        methodname = payload.get("method")
+        payload.pop("id", None)
+    return methodname, json.dumps(payload, sort_keys=True)
+
+
+def _redact_request(methodname, body):
+    if methodname not in REDACTED_METHODS:
+        return body
+
+    if not _is_json(body):
+        params, _ = loads(body)
+        return dumps((REDACTED,) * len(params), methodname).encode()
+
+    payload = json.loads(body)
+    payload["params"] = [REDACTED] * len(payload.get("params") or [])
+    return json.dumps(payload).encode()
+
+
+def _redact_response(methodname, body):
+    if methodname not in REDACTED_METHODS:
+        return body
+
+    if not _is_json(body):
+        try:
+            loads(body)
+        except Fault:
+            return body
+        return dumps((REDACTED,), methodresponse=True).encode()
+
+    payload = json.loads(body)
+    if "result" not in payload:
+        return body
+    payload["result"] = REDACTED
+    return json.dumps(payload).encode()
+
+
+def _redact_headers(headers):
+    """
+    :return: ``headers`` with the values of cookies replaced, their names
+             and attributes are kept
+    """
+    redacted = []
+    for name, value in headers:
+        if name.lower() == "set-cookie":
+            cookie, separator, attributes = value.partition(";")
+            value = f"{cookie.partition('=')[0]}={REDACTED}{separator}{attributes}"
+        elif name.lower() == "cookie":
+            value = "; ".join(
+                f"{cookie.partition('=')[0].strip()}={REDACTED}"
+                for cookie in value.split(";")
+            )
+        redacted.append((name, value))
+    return redacted
+
+
+def _replace_ids(recorded_request, request, body):
+    """
+    JSON-RPC responses are matched to requests by ID so responses are
+    returned with the IDs of the replayed request.
+    """
+    if not _is_json(request):
+        return body
+
+    recorded, current, response = (
+        json.loads(recorded_request),
+        json.loads(request),
+        json.loads(body),
+    )
+    if isinstance(current, dict):
+        recorded, current = [recorded], [current]
+    ids = {old.get("id"): new.get("id") for old, new in zip(recorded, current)}
+
+    for item in response if isinstance(response, list) else [response]:
+        if "id" in item:
+            item["id"] = ids.get(item["id"], item["id"])
+    return json.dumps(response).encode()
+
+
+class BufferedResponse:
+    """
+    An HTTP response which has been read into memory. Offers the part of
+    the ``http.client.HTTPResponse`` interface used by the transports.
+    """
+
+    def __init__(self, status, reason, headers, body):
+        self.status = status
+        self.reason = reason
+        self.msg = HTTPMessage()
+        for name, value in headers:
+            self.msg[name] = value
+        self.body = body
+        self._stream = BytesIO(body)
+
+    def read(self, size=None):
+        return self._stream.read(size)
+
+    def getheader(self, name, default=None):
+        return self.msg.get(name, default)
+
+    def getheaders(self):
+        return self.msg.items()
+
+
+class RecordedCall:  # pylint: disable=too-few-public-methods
+    """
+    A request and the response to it as stored in a recording.
+    """
+
+    __slots__ = (
+        "methodname",
+        "request",
+        "status",
+        "reason",
+        "headers",
+        "body",
+        "elapsed",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, methodname, request, *, status, reason, headers, body, elapsed
+    ):
+        self.methodname = methodname
+        self.request = request
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.elapsed = elapsed
+
+    def response(self, request):
+        """
+        :return: The recorded response to be returned for ``request``
+        :rtype: BufferedResponse
+        """
+        body = self.body
+        if self.status == 200:
+            body = _replace_ids(self.request, request, body)
+        return BufferedResponse(self.status, self.reason, self.headers, body)
+
+
+class Recorder:
+    """
+    Appends requests and responses to the file at ``path``. Each call is
+    flushed to the file immediately. Calls made by child processes forked
+    afterwards are not recorded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = _open(path, "w")
+        weakref.finalize(self, self._file.close)
+        forking.register(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        if self._file.closed:
+            return
+
+        # the parent keeps writing to the file. Whatever the inherited file
+        # object writes in the child, including the end of a gzip stream
+        # when it is closed, goes to /dev/null instead
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        try:
+            os.dup2(devnull, self._file.fileno())
+        finally:
+            os.close(devnull)
+
+    def record(self, request_body, response, elapsed):
+        """
+        :param response: A response which has already been read
+        :type response: BufferedResponse
+        :param elapsed: Duration of the request in seconds
+        :type elapsed: float
+        """
+        methodname, _ = parse_request(request_body)
+        body = response.body
+        if response.status == 200:
+            body = _redact_response(methodname, body)
+        line = json.dumps(
+            {
+                "method": methodname,
+                "request": _redact_request(methodname, request_body).decode(),
+                "status": response.status,
+                "reason": response.reason,
+                "headers": _redact_headers(response.getheaders()),
+                "response": body.decode(),
+                "elapsed": elapsed,
+            }
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Recording:  # pylint: disable=too-few-public-methods
+    """
+    The calls stored in a file written by :py:class:`Recorder`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.calls = []
+        self._lock = threading.Lock()
+        self._by_request = {}
+        self._by_method = {}
+        self._used = set()
+
+        with _open(path, "r") as file:
+            try:
+                for line in file:
+                    self._add(json.loads(line))
+            except EOFError:
+                # the recording process exited without closing the file
+                pass
+
+    def _add(self, values):
+        call = RecordedCall(
+            values["method"],
+            values["request"].encode(),
+            status=values["status"],
+            reason=values["reason"],
+            headers=values["headers"],
+            body=values["response"].encode(),
+            elapsed=values["elapsed"],
+        )
+        self.calls.append(call)
+        _, key = parse_request(call.request)
+        self._by_request.setdefault(key, deque()).append(call)
+        self._by_method.setdefault(call.methodname, deque()).append(call)
+
+    def _next(self, calls):
+        if not calls:
+            return None
+
+        # the last call is kept to answer repeated requests
+        while len(calls) > 1 and id(calls[0]) in self._used:
+            calls.popleft()
+        call = calls.popleft() if len(calls) > 1 else calls[0]
+        self._used.add(id(call))
+        return call
+
+    def find(self, request_body):
+        """
+        :return: The call which answers ``request_body``
+        :rtype: RecordedCall
+        :raises RuntimeError: if the method has never been recorded
+        """
+        methodname, key = parse_request(request_body)
+        with self._lock:
+            call = self._next(self._by_request.get(key)) or self._next(
+                self._by_method.get(methodname)
+            )
+
+        if call is None:
+            raise RuntimeError(f"No recorded response for {methodname}")
+        return call
@@ -0,0 +1,283 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Retrying of RPC calls which fail because of transient errors, used by
+:py:class:`tcms_api.xmlrpc.TCMSProxy`.
+
+Calls are retried with jittered exponential backoff. When the server
+responds with ``Retry-After`` the client waits at least that long. The
+total time spent waiting for a single call is limited by ``budget`` seconds.
+
+Whether a failed call may be sent again depends on the error:
+
+- *429 Too Many Requests*, *503 Service Unavailable* and refused
+  connections mean the server hasn't processed the call, it is retried
+  regardless of the method;
+- *502 Bad Gateway*, *504 Gateway Timeout*, timeouts and connections
+  dropped while waiting for the response leave the outcome unknown. Only
+  idempotent methods are retried, see :py:data:`DEFAULT_IDEMPOTENCY`;
+- faults returned by the server are never retried.
+
+The classification may be extended per policy. A method which isn't
+idempotent may be given a ``recover`` callable which looks up the object
+the failed call may have created. If it finds one, that object is returned
+instead of sending the call again::
+
+    def find_test_case(rpc, values):
+        found = rpc.TestCase.filter({"summary": values["summary"]})
+        return found[0] if found else None
+
+    rpc.connection().retry_policy.classify(
+        "TestCase.create", False, recover=find_test_case
+    )
+"""
+
+import importlib
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from fnmatch import fnmatchcase
+from http import HTTPStatus
+from http.client import HTTPException
+from xmlrpc.client import ProtocolError
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_RETRY_BUDGET = 60.0
+# the backoff of a single retry never exceeds this many seconds
+MAX_BACKOFF = 30.0
+
+# (pattern, idempotent) evaluated in order, the first match wins.
+# Methods which don't match any pattern are not idempotent.
+DEFAULT_IDEMPOTENCY = [
+    ("Auth.*", True),
+    ("*.filter", True),
+    ("*.get_*", True),
+    ("*.comments", True),
+    ("*.history", True),
+    ("*.properties", True),
+    ("*.update", True),
+    ("*.remove*", True),
+    ("*.delete", True),
+    # adding to a many-to-many relationship twice has no additional effect
+    ("*.add_tag", True),
+    ("*.add_component", True),
+    ("*.add_cc", True),
+    ("*.create", False),
+    ("*.add_*", False),
+]
+
+# the server hasn't processed the request
+_REJECTED_STATUSES = (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE)
+# the request may have been processed
+_UNKNOWN_STATUSES = (HTTPStatus.BAD_GATEWAY, HTTPStatus.GATEWAY_TIMEOUT)
+
+
+def retry_after(error):
+    """
+    :return: Number of seconds from the ``Retry-After`` header of a
+             ``ProtocolError`` or ``None``
+    :rtype: float
+    """
+    headers = getattr(error, "headers", None) or {}
+    for name, value in headers.items():
+        if name.lower() != "retry-after":
+            continue
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+async def _in_thread(function, *args):
+    # only coroutines call this so asyncio has already been imported
+    loop = importlib.import_module("asyncio").get_running_loop()
+    return await loop.run_in_executor(None, function, *args)
+
+
+def _outcome(error):
+    """
+    :return: ``"rejected"`` if the server didn't process the call,
+             ``"unknown"`` if it may have or ``None`` if the error is not
+             transient
+    """
+    if isinstance(error, ProtocolError):
+        if error.errcode in _REJECTED_STATUSES:
+            return "rejected"
+        if error.errcode in _UNKNOWN_STATUSES:
+            return "unknown"
+        return None
+
+    if isinstance(error, ConnectionRefusedError):
+        return "rejected"
+
+    if isinstance(error, (OSError, HTTPException)):
+        return "unknown"
+
+    return None
+
+
+class RetryPolicy:
+    """
+    Decides whether, and after how long, a failed call is sent again.
+
+    :param max_retries: Maximum number of retries per call, 0 disables
+                        retrying
+    :type max_retries: int
+    :param backoff: Upper bound of the delay before the first retry in
+                    seconds, doubled for every next retry
+    :type backoff: float
+    :param budget: Maximum number of seconds spent waiting between retries
+                   of a single call
+    :type budget: float
+    """
+
+    def __init__(
+        self,
+        max_retries=DEFAULT_MAX_RETRIES,
+        backoff=DEFAULT_RETRY_BACKOFF,
+        budget=DEFAULT_RETRY_BUDGET,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.budget = budget
+        self.retries = 0
+        self.sleep = time.sleep
+        self._lock = threading.Lock()
+        # (pattern, idempotent, recover)
+        self._table = [(pattern, safe, None) for pattern, safe in DEFAULT_IDEMPOTENCY]
+
+    def classify(self, pattern, idempotent, recover=None):
+        """
+        Mark the methods matching the ``fnmatch`` style ``pattern`` as
+        idempotent or not. Takes precedence over previous classifications.
+
+        :param recover: Called as ``recover(proxy, *params)`` before
+                        retrying a call which isn't idempotent and whose
+                        outcome is unknown. If it returns anything other
+                        than ``None`` that is used as the result of the call.
+        :type recover: callable
+        """
+        with self._lock:
+            self._table.insert(0, (pattern, idempotent, recover))
+
+    def _lookup(self, methodname):
+        with self._lock:
+            for pattern, idempotent, recover in self._table:
+                if fnmatchcase(methodname, pattern):
+                    return idempotent, recover
+        return False, None
+
+    def is_idempotent(self, methodname, params=()):
+        """
+        :return: ``True`` if sending the call twice has the same effect as
+                 sending it once. ``system.multicall`` is idempotent when all
+                 of the calls it contains are.
+        :rtype: bool
+        """
+        if methodname == "system.multicall":
+            return all(
+                self.is_idempotent(call["methodName"], call["params"])
+                for call in (params[0] if params else [])
+            )
+        return self._lookup(methodname)[0]
+
+    def delay(self, attempt, error=None):
+        """
+        :return: Seconds to wait before retry number ``attempt``, counting
+                 from 0, with full jitter unless the server asked for a
+                 ``Retry-After`` delay
+        :rtype: float
+        """
+        backoff = random.uniform(  # nosec:B311:blacklist
+            0, min(MAX_BACKOFF, self.backoff * 2**attempt)
+        )
+        requested = retry_after(error)
+        if requested is not None:
+            return max(requested, backoff)
+        return backoff
+
+    def _retry(self, error, attempt, budget, methodname, params):
+        """
+        :return: Seconds to wait before sending the failed call again and the
+                 ``recover`` callable to try first, if any, or ``None`` if
+                 the call must not be retried
+        :rtype: tuple
+        """
+        outcome = _outcome(error)
+        if outcome is None or attempt >= self.max_retries:
+            return None
+
+        idempotent = self.is_idempotent(methodname, params)
+        recover = self._lookup(methodname)[1]
+        if outcome == "unknown" and not idempotent and recover is None:
+            return None
+
+        delay = self.delay(attempt, error)
+        if delay > budget:
+            return None
+
+        with self._lock:
+            self.retries += 1
+        return delay, (recover if outcome == "unknown" and not idempotent else None)
+
+    def call(self, function, methodname, params, proxy=None):
+        """
+        Return ``function()``, retrying transient errors according to
+        this policy.
+        """
+        budget = self.budget
+        attempt = 0
+        while True:
+            try:
+                return function()
+            except (ProtocolError, OSError, HTTPException) as error:
+                retry = self._retry(error, attempt, budget, methodname, params)
+                if retry is None:
+                    raise
+
+            delay, recover = retry
+            budget -= delay
+            attempt += 1
+            self.sleep(delay)
+
+            if recover is not None:
+                result = recover(proxy, *params)
+                if result is not None:
+                    return result
+
+    async def async_call(  # pylint: disable=too-many-arguments
+        self, function, methodname, params, proxy=None, *, sleep
+    ):
+        """
+        Same as :py:meth:`call` for a coroutine ``function``. ``sleep``, e.g.
+        ``asyncio.sleep``, is awaited between attempts and ``recover`` is
+        called in a worker thread with the synchronous ``proxy``.
+        """
+        budget = self.budget
+        attempt = 0
+        while True:
+            try:
+                return await function()
+            except (ProtocolError, OSError, HTTPException) as error:
+                retry = self._retry(error, attempt, budget, methodname, params)
+                if retry is None:
+                    raise
+
+            delay, recover = retry
+            budget -= delay
+            attempt += 1
+            await sleep(delay)
+
+            if recover is not None:
+                result = await _in_thread(recover, proxy, *params)
+                if result is not None:
+                    return result
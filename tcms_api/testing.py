@@ -0,0 +1,601 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+# pylint: disable=protected-access
+
+"""
+An in-process stand-in for a Kiwi TCMS server, for tests and benchmarks
+which need something speaking the real wire protocol::
+
+    from tcms_api import TCMS
+    from tcms_api.testing import FakeKiwiServer
+
+    with FakeKiwiServer(latency=0.01) as server:
+        rpc = TCMS(server.url, "tester", "password").exec
+        product = rpc.Product.create({"name": "Demo", "classification": 1})
+
+        # the next 2 calls of TestRun.create fail
+        server.fail("TestRun.create", times=2)
+        # the next HTTP request is answered with 503 Service Unavailable
+        server.fail_requests(503)
+
+        print(server.calls)
+
+Both XML-RPC, at ``/xml-rpc/``, and JSON-RPC, at ``/json-rpc/``, are
+served. ``Auth.login`` issues a session cookie which is required by all
+other methods. Records are kept in memory, only the models and methods
+used by :py:class:`tcms_api.plugin_helpers.Backend` and the most common
+lookups, e.g. ``category__product`` or ``weight__gt``, are implemented.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from socketserver import ThreadingMixIn
+from xmlrpc.client import Fault
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+MODELS = (
+    "User",
+    "Classification",
+    "Product",
+    "Version",
+    "Build",
+    "Category",
+    "Priority",
+    "PlanType",
+    "TestPlan",
+    "TestCaseStatus",
+    "TestCase",
+    "TestRun",
+    "TestExecutionStatus",
+    "TestExecution",
+    "Comment",
+)
+
+# model referenced by each foreign key field
+RELATIONS = {
+    "assignee": "User",
+    "author": "User",
+    "build": "Build",
+    "case": "TestCase",
+    "case_status": "TestCaseStatus",
+    "category": "Category",
+    "classification": "Classification",
+    "default_tester": "User",
+    "manager": "User",
+    "parent": "TestPlan",
+    "plan": "TestPlan",
+    "priority": "Priority",
+    "product": "Product",
+    "product_version": "Version",
+    "run": "TestRun",
+    "status": "TestExecutionStatus",
+    "tested_by": "User",
+    "type": "PlanType",
+    "version": "Version",
+}
+
+# fields of related models included in serialized records
+SERIALIZED = {
+    "Version": ("product__name",),
+    "Build": ("version__value",),
+    "Category": ("product__name",),
+    "TestPlan": (
+        "product__name",
+        "product_version__value",
+        "type__name",
+        "author__username",
+    ),
+    "TestCase": (
+        "category__name",
+        "priority__value",
+        "case_status__name",
+        "author__username",
+    ),
+    "TestRun": ("plan__name", "build__name", "manager__username"),
+    "TestExecution": ("case__summary", "status__name", "build__name"),
+}
+
+OPERATORS = {
+    "exact": lambda value, expected: _equal(value, expected),
+    "in": lambda value, expected: any(_equal(value, item) for item in expected),
+    "gt": lambda value, expected: value is not None and value > expected,
+    "gte": lambda value, expected: value is not None and value >= expected,
+    "lt": lambda value, expected: value is not None and value < expected,
+    "lte": lambda value, expected: value is not None and value <= expected,
+    "icontains": lambda value, expected: str(expected).lower() in str(value).lower(),
+}
+
+SESSION_COOKIE_NAME = "sessionid"
+
+
+def _equal(value, expected):
+    # IDs are often passed as strings, e.g. from environment variables
+    if value is None or expected is None:
+        return value is expected
+    return value == expected or str(value) == str(expected)
+
+
+def _to_id(value):
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return value
+
+
+class FakeKiwi:
+    """
+    In-memory records and the RPC methods which operate on them.
+    Methods receive the ID of the logged-in user as first argument.
+
+    :param users: Usernames and passwords of the users who may log in
+    :type users: dict
+    """
+
+    def __init__(self, users=None):
+        self._lock = threading.RLock()
+        self.records = {model: {} for model in MODELS}
+        self._ids = {model: itertools.count(1) for model in MODELS}
+        # model -> field -> str(value) -> IDs, for exact lookups
+        self._index = {model: {} for model in MODELS}
+
+        self.passwords = users or {"tester": "password"}
+        for username in self.passwords:
+            self._insert("User", {"username": username, "is_active": True})
+
+        self._seed()
+        self.methods = self._methods()
+
+    def _seed(self):
+        self._insert("Classification", {"name": "Default"})
+        for value in ("P1", "P2", "P3", "P4", "P5"):
+            self._insert("Priority", {"value": value, "is_active": True})
+        for name, confirmed in (
+            ("PROPOSED", False),
+            ("CONFIRMED", True),
+            ("DISABLED", False),
+            ("NEED_UPDATE", False),
+        ):
+            self._insert("TestCaseStatus", {"name": name, "is_confirmed": confirmed})
+        for name, weight in (
+            ("IDLE", 0),
+            ("RUNNING", 0),
+            ("PAUSED", 0),
+            ("PASSED", 20),
+            ("FAILED", -30),
+            ("BLOCKED", -10),
+            ("ERROR", -20),
+            ("WAIVED", 30),
+        ):
+            self._insert("TestExecutionStatus", {"name": name, "weight": weight})
+        for name in ("Unit", "Integration", "Function", "System", "Acceptance"):
+            self._insert("PlanType", {"name": name, "description": ""})
+
+    def _methods(self):
+        methods = {}
+        for model in MODELS:
+            if model == "Comment":
+                continue
+            methods[f"{model}.filter"] = lambda user, query=None, model=model: (
+                self.filter(model, query or {})
+            )
+            methods[f"{model}.create"] = lambda user, values, model=model: (
+                self.create(model, values, user)
+            )
+            methods[f"{model}.update"] = lambda user, pk, values, model=model: (
+                self.update(model, pk, values)
+            )
+
+        methods.update(
+            {
+                "TestPlan.add_case": self.plan_add_case,
+                "TestRun.add_case": self.run_add_case,
+                "TestExecution.add_comment": self.add_comment,
+                "TestExecution.get_comments": self.get_comments,
+            }
+        )
+        return methods
+
+    def _insert(self, model, values):
+        record = dict(values)
+        record["id"] = next(self._ids[model])
+        self.records[model][record["id"]] = record
+        self._add_to_index(model, record)
+        return record
+
+    def _add_to_index(self, model, record, discard=False):
+        index = self._index[model]
+        for field, value in record.items():
+            if isinstance(value, dict):
+                continue
+
+            # many-to-many fields are indexed by each of their members
+            for member in value if isinstance(value, list) else [value]:
+                ids = index.setdefault(field, {}).setdefault(str(member), set())
+                if discard:
+                    ids.discard(record["id"])
+                else:
+                    ids.add(record["id"])
+
+    def _candidates(self, model, query):
+        """
+        Records which may match ``query``, narrowed down via the index
+        when the query contains an exact lookup of an indexed field.
+        """
+        index = self._index[model]
+        for key, value in query.items():
+            field = "id" if key == "pk" else key
+            if "__" in field or isinstance(value, (list, dict)) or field not in index:
+                continue
+
+            ids = index[field].get(str(value), ())
+            return [self.records[model][pk] for pk in sorted(ids)]
+
+        return list(self.records[model].values())
+
+    def get(self, model, pk):
+        """
+        :raises xmlrpc.client.Fault: if the record doesn't exist
+        """
+        record = self.records[model].get(_to_id(pk))
+        if record is None:
+            raise Fault(-32602, f"{model} matching query does not exist.")
+        return record
+
+    def _lookup(self, record, path):
+        values = [record]
+        for index, name in enumerate(path):
+            name = "id" if name == "pk" else name
+            found = []
+            for current in values:
+                value = current.get(name)
+                found.extend(value if isinstance(value, list) else [value])
+
+            if index < len(path) - 1:
+                table = self.records.get(RELATIONS.get(name), {})
+                found = [table[item] for item in found if item in table]
+            values = found
+        return values
+
+    def _matches(self, record, key, expected):
+        path = key.split("__")
+        operator = "exact"
+        if len(path) > 1 and path[-1] in OPERATORS:
+            operator = path.pop()
+
+        compare = OPERATORS[operator]
+        return any(compare(value, expected) for value in self._lookup(record, path))
+
+    def serialize(self, model, record):
+        """
+        :return: A copy of ``record`` including fields of related records
+        :rtype: dict
+        """
+        result = dict(record)
+        for key in SERIALIZED.get(model, ()):
+            values = self._lookup(record, key.split("__"))
+            result[key] = values[0] if values else None
+        return result
+
+    def filter(self, model, query):
+        with self._lock:
+            return [
+                self.serialize(model, record)
+                for record in self._candidates(model, query)
+                if all(
+                    self._matches(record, key, value) for key, value in query.items()
+                )
+            ]
+
+    def _validate(self, values):
+        for field, value in values.items():
+            model = RELATIONS.get(field)
+            if model is None or value is None or isinstance(value, list):
+                continue
+
+            values[field] = _to_id(value)
+            if values[field] not in self.records[model]:
+                raise Fault(
+                    -32602, f"{field}: Select a valid choice. {value} doesn't exist."
+                )
+
+    def create(self, model, values, user=None):
+        with self._lock:
+            values = dict(values)
+            self._validate(values)
+
+            if model in ("TestPlan", "TestCase"):
+                values.setdefault("author", user)
+            if model == "TestCase":
+                values.setdefault("plan", [])
+            if model == "TestRun":
+                values.setdefault("stop_date", None)
+
+            record = self._insert(model, values)
+
+            # the same records which Kiwi TCMS creates automatically
+            if model == "Product":
+                self._insert(
+                    "Category", {"name": "--default--", "product": record["id"]}
+                )
+                self._insert(
+                    "Version", {"value": "unspecified", "product": record["id"]}
+                )
+            if model == "Version":
+                self._insert("Build", {"name": "unspecified", "version": record["id"]})
+
+            return self.serialize(model, record)
+
+    def update(self, model, pk, values):
+        with self._lock:
+            record = self.get(model, pk)
+            values = dict(values)
+            self._validate(values)
+            self._add_to_index(model, record, discard=True)
+            record.update(values)
+            self._add_to_index(model, record)
+            return self.serialize(model, record)
+
+    def plan_add_case(self, _user, plan_id, case_id):
+        with self._lock:
+            self.get("TestPlan", plan_id)
+            case = self.get("TestCase", case_id)
+            if _to_id(plan_id) not in case["plan"]:
+                self._add_to_index("TestCase", case, discard=True)
+                case["plan"].append(_to_id(plan_id))
+                self._add_to_index("TestCase", case)
+            return self.serialize("TestCase", case)
+
+    def run_add_case(self, _user, run_id, case_id):
+        with self._lock:
+            run = self.get("TestRun", run_id)
+            case = self.get("TestCase", case_id)
+            executions = self.filter("TestExecution", {"run": run_id, "case": case_id})
+            if executions:
+                return executions
+
+            execution = self._insert(
+                "TestExecution",
+                {
+                    "run": run["id"],
+                    "case": case["id"],
+                    "build": run["build"],
+                    "assignee": run.get("default_tester"),
+                    "tested_by": None,
+                    "status": 1,
+                    "start_date": None,
+                    "stop_date": None,
+                },
+            )
+            return [self.serialize("TestExecution", execution)]
+
+    def add_comment(self, user, execution_id, comment):
+        with self._lock:
+            execution = self.get("TestExecution", execution_id)
+            record = self._insert(
+                "Comment",
+                {"object_pk": execution["id"], "comment": comment, "user": user},
+            )
+            return dict(record)
+
+    def get_comments(self, _user, execution_id):
+        with self._lock:
+            self.get("TestExecution", execution_id)
+            return [
+                dict(record)
+                for record in self.records["Comment"].values()
+                if record["object_pk"] == _to_id(execution_id)
+            ]
+
+
+class FakeKiwiRequestHandler(SimpleXMLRPCRequestHandler):
+    """
+    Serves XML-RPC and JSON-RPC over keep-alive connections and tracks
+    the session cookie of the request.
+    """
+
+    protocol_version = "HTTP/1.1"
+    rpc_paths = ()
+
+    def do_POST(self):
+        server = self.server
+        with server._lock:
+            server.requests += 1
+        server._local.session = None
+        server._local.set_cookie = None
+        for cookie in self.headers.get("Cookie", "").split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name == SESSION_COOKIE_NAME:
+                server._local.session = value
+
+        status = server._take_http_failure()
+        if status:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if "json-rpc" in self.path:
+            self._do_json_rpc()
+        else:
+            super().do_POST()
+
+    def _do_json_rpc(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if isinstance(request, list):
+            response = [self._dispatch_json(item) for item in request]
+        else:
+            response = self._dispatch_json(request)
+
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch_json(self, request):
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        try:
+            response["result"] = self.server._dispatch(
+                request["method"], request.get("params", [])
+            )
+        except Fault as fault:
+            response["error"] = {"code": fault.faultCode, "message": fault.faultString}
+        return response
+
+    def end_headers(self):
+        set_cookie = self.server._local.__dict__.pop("set_cookie", None)
+        if set_cookie:
+            self.send_header(
+                "Set-Cookie", f"{SESSION_COOKIE_NAME}={set_cookie}; Path=/; HttpOnly"
+            )
+        super().end_headers()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class FakeKiwiServer(
+    ThreadingMixIn, SimpleXMLRPCServer
+):  # pylint: disable=too-many-instance-attributes
+    """
+    Fake Kiwi TCMS server listening on ``address``. Use it as a context
+    manager or call :py:meth:`start` and :py:meth:`stop`.
+
+    :param users: Usernames and passwords of the users who may log in,
+                  defaults to ``tester`` with password ``password``
+    :type users: dict
+    :param latency: Number of seconds to wait before answering each
+                    HTTP request
+    :type latency: float
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), *, users=None, latency=0):
+        super().__init__(
+            address,
+            requestHandler=FakeKiwiRequestHandler,
+            logRequests=False,
+            allow_none=True,
+        )
+        self.register_multicall_functions()
+        self.kiwi = FakeKiwi(users)
+        self.latency = latency
+        self.sessions = {}
+        self.calls = Counter()
+        self.requests = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._faults = {}
+        self._http_failures = []
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        URL of the XML-RPC endpoint, replace ``xml-rpc`` with ``json-rpc``
+        to use JSON-RPC.
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/xml-rpc/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def fail(self, methodname, *, code=-32603, message="Injected fault", times=1):
+        """
+        Answer the next ``times`` calls of ``methodname`` with a fault.
+        """
+        with self._lock:
+            self._faults[methodname] = (Fault(code, message), times)
+
+    def fail_requests(self, status, times=1):
+        """
+        Answer the next ``times`` HTTP requests with ``status``, e.g. 503,
+        without calling any method.
+        """
+        with self._lock:
+            self._http_failures.extend([status] * times)
+
+    def expire_sessions(self):
+        """
+        Forget all sessions so clients have to log in again.
+        """
+        with self._lock:
+            self.sessions.clear()
+
+    def _take_http_failure(self):
+        with self._lock:
+            if self._http_failures:
+                return self._http_failures.pop(0)
+        return None
+
+    def _take_fault(self, methodname):
+        with self._lock:
+            fault, times = self._faults.get(methodname, (None, 0))
+            if not times:
+                return None
+
+            self._faults[methodname] = (fault, times - 1)
+            return fault
+
+    def _login(self, username, password):
+        if self.kiwi.passwords.get(username) != password:
+            raise Fault(-32603, "Wrong username or password")
+
+        user = self.kiwi.filter("User", {"username": username})[0]
+        session = os.urandom(16).hex()
+        with self._lock:
+            self.sessions[session] = user["id"]
+        self._local.set_cookie = session
+        return session
+
+    def _dispatch(self, method, params):
+        with self._lock:
+            self.calls[method] += 1
+
+        fault = self._take_fault(method)
+        if fault is not None:
+            raise fault
+
+        if method == "system.multicall":
+            return self.system_multicall(*params)
+
+        if method == "Auth.login":
+            return self._login(*params)
+
+        with self._lock:
+            user = self.sessions.get(self._local.session)
+        if user is None:
+            raise Fault(-32603, "Authentication failed: login required")
+
+        if method == "Auth.logout":
+            with self._lock:
+                self.sessions.pop(self._local.session, None)
+            return None
+
+        function = self.kiwi.methods.get(method)
+        if function is None:
+            raise Fault(-32601, f'method "{method}" is not supported')
+
+        return function(user, *params)
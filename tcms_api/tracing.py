@@ -0,0 +1,205 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Tracing of RPC calls. When an exporter is configured every RPC call made
+through :py:class:`tcms_api.xmlrpc.TCMSProxy`, and every operation of
+:py:class:`tcms_api.plugin_helpers.Backend`, is recorded as a span::
+
+    from tcms_api import tracing
+
+    tracing.set_exporter(tracing.JsonLinesExporter("/tmp/tcms-api.jsonl"))
+
+    with tracing.span("report results", job="nightly"):
+        rpc.TestExecution.update(execution_id, {"status": status_id})
+
+Spans started while another span is active become its children and share
+its trace ID. Each RPC request carries a W3C ``traceparent`` header and an
+``X-Request-ID`` header with the span ID so slow calls may be found in the
+logs of the server.
+
+An exporter is any object with an ``export(span)`` method. Without one,
+tracing is disabled and costs almost nothing.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_CURRENT = contextvars.ContextVar("tcms_api_span", default=None)
+
+
+def _new_id(size):
+    return os.urandom(size).hex()
+
+
+class Span:  # pylint: disable=too-many-instance-attributes
+    """
+    A timed operation. ``start`` is a UNIX timestamp, ``duration`` is in
+    seconds and ``error`` holds the representation of the exception which
+    ended the span, if any.
+    """
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "start",
+        "duration",
+        "error",
+        "_started",
+    )
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else _new_id(16)
+        self.span_id = _new_id(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes or {}
+        self.start = time.time()
+        self.duration = None
+        self.error = None
+        self._started = time.perf_counter()
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._started
+
+    def headers(self):
+        """
+        :return: HTTP headers which propagate this span to the server
+        :rtype: list
+        """
+        return [
+            ("traceparent", f"00-{self.trace_id}-{self.span_id}-01"),
+            ("X-Request-ID", self.span_id),
+        ]
+
+    def to_dict(self):
+        """
+        :rtype: dict
+        """
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class InMemoryExporter:
+    """
+    Keeps finished spans in the ``spans`` list, useful for tests.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def export(self, finished):
+        with self._lock:
+            self.spans.append(finished)
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+
+class JsonLinesExporter:  # pylint: disable=too-few-public-methods
+    """
+    Appends each finished span as a JSON object on a separate line of
+    the file at ``path``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, finished):
+        line = json.dumps(finished.to_dict(), default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line)
+
+
+class Tracer:  # pylint: disable=too-few-public-methods
+    """
+    Creates spans and passes them to ``exporter`` when they finish.
+    """
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """
+        Context manager which measures the enclosed block as a child of
+        the current span. Yields ``None`` when tracing is disabled.
+        """
+        exporter = self.exporter
+        if exporter is None:
+            yield None
+            return
+
+        current = Span(name, _CURRENT.get(), attributes)
+        token = _CURRENT.set(current)
+        try:
+            yield current
+        except BaseException as err:
+            current.error = repr(err)
+            raise
+        finally:
+            _CURRENT.reset(token)
+            current.finish()
+            exporter.export(current)
+
+
+TRACER = Tracer()
+
+
+def set_exporter(exporter):
+    """
+    Enable tracing for the whole process, ``None`` disables it.
+    """
+    TRACER.exporter = exporter
+
+
+def span(name, **attributes):
+    """
+    Same as :py:meth:`Tracer.span` of the process wide tracer.
+    """
+    return TRACER.span(name, **attributes)
+
+
+def current_span():
+    """
+    :return: The active span or ``None``
+    :rtype: Span
+    """
+    return _CURRENT.get()
+
+
+def traced(function):
+    """
+    Decorator which records each call of a method as a span named after
+    the class and the method.
+    """
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if TRACER.exporter is None:
+            return function(*args, **kwargs)
+
+        with TRACER.span(name):
+            return function(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,210 @@
+# Copyright (c) 2025 Kiwi TCMS project. All rights reserved.
+
+"""
+Faster replacement for ``xmlrpc.client.Unmarshaller`` which is used by
+:py:class:`tcms_api.xmlrpc.CookieTransport` by default.
+
+Instead of collecting every value on a generic stack and dispatching each
+closing element through a table of methods, values are placed directly into
+the ``dict`` or ``list`` which contains them. Struct keys are shared between
+all rows of a response, which saves memory for large results. Date & time
+values are returned as :py:class:`LazyDateTime` objects which are converted
+into ``datetime`` only when accessed.
+
+With ``compact_records=True`` structs which are items of an array
+returned by the server are converted into
+:py:class:`tcms_api.records.Record` as soon as they have been parsed.
+
+Pass ``fast_unmarshaller=False`` to :py:class:`tcms_api.TCMS` to fall back
+to the decoder from the standard library.
+"""
+
+from base64 import decodebytes
+from datetime import datetime
+from decimal import Decimal
+from xml.parsers import expat
+from xmlrpc.client import Binary, DateTime, Fault, ResponseError
+
+from tcms_api.records import to_record
+
+_ISO8601_FORMAT = "%Y%m%dT%H:%M:%S"
+
+
+class LazyDateTime(DateTime):
+    """
+    An ``xmlrpc.client.DateTime`` which keeps the original string and
+    parses it into a ``datetime`` object only on access.
+    """
+
+    _datetime = None
+
+    @property
+    def datetime(self):
+        """
+        :return: The value as a ``datetime`` object
+        :rtype: datetime.datetime
+        """
+        if self._datetime is None:
+            self._datetime = datetime.strptime(self.value, _ISO8601_FORMAT)
+        return self._datetime
+
+
+def _boolean(text):
+    if text == "0":
+        return False
+    if text == "1":
+        return True
+    raise TypeError("bad boolean value")
+
+
+def _nil(_text):
+    return None
+
+
+def _binary(text):
+    value = Binary()
+    value.decode(text.encode("ascii"))
+    return value
+
+
+def _bytes(text):
+    return decodebytes(text.encode("ascii"))
+
+
+def _datetime(text):
+    return datetime.strptime(text, _ISO8601_FORMAT)
+
+
+class FastUnmarshaller:
+    """
+    Parses an XML-RPC response fed in chunks via :py:meth:`feed`.
+
+    Provides the interface of both the parser and the unmarshaller returned
+    by ``xmlrpc.client.getparser()``, :py:meth:`close` returns the tuple of
+    response parameters or raises ``xmlrpc.client.Fault``.
+
+    .. note::
+
+        Element handlers are closures over local variables and character
+        data is collected by ``list.append`` directly because the cost of
+        parsing is dominated by the number of Python calls made by expat.
+    """
+
+    def __init__(  # pylint: disable=too-many-statements
+        self, use_datetime=False, use_builtin_types=False, compact_records=False
+    ):
+        converters = {
+            "string": str,
+            "int": int,
+            "i4": int,
+            "i8": int,
+            "i1": int,
+            "i2": int,
+            "biginteger": int,
+            "double": float,
+            "float": float,
+            "bigdecimal": Decimal,
+            "boolean": _boolean,
+            "nil": _nil,
+            "ex:nil": _nil,
+            "base64": _bytes if use_builtin_types else _binary,
+            "dateTime.iso8601": (
+                _datetime if use_datetime or use_builtin_types else LazyDateTime
+            ),
+        }
+
+        params = []
+        # containers which are still being parsed, innermost last
+        containers = []
+        # member names waiting for their value, innermost last
+        names = []
+        # struct keys seen so far, shared between all structs
+        keys = {}
+        # string values of rows converted into records, see to_record()
+        strings = {}
+        # character data of the current element
+        text = []
+        # [value of the last closed element, does <value> have a type element]
+        state = [None, False]
+
+        def start(tag, _attrs):
+            text.clear()
+            if tag == "value":
+                state[1] = False
+            elif tag == "struct":
+                containers.append({})
+            elif tag == "array":
+                containers.append([])
+
+        def end(tag):
+            convert = converters.get(tag)
+            if convert is not None:
+                state[0] = convert("".join(text))
+                state[1] = True
+            elif tag == "value":
+                # value without a type element is a string
+                value = state[0] if state[1] else "".join(text)
+                if not containers:
+                    params.append(value)
+                elif names and isinstance(containers[-1], dict):
+                    containers[-1][names.pop()] = value
+                else:
+                    containers[-1].append(value)
+            elif tag == "name":
+                name = "".join(text)
+                names.append(keys.setdefault(name, name))
+            elif tag == "struct":
+                row = containers.pop()
+                # a row of the returned list
+                if (
+                    compact_records
+                    and len(containers) == 1
+                    and isinstance(containers[0], list)
+                ):
+                    row = to_record(row, strings)
+                state[0] = row
+                state[1] = True
+            elif tag == "array":
+                state[0] = containers.pop()
+                state[1] = True
+            elif tag in ("params", "fault"):
+                self._type = tag
+
+        self._type = None
+        self._params = params
+        self._containers = containers
+        self._result = None
+
+        self._parser = expat.ParserCreate(None, None)
+        self._parser.buffer_text = True
+        self._parser.buffer_size = 64 * 1024
+        self._parser.StartElementHandler = start
+        self._parser.EndElementHandler = end
+        self._parser.CharacterDataHandler = text.append
+
+    def feed(self, data):
+        self._parser.Parse(data, False)
+
+    def close(self):
+        if self._result is None:
+            self._parser.Parse(b"", True)
+
+            if self._type is None or self._containers:
+                raise ResponseError()
+            self._result = tuple(self._params)
+
+        if self._type == "fault":
+            raise Fault(**self._result[0])
+        return self._result
+
+
+def getparser(use_datetime=False, use_builtin_types=False, compact_records=False):
+    """
+    Same as ``xmlrpc.client.getparser()`` but using
+    :py:class:`FastUnmarshaller`.
+
+    :return: parser, unmarshaller
+    :rtype: tuple
+    """
+    unmarshaller = FastUnmarshaller(use_datetime, use_builtin_types, compact_records)
+    return unmarshaller, unmarshaller
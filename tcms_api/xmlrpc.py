@@ -1,69 +1,957 @@
-# pylint: disable=protected-access,too-few-public-methods
+# pylint: disable=protected-access,too-few-public-methods,too-many-lines
 
+import importlib
+import select
+import socket
+import ssl
 import sys
+import threading
+import time
 import urllib.parse
+import urllib.request
+import zlib
 
 from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
-from http.client import HTTPSConnection
-from xmlrpc.client import _Method, SafeTransport, Transport, ServerProxy
-
-try:
-    import gssapi
-except ImportError:
-    gssapi = None
-
-import requests
+from http.client import HTTPConnection, HTTPSConnection, RemoteDisconnected
+from xmlrpc.client import (
+    Fault,
+    ProtocolError,
+    SafeTransport,
+    Transport,
+    ServerProxy,
+    gzip_encode,
+)
 
+from tcms_api import forking
+from tcms_api.batch import DEFAULT_BATCH_SIZE, Batch
+from tcms_api.cache import DEFAULT_MAX_BYTES, ResponseCache
+from tcms_api.callbudget import DEFAULT_THRESHOLD, CallRecorder
+from tcms_api.concurrency import AdaptiveConcurrency
+from tcms_api.cookies import CookieJar
+from tcms_api.metrics import Metrics
+from tcms_api.parallel import Method, map_calls
+from tcms_api.profiling import (
+    ProfiledHTTPConnection,
+    ProfiledHTTPSConnection,
+    Profiler,
+)
+from tcms_api.ratelimit import shared_limiter
+from tcms_api.records import compact
+from tcms_api.replay import BufferedResponse, Recorder, Recording
+from tcms_api.retry import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RETRY_BACKOFF,
+    DEFAULT_RETRY_BUDGET,
+    RetryPolicy,
+)
+from tcms_api.tracing import TRACER, current_span
+from tcms_api.unmarshaller import getparser as fast_getparser
 from tcms_api.version import __version__
 
-VERBOSE = 0
 _PYTHON_VERSION = sys.version.replace("\n", "")
 
+# gssapi and requests are only needed for Kerberos and slow to import,
+# see _load_gssapi()
+gssapi = None  # pylint: disable=invalid-name
+
+XML_CONTENT_TYPE = "text/xml"
+
+DEFAULT_POOL_SIZE = 10
+# Servers and load balancers drop keep-alive connections which have been idle
+# for too long. With Python >= 3.10 reusing such a connection results in
+# `ssl.SSLEOFError: EOF occurred in violation of protocol`. In practice
+# 5 minutes works as well, 6 minutes fails so be more cautious and close idle
+# connections earlier!
+DEFAULT_POOL_IDLE_TIMEOUT = 240
+
+# Kiwi TCMS answers calls which the user isn't permitted to make with the
+# same fault as calls with an expired session. Don't log in again sooner
+# than this many seconds after the previous login
+MIN_RELOGIN_INTERVAL = 1.0
+
+# response bodies are read and parsed in chunks of this size
+_READ_SIZE = 64 * 1024
+
+# errors which mean that the server has dropped a keep-alive connection,
+# the request is retried once on a new socket if it hasn't been sent yet
+_RECONNECT_ERRORS = (
+    ssl.SSLEOFError,
+    RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+def _load_gssapi():
+    """
+    Returns the gssapi module, imported on first use, or None if it
+    isn't installed.
+    """
+    global gssapi  # pylint: disable=global-statement
+    if gssapi is None:
+        try:
+            gssapi = importlib.import_module("gssapi")
+        except ImportError:
+            pass
+    return gssapi
+
+
+def _is_auth_failure(fault):
+    """
+    Returns True if the server rejected the session of the caller.
+    """
+    return "Authentication failed" in str(fault.faultString)
+
+
+def _thread_counters(transport):
+    """
+    Returns bytes sent, bytes received and reconnects of the calling thread.
+    """
+    if isinstance(transport, CookieTransport):
+        return transport.thread_counters()
+    return (0, 0, 0)
+
+
+class TCMSProxy(ServerProxy):  # pylint: disable=too-many-instance-attributes
+    """
+    A ``ServerProxy`` which logs in again when the server no longer
+    accepts the current session and retries calls which fail because
+    of transient errors.
+
+    :param login: Callable which performs authentication, see
+                  :py:meth:`TCMSXmlrpc.login`
+    :type login: callable
+    :param retry_policy: Decides which failed calls are sent again,
+                         ``None`` disables retrying
+    :type retry_policy: tcms_api.retry.RetryPolicy
+    :param rate_limiter: Limits the rate of calls, ``None`` disables it
+    :type rate_limiter: tcms_api.ratelimit.RateLimiter
+    :param concurrency: Limits the number of concurrent calls based on
+                        observed latency, ``None`` disables it
+    :type concurrency: tcms_api.concurrency.AdaptiveConcurrency
+    :param metrics: Collects per-method metrics, ``None`` disables it
+    :type metrics: tcms_api.metrics.Metrics
+    :param cache: Answers repeated reads, ``None`` disables it
+    :type cache: tcms_api.cache.ResponseCache
+    :param compact_records: Return dictionaries in lists as
+                            :py:class:`tcms_api.records.Record`
+    :type compact_records: bool
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *args,
+        login=None,
+        retry_policy=None,
+        rate_limiter=None,
+        concurrency=None,
+        metrics=None,
+        cache=None,
+        compact_records=False,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.login = login
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.metrics = metrics
+        self.cache = cache
+        self.compact_records = compact_records
+        self.relogins = 0
+        self._relogged_at = float("-inf")
+        # method name -> value of self.relogins when the method was rejected
+        # right after logging in again, i.e. because of missing permissions
+        self._denied = {}
+        self._login_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._recorder = CallRecorder()
+        forking.register(self)
+
+    def _after_fork(self):
+        # worker threads of the parent don't exist in the child
+        self._login_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
 
-class TCMSProxy(ServerProxy):
     def __request(self, methodname, params):
-        self._ServerProxy__transport._extra_headers = [
-            ("Referer", f"{methodname}@{self._ServerProxy__host}")
-        ]
+        if self.cache is None:
+            return self.__compacted_request(methodname, params)
+
+        return self.cache.call(self.__compacted_request, methodname, params)
+
+    def __compacted_request(self, methodname, params):
+        result = self.__recorded_request(methodname, params)
+        # system.multicall results are unpacked by Batch
+        if not self.compact_records or methodname.startswith("system."):
+            return result
+
+        return compact(result)
+
+    def __recorded_request(self, methodname, params):
+        if not self._recorder.profiles:
+            return self.__traced_request(methodname, params)
+
+        return self._recorder.call(self.__traced_request, methodname, params)
+
+    def __traced_request(self, methodname, params):
+        if TRACER.exporter is None:
+            return self.__measured_request(methodname, params)
+
+        with TRACER.span(methodname, host=self._ServerProxy__host):
+            return self.__measured_request(methodname, params)
+
+    def __measured_request(self, methodname, params):
+        if self.metrics is None:
+            return self.__authenticated_request(methodname, params)
+
+        transport = self._ServerProxy__transport
+        before = _thread_counters(transport)
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = self.__authenticated_request(methodname, params)
+            failed = False
+            return result
+        finally:
+            after = _thread_counters(transport)
+            self.metrics.record(
+                methodname,
+                time.perf_counter() - started,
+                failed,
+                sent=after[0] - before[0],
+                received=after[1] - before[1],
+                reconnects=after[2] - before[2],
+            )
+
+    def __authenticated_request(self, methodname, params):
+        relogins = self.relogins
+        try:
+            return self.__send(methodname, params)
+        except Fault as fault:
+            if not self._should_relogin(methodname, fault, relogins):
+                raise
+            relogins = self._relogin(relogins, fault)
+
+        try:
+            return self.__send(methodname, params)
+        except Fault as fault:
+            self._rejected_after_relogin(methodname, fault, relogins)
+            raise
+
+    def _should_relogin(self, methodname, fault, relogins):
+        """
+        :return: Whether ``fault``, raised by a call sent when
+                 ``self.relogins`` was ``relogins``, means that the call
+                 should be sent again after logging in again
+        :rtype: bool
+        """
+        return (
+            self.login is not None
+            and not methodname.startswith("Auth.")
+            and _is_auth_failure(fault)
+            and self._denied.get(methodname) != relogins
+        )
+
+    def _relogin(self, relogins, rejected):
+        """
+        Log in again unless another thread has already done so since
+        ``self.relogins`` was ``relogins``. Raises ``rejected`` when the
+        previous login was less than ``MIN_RELOGIN_INTERVAL`` seconds ago.
+
+        :return: The new value of ``self.relogins``
+        :rtype: int
+        """
+        with self._login_lock:
+            # another thread may have already logged in again
+            if self.relogins == relogins:
+                if time.monotonic() - self._relogged_at < MIN_RELOGIN_INTERVAL:
+                    raise rejected
+                self.login()
+                self.relogins += 1
+                self._relogged_at = time.monotonic()
+            return self.relogins
+
+    def _rejected_after_relogin(self, methodname, fault, relogins):
+        if _is_auth_failure(fault):
+            # the new session is rejected as well, don't log in again
+            # for this method until the session changes
+            self._denied[methodname] = relogins
+
+    def __send(self, methodname, params):
+        headers = [("Referer", f"{methodname}@{self._ServerProxy__host}")]
+        span = current_span()
+        if span is not None:
+            headers.extend(span.headers())
+        transport = self._ServerProxy__transport
+        transport._extra_headers = headers
+        transport._methodname = methodname
+        if self.retry_policy is None:
+            return self.__limited_call(methodname, params)
+
+        return self.retry_policy.call(
+            lambda: self.__limited_call(methodname, params), methodname, params, self
+        )
+
+    def __limited_call(self, methodname, params):
+        if self.rate_limiter is None:
+            return self.__concurrent_call(methodname, params)
+
+        with self.rate_limiter.limit(methodname, params):
+            return self.__concurrent_call(methodname, params)
+
+    def __concurrent_call(self, methodname, params):
+        if self.concurrency is None:
+            return self._call(methodname, params)
+
+        with self.concurrency.slot():
+            return self._call(methodname, params)
+
+    def _call(self, methodname, params):
+        """
+        Marshal the call, send it to the server and return the unmarshalled
+        result. Subclasses override this to speak a different wire protocol.
+        """
         return self._ServerProxy__request(methodname, params)
 
     def __getattr__(self, name):
-        return _Method(self.__request, name)
+        return Method(self.__request, name, self.executor)
+
+    def executor(self):
+        """
+        Returns the thread pool used by ``rpc.Model.method.submit()``,
+        creating it on first use with as many workers as there are
+        connections in the pool.
+
+        :rtype: concurrent.futures.ThreadPoolExecutor
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._ServerProxy__transport.pool.size,
+                    thread_name_prefix="tcms-api",
+                )
+            return self._executor
+
+    def map(self, methodname, iterable, workers=None):
+        """
+        Call ``methodname`` once for each item of ``iterable`` from a pool of
+        ``workers`` threads and yield the results in order, see
+        :py:func:`tcms_api.parallel.map_calls`.
+        """
+        if workers is None:
+            workers = self._ServerProxy__transport.pool.size
+        return map_calls(getattr(self, methodname), iterable, workers)
+
+    def batch(self, max_size=DEFAULT_BATCH_SIZE):
+        """
+        Returns a :py:class:`tcms_api.batch.Batch` which packs calls into
+        ``system.multicall`` requests of up to ``max_size`` calls.
+        """
+        return Batch(self, max_size)
+
+    def profile(self, max_calls=None, threshold=DEFAULT_THRESHOLD):
+        """
+        Context manager which records all calls made while it is active,
+        see :py:mod:`tcms_api.callbudget`.
+        """
+        return self._recorder.profile(max_calls, threshold)
+
+
+def _is_dropped(connection):
+    """
+    Returns True if the server has closed an idle connection. Nothing is
+    expected from the server while no request is being sent, so a socket
+    which is readable has either reached EOF or is in an unknown state.
+    """
+    sock = getattr(connection, "sock", None)
+    if not isinstance(sock, socket.socket):
+        return False
+
+    if hasattr(select, "poll"):
+        poller = select.poll()
+        poller.register(sock, select.POLLIN)
+        return bool(poller.poll(0))
+
+    readable, _, _ = select.select([sock], [], [], 0)
+    return bool(readable)
+
+
+class ConnectionPool:  # pylint: disable=too-many-instance-attributes
+    """
+    A bounded set of keep-alive HTTP(S) connections per host. Threads
+    check out a connection with :py:meth:`acquire` and return it with
+    :py:meth:`release` once the response has been read. When all
+    connections for a host are in use :py:meth:`acquire` blocks until
+    another thread returns one.
+
+    :param factory: Callable which receives a host and returns a new,
+                    not yet connected, ``http.client.HTTPConnection``
+    :type factory: callable
+    :param size: Maximum number of connections per host
+    :type size: int
+    :param idle_timeout: Connections which have not been used for more than
+                         this many seconds are closed instead of reused
+    :type idle_timeout: float
+
+    Idle connections which the server has already closed are dropped
+    instead of reused.
+    """
 
+    def __init__(
+        self, factory, size=DEFAULT_POOL_SIZE, idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT
+    ):
+        if size < 1:
+            raise ValueError(f"Pool size must be a positive number, not {size}")
 
-class CookieTransport(Transport):
-    """A subclass of xmlrpc.client.Transport that supports cookies."""
+        self.factory = factory
+        self.size = size
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        # host -> list of (connection, last used timestamp)
+        self._idle = {}
+        # host -> semaphore guarding the number of checked out connections
+        self._slots = {}
+        self._in_use = 0
+        self._counters = {
+            "created": 0,
+            "reused": 0,
+            "expired": 0,
+            "dropped": 0,
+            "discarded": 0,
+            "waited": 0,
+        }
+        forking.register(self)
+
+    def _after_fork(self):
+        # sockets are shared with the parent process, using them from both
+        # processes corrupts the HTTP streams. Closing them here only closes
+        # the file descriptors of the child, the parent keeps using them
+        for idle in self._idle.values():
+            for connection, _ in idle:
+                connection.close()
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._slots = {}
+        self._in_use = 0
+
+    def _slots_for(self, host):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.size)
+            return self._slots[host]
+
+    def acquire(self, host, fresh=False):
+        """
+        Check out an idle connection for ``host`` or create a new one.
+
+        :param fresh: If ``True`` always create a new connection
+        :type fresh: bool
+        """
+        slots = self._slots_for(host)
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self._counters["waited"] += 1
+            slots.acquire()
+
+        with self._lock:
+            idle = [] if fresh else self._idle.get(host, [])
+            now = time.monotonic()
+            while idle:
+                connection, last_used = idle.pop()
+                if now - last_used > self.idle_timeout:
+                    self._counters["expired"] += 1
+                elif _is_dropped(connection):
+                    self._counters["dropped"] += 1
+                else:
+                    self._counters["reused"] += 1
+                    self._in_use += 1
+                    return connection
+
+                connection.close()
+
+            self._counters["created"] += 1
+            self._in_use += 1
+
+        try:
+            return self.factory(host)
+        except Exception:
+            self._checked_in(host)
+            raise
+
+    def _checked_in(self, host):
+        with self._lock:
+            self._in_use -= 1
+        self._slots[host].release()
+
+    def release(self, host, connection):
+        """
+        Return a healthy connection to the pool so it can be reused.
+        """
+        with self._lock:
+            self._idle.setdefault(host, []).append((connection, time.monotonic()))
+        self._checked_in(host)
+
+    def discard(self, host, connection):
+        """
+        Close a connection which is in an unknown state and free its slot.
+        """
+        connection.close()
+        with self._lock:
+            self._counters["discarded"] += 1
+        self._checked_in(host)
+
+    def clear(self):
+        """
+        Close all idle connections. Checked out connections are not affected.
+        """
+        with self._lock:
+            for idle in self._idle.values():
+                for connection, _ in idle:
+                    connection.close()
+            self._idle.clear()
+
+    def stats(self):
+        """
+        :return: Pool configuration and usage counters
+        :rtype: dict
+        """
+        with self._lock:
+            result = dict(self._counters)
+            result["size"] = self.size
+            result["idle_timeout"] = self.idle_timeout
+            result["idle"] = sum(len(idle) for idle in self._idle.values())
+            result["in_use"] = self._in_use
+        return result
+
+
+class _ResponseStream:
+    """
+    Reads a response body, decompressing it while it is being read when it is
+    gzip encoded, and counts the number of bytes before and after that.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self._decompressor = None
+        if response.getheader("Content-Encoding", "") == "gzip":
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def read(self, size=None):
+        while True:
+            chunk = self.response.read(size)
+            self.wire_bytes += len(chunk)
+
+            if self._decompressor is None:
+                data = chunk
+            elif chunk:
+                data = self._decompressor.decompress(chunk)
+                if not data:
+                    continue
+            else:
+                data = self._decompressor.flush()
+
+            self.decoded_bytes += len(data)
+            return data
+
+
+class CookieTransport(Transport):  # pylint: disable=too-many-instance-attributes
+    """
+    A subclass of xmlrpc.client.Transport that supports cookies.
+
+    Unlike the parent class it is safe to share between threads. Each
+    request checks out a keep-alive connection from a
+    :py:class:`ConnectionPool` while all connections share the same
+    session cookie.
+
+    When ``content_type`` is not XML the transport doesn't parse response
+    bodies and returns them as bytes, leaving unmarshalling to the proxy.
+
+    Request bodies larger than ``compress_threshold`` bytes are gzip
+    compressed. Only enable this if the server, or a reverse proxy in front
+    of it, accepts compressed requests! Gzip encoded responses are accepted
+    unless ``accept_gzip`` is ``False`` and are decompressed while being
+    parsed. Use :py:meth:`transfer_stats` to compare the number of bytes
+    before and after compression.
+
+    XML-RPC responses are decoded with
+    :py:class:`tcms_api.unmarshaller.FastUnmarshaller` unless
+    ``fast_unmarshaller`` is ``False``. With ``compact_records=True`` it
+    converts the rows of returned lists into
+    :py:class:`tcms_api.records.Record` while parsing.
+
+    When ``profiler`` is a :py:class:`tcms_api.profiling.Profiler` the
+    duration of each phase of every request is recorded into it. When
+    ``recorder`` is a :py:class:`tcms_api.replay.Recorder` every request
+    and response is written to its file.
+    """
 
     scheme = "http"
+    connection_class = HTTPConnection
+    profiled_connection_class = ProfiledHTTPConnection
     user_agent = f"tcms-api/{__version__}/Python {_PYTHON_VERSION}"
 
-    def __init__(self, *args, **kwargs):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *args,
+        pool_size=DEFAULT_POOL_SIZE,
+        pool_idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT,
+        content_type=XML_CONTENT_TYPE,
+        compress_threshold=None,
+        accept_gzip=True,
+        fast_unmarshaller=True,
+        compact_records=False,
+        profiler=None,
+        recorder=None,
+        **kwargs,
+    ):
+        # holds per-thread request state, must exist before the parent
+        # class initializes self._extra_headers
+        self._local = threading.local()
         super().__init__(*args, **kwargs)
-        self._cookies = []
+        self.content_type = content_type
+        self.encode_threshold = compress_threshold
+        self.accept_gzip_encoding = accept_gzip
+        self.fast_unmarshaller = fast_unmarshaller
+        self.compact_records = compact_records
+        self.profiler = profiler
+        self.recorder = recorder
+        self._transferred = {
+            "sent": 0,
+            "sent_uncompressed": 0,
+            "received": 0,
+            "received_uncompressed": 0,
+        }
+        self.cookies = CookieJar()
+        self.pool = ConnectionPool(self._new_connection, pool_size, pool_idle_timeout)
+        self.reconnects = 0
+        self._lock = threading.Lock()
+        forking.register(self)
+
+    def _after_fork(self):
+        # the connection checked out by the forking thread belongs to the
+        # parent, the pool forgets its sockets on its own
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.cookies._lock = threading.Lock()
+
+    @property
+    def _extra_headers(self):
+        return getattr(self._local, "extra_headers", [])
+
+    @_extra_headers.setter
+    def _extra_headers(self, value):
+        self._local.extra_headers = value
+
+    @property
+    def _methodname(self):
+        return getattr(self._local, "methodname", None)
+
+    @_methodname.setter
+    def _methodname(self, value):
+        self._local.methodname = value
+
+    def _connection_factory(self):
+        if self.profiler is None:
+            return self.connection_class
+        return self.profiled_connection_class
+
+    def _new_connection(self, host):
+        chost, _, _ = self.get_host_info(host)
+        return self._connection_factory()(chost)
+
+    def make_connection(self, host):
+        connection = self.pool.acquire(host, getattr(self._local, "reconnect", False))
+        # a request sent on a socket which has been used before may find it
+        # closed by the server, see request()
+        self._local.reused = connection.sock is not None
+        if self.profiler is not None:
+            # a reused connection doesn't resolve, connect or handshake again
+            connection.timings.clear()
+        self._local.connection = connection
+        return connection
+
+    def _checkin(self, host, discard=False):
+        connection = self._local.__dict__.pop("connection", None)
+        if connection is None:
+            return
+
+        if discard:
+            self.pool.discard(host, connection)
+        else:
+            self.pool.release(host, connection)
+
+    def request(self, host, handler, request_body, verbose=False):
+        try:
+            return self.single_request(host, handler, request_body, verbose)
+        except _RECONNECT_ERRORS:
+            # once the request has been sent the server may have processed
+            # it, sending it again is up to the retry policy of the caller
+            if not getattr(self._local, "reused", False) or getattr(
+                self._local, "request_sent", False
+            ):
+                raise
+
+        # the broken socket has been discarded, other idle sockets were
+        # opened around the same time so don't trust them either
+        with self._lock:
+            self.reconnects += 1
+        self._local.reconnects = getattr(self._local, "reconnects", 0) + 1
+        self._local.reconnect = True
+        try:
+            return self.single_request(host, handler, request_body, verbose)
+        finally:
+            self._local.reconnect = False
+
+    def single_request(self, host, handler, request_body, verbose=False):
+        self._local.reused = False
+        self._local.request_sent = False
+        try:
+            started = time.perf_counter()
+            connection = self.send_request(host, handler, request_body, verbose)
+            self._local.request_sent = True
+            sent = time.perf_counter()
+            response = connection.getresponse()
+            answered = time.perf_counter()
+            if self.recorder is not None:
+                response = self._record(request_body, response, started)
+            if response.status == HTTPStatus.OK:
+                self.cookies.update(
+                    response.msg.get_all("Set-Cookie", []), host, handler
+                )
+                try:
+                    result = self.parse_response(response)
+                finally:
+                    if self.profiler is not None:
+                        self._profile(connection, started, sent, answered)
+                self._checkin(host)
+                return result
+        except Fault:
+            # the response body has been consumed so the connection is reusable
+            self._checkin(host)
+            raise
+        except Exception:
+            # all unexpected errors leave the connection in a strange state
+            self._checkin(host, discard=True)
+            raise
 
-    def send_headers(self, connection, headers):
-        if self._cookies:
-            connection.putheader("Cookie", "; ".join(self._cookies))
-        super().send_headers(connection, headers)
+        # discard any response data to keep the connection reusable
+        response.read()
+        self._checkin(host)
+        raise ProtocolError(
+            host + handler,
+            response.status,
+            response.reason,
+            dict(response.getheaders()),
+        )
+
+    def _record(self, request_body, response, started):
+        # responses are recorded after decompression
+        body = _ResponseStream(response).read()
+        buffered = BufferedResponse(
+            response.status,
+            response.reason,
+            [
+                (name, value)
+                for name, value in response.getheaders()
+                if name.lower() != "content-encoding"
+            ],
+            body,
+        )
+        self.recorder.record(request_body, buffered, time.perf_counter() - started)
+        return buffered
+
+    def _profile(self, connection, started, sent, answered):
+        phases = dict(connection.timings)
+        phases["send"] = sent - started - sum(phases.values())
+        phases["wait"] = answered - sent
+        phases["parse"] = time.perf_counter() - answered
+        self.profiler.record(self._methodname, phases)
+
+    def close(self):
+        self.pool.clear()
+
+    def send_request(self, host, handler, request_body, debug):
+        connection = self.make_connection(host)
+        headers = self._headers + self._extra_headers
+        if debug:
+            connection.set_debuglevel(1)
+        if self.accept_gzip_encoding:
+            connection.putrequest("POST", handler, skip_accept_encoding=True)
+            headers.append(("Accept-Encoding", "gzip"))
+        else:
+            connection.putrequest("POST", handler)
+        headers.append(("Content-Type", self.content_type))
+        headers.append(("User-Agent", self.user_agent))
+        cookie = self.cookies.header(host, handler, secure=self.scheme == "https")
+        if cookie:
+            headers.append(("Cookie", cookie))
+        self.send_headers(connection, headers)
+        self.send_content(connection, request_body)
+        return connection
+
+    def send_content(self, connection, request_body):
+        size = len(request_body)
+        if self.encode_threshold is not None and self.encode_threshold < size:
+            connection.putheader("Content-Encoding", "gzip")
+            request_body = gzip_encode(request_body)
+
+        self._count(sent=len(request_body), sent_uncompressed=size)
+        connection.putheader("Content-Length", str(len(request_body)))
+        connection.endheaders(request_body)
+
+    def _count(self, **sizes):
+        with self._lock:
+            for name, size in sizes.items():
+                self._transferred[name] += size
+
+        for name in ("sent", "received"):
+            if name in sizes:
+                setattr(self._local, name, getattr(self._local, name, 0) + sizes[name])
+
+    def thread_counters(self):
+        """
+        :return: Bytes sent and received on the wire and the number of
+                 reconnects by the calling thread so far
+        :rtype: tuple
+        """
+        return (
+            getattr(self._local, "sent", 0),
+            getattr(self._local, "received", 0),
+            getattr(self._local, "reconnects", 0),
+        )
+
+    def transfer_stats(self):
+        """
+        :return: Number of bytes sent and received on the wire and before
+                 compression, respectively after decompression
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(self._transferred)
+
+    def auth_headers(
+        self, host, negotiate=False
+    ):  # pylint: disable=unused-argument,no-self-use
+        """
+        :return: Authentication headers for the next request to ``host``
+        :rtype: list
+        """
+        return []
+
+    def getparser(self, compact_records=False):
+        if self.fast_unmarshaller:
+            return fast_getparser(
+                use_datetime=self._use_datetime,
+                use_builtin_types=self._use_builtin_types,
+                compact_records=compact_records,
+            )
+        return super().getparser()
 
     def parse_response(self, response):
-        for header in response.msg.get_all("Set-Cookie", []):
-            cookie = header.split(";", 1)[0]
-            self._cookies.append(cookie)
-        return super().parse_response(response)
+        stream = _ResponseStream(response)
+        if self.content_type == XML_CONTENT_TYPE:
+            # system.multicall results are unpacked by Batch
+            parser, unmarshaller = self.getparser(
+                self.compact_records
+                and not (self._methodname or "").startswith("system.")
+            )
+            while True:
+                data = stream.read(_READ_SIZE)
+                if not data:
+                    break
+                parser.feed(data)
+            parser.close()
+            result = unmarshaller.close()
+        else:
+            result = stream.read()
+
+        self._count(
+            received=stream.wire_bytes, received_uncompressed=stream.decoded_bytes
+        )
+        return result
 
 
 class SafeCookieTransport(SafeTransport, CookieTransport):
     """SafeTransport subclass that supports cookies."""
 
     scheme = "https"
+    connection_class = HTTPSConnection
+    profiled_connection_class = ProfiledHTTPSConnection
+
+    def __init__(
+        self, *args, context=None, **kwargs
+    ):  # pylint: disable=super-init-not-called
+        CookieTransport.__init__(self, *args, **kwargs)
+        self.context = context
+
+    def _new_connection(self, host):
+        chost, _, x509 = self.get_host_info(host)
+        return self._connection_factory()(
+            chost, None, context=self.context, **(x509 or {})
+        )
+
+    def make_connection(self, host):
+        return CookieTransport.make_connection(self, host)
+
+
+class ReplayTransport(CookieTransport):
+    """
+    Answers requests with the responses stored in the file at ``path``
+    by a :py:class:`tcms_api.replay.Recorder` instead of sending them to
+    a server. Each response is delayed by its recorded duration
+    multiplied by ``latency_scale``, by default there is no delay.
+    """
+
+    def __init__(self, path, *args, latency_scale=0.0, sleep=time.sleep, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recording = Recording(path)
+        self.latency_scale = latency_scale
+        self.sleep = sleep
+
+    def single_request(self, host, handler, request_body, verbose=False):
+        call = self.recording.find(request_body)
+        self._count(sent=len(request_body), sent_uncompressed=len(request_body))
+        if call.elapsed and self.latency_scale:
+            self.sleep(call.elapsed * self.latency_scale)
+
+        response = call.response(request_body)
+        if response.status == HTTPStatus.OK:
+            return self.parse_response(response)
+
+        raise ProtocolError(
+            host + handler,
+            response.status,
+            response.reason,
+            dict(response.getheaders()),
+        )
 
 
 class KerbTransport(SafeCookieTransport):
-    """Handles GSSAPI Negotiation (SPNEGO) authentication."""
+    """
+    Handles GSSAPI Negotiation (SPNEGO) authentication.
+
+    By default every request carries a new SPNEGO token and uses a new
+    connection. With ``keep_alive=True``, once the session cookie has been
+    obtained, connections are kept alive and SPNEGO is performed again only
+    when the server answers with *401 Unauthorized*.
+    """
+
+    session_cookie_name = "sessionid"
+
+    def __init__(self, *args, keep_alive=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.keep_alive = keep_alive
 
     def get_host_info(self, host):
+        _load_gssapi()
         host, extra_headers, x509 = Transport.get_host_info(self, host)
 
         # Set the remote host principal
@@ -78,22 +966,66 @@ class KerbTransport(SafeCookieTransport):
 
         return host, extra_headers, x509
 
+    def _new_connection(self, host):
+        chost, _, x509 = Transport.get_host_info(self, host)
+        return self._connection_factory()(
+            chost, None, **(x509 or {})
+        )  # nosec:B309:blacklist
+
+    def _has_session(self, host):
+        return self.cookies.get(self.session_cookie_name, host, secure=True) is not None
+
+    def auth_headers(self, host, negotiate=False):
+        """
+        :return: A fresh SPNEGO token for every request or, with
+                 ``keep_alive=True``, only when there is no session yet or
+                 ``negotiate`` is ``True``
+        :rtype: list
+        """
+        if not self.keep_alive or negotiate or not self._has_session(host):
+            return self.get_host_info(host)[1]
+        return []
+
     def make_connection(self, host):
         """
-        Return an individual HTTPS connection for each request.
+        Return an HTTPS connection from the pool, adding a fresh
+        SPNEGO token to the request when necessary.
 
         Fix https://bugzilla.redhat.com/show_bug.cgi?id=735937
         """
-        chost, self._extra_headers, x509 = self.get_host_info(host)
-        # Kiwi TCMS isn't ready to use HTTP/1.1 persistent connections,
-        # so tell server current opened HTTP connection should be closed after
-        # request is handled. And there will be a new connection for the next
-        # request.
-        self._extra_headers.append(("Connection", "close"))
-        self._connection = host, HTTPSConnection(  # nosec:B309:blacklist
-            chost, None, **(x509 or {})
+        # drop headers added by a previous attempt of the same request
+        headers = [
+            header
+            for header in self._extra_headers
+            if header[0] not in ("Authorization", "Connection")
+        ]
+
+        headers.extend(
+            self.auth_headers(host, getattr(self._local, "negotiate", False))
         )
-        return self._connection[1]
+        if not self.keep_alive:
+            # Kiwi TCMS isn't ready to use HTTP/1.1 persistent connections,
+            # so tell server current opened HTTP connection should be closed after
+            # request is handled. And there will be a new connection for the next
+            # request.
+            headers.append(("Connection", "close"))
+
+        self._extra_headers = headers
+        return super().make_connection(host)
+
+    def single_request(self, host, handler, request_body, verbose=False):
+        try:
+            return super().single_request(host, handler, request_body, verbose)
+        except ProtocolError as err:
+            if not self.keep_alive or err.errcode != HTTPStatus.UNAUTHORIZED:
+                raise
+
+        # the server doesn't accept the session anymore, negotiate again
+        self._local.negotiate = True
+        try:
+            return super().single_request(host, handler, request_body, verbose)
+        finally:
+            self._local.negotiate = False
 
 
 def get_hostname(url):
@@ -114,18 +1046,47 @@ class TCMSXmlrpc:
 
     session_cookie_name = "sessionid"
     transport = None
+    proxy_class = TCMSProxy
+    content_type = XML_CONTENT_TYPE
 
-    def __init__(self, username, password, url):
+    def __init__(self, username, password, url, **options):
         if self.transport is None:
-            if url.startswith("https://"):
-                self.transport = SafeCookieTransport()
-            elif url.startswith("http://"):
-                self.transport = CookieTransport()
-            else:
-                raise RuntimeError("Unrecognized URL scheme")
+            self.transport = self.create_transport(url, options)
 
-        self.server = TCMSProxy(
-            url, transport=self.transport, verbose=VERBOSE, allow_none=1
+        self.server = self.proxy_class(
+            url,
+            transport=self.transport,
+            allow_none=1,
+            login=self.login,
+            retry_policy=RetryPolicy(
+                max_retries=options.get("max_retries", DEFAULT_MAX_RETRIES),
+                backoff=options.get("retry_backoff", DEFAULT_RETRY_BACKOFF),
+                budget=options.get("retry_budget", DEFAULT_RETRY_BUDGET),
+            ),
+            rate_limiter=shared_limiter(
+                get_hostname(url),
+                read_rate=options.get("read_rate_limit"),
+                write_rate=options.get("write_rate_limit"),
+                burst=options.get("rate_limit_burst", 1),
+                max_in_flight=options.get("max_in_flight"),
+            ),
+            concurrency=(
+                AdaptiveConcurrency(
+                    options.get("max_concurrency", self.transport.pool.size)
+                )
+                if options.get("adaptive_concurrency")
+                else None
+            ),
+            metrics=Metrics() if options.get("metrics", True) else None,
+            cache=(
+                ResponseCache(
+                    options["cache_ttl"],
+                    options.get("cache_max_bytes", DEFAULT_MAX_BYTES),
+                )
+                if options.get("cache_ttl")
+                else None
+            ),
+            compact_records=options.get("compact_records", False),
         )
 
         self.username = username
@@ -134,6 +1095,52 @@ class TCMSXmlrpc:
 
         self.login()
 
+    @classmethod
+    def create_transport(cls, url, options):
+        """
+        Return a transport suitable for the scheme of ``url``, configured
+        with the connection ``options`` passed to :py:class:`tcms_api.TCMS`.
+        """
+        if url.startswith("https://"):
+            transport_class = SafeCookieTransport
+        elif url.startswith("http://"):
+            transport_class = CookieTransport
+        else:
+            raise RuntimeError("Unrecognized URL scheme")
+
+        return cls._new_transport(transport_class, options)
+
+    @classmethod
+    def _new_transport(cls, transport_class, options, **kwargs):
+        """
+        Return a ``transport_class`` configured with the connection
+        ``options`` and ``kwargs`` or, when the ``replay`` option is set,
+        a :py:class:`ReplayTransport` which doesn't use the network.
+        """
+        if options.get("replay"):
+            return ReplayTransport(
+                options["replay"],
+                latency_scale=options.get("replay_latency_scale", 0.0),
+                content_type=cls.content_type,
+                fast_unmarshaller=options.get("fast_unmarshaller", True),
+                compact_records=options.get("compact_records", False),
+            )
+
+        return transport_class(
+            pool_size=options.get("pool_size", DEFAULT_POOL_SIZE),
+            pool_idle_timeout=options.get(
+                "pool_idle_timeout", DEFAULT_POOL_IDLE_TIMEOUT
+            ),
+            content_type=cls.content_type,
+            compress_threshold=options.get("compress_threshold"),
+            accept_gzip=options.get("accept_gzip", True),
+            fast_unmarshaller=options.get("fast_unmarshaller", True),
+            compact_records=options.get("compact_records", False),
+            profiler=Profiler() if options.get("profile") else None,
+            recorder=Recorder(options["record"]) if options.get("record") else None,
+            **kwargs,
+        )
+
     def login(self):
         # note: do not override .login()
         self._do_login()
@@ -153,21 +1160,33 @@ class TCMSKerbXmlrpc(TCMSXmlrpc):
     that is not supported nor guaranteed!
     """
 
-    transport = KerbTransport()
-
-    def __init__(self, username, password, url):
+    def __init__(self, username, password, url, **options):
         if not url.startswith("https://"):
             raise RuntimeError(
                 f"https:// required for GSSAPI authentication. URL provided: {url}"
             )
 
-        if gssapi is None:
+        if _load_gssapi() is None and not options.get("replay"):
             raise RuntimeError("gssapi not found! Try pip install tcms-api[gssapi]")
 
-        super().__init__(username, password, url)
+        super().__init__(username, password, url, **options)
+
+    @classmethod
+    def create_transport(cls, url, options):
+        return cls._new_transport(
+            KerbTransport,
+            options,
+            keep_alive=options.get("kerberos_keep_alive", False),
+        )
 
     def _do_login(self):
-        url = self.url.replace("xml-rpc", "login/kerberos")
+        if isinstance(self.transport, ReplayTransport):
+            # recorded calls are answered without a session
+            return
+
+        url = self.url.replace("xml-rpc", "login/kerberos").replace(
+            "json-rpc", "login/kerberos"
+        )
         hostname = get_hostname(url)
 
         _, headers, _ = self.transport.get_host_info(hostname)
@@ -175,14 +1194,44 @@ class TCMSKerbXmlrpc(TCMSXmlrpc):
         headers = dict(headers)
         headers["User-Agent"] = self.transport.user_agent
 
-        # note: by default will follow redirects
+        requests = importlib.import_module("requests")
         with requests.sessions.Session() as session:
+            # note: by default will follow redirects
             response = session.get(url, headers=headers)
             if response.status_code != HTTPStatus.OK:
                 raise RuntimeError(f"Unexpected HTTP response {response}")
 
-            self.transport._cookies.append(  # pylint: disable=protected-access
-                self.session_cookie_name
-                + "="
-                + session.cookies[self.session_cookie_name]
-            )
+            cookie = self._session_cookie(session.cookies)
+
+        self.transport.cookies.set(
+            cookie.name,
+            cookie.value,
+            cookie.domain,
+            cookie.path,
+            expires=cookie.expires,
+            host_only=not cookie.domain_specified,
+            secure=bool(cookie.secure),
+        )
+
+    def _session_cookie(self, cookies):
+        """
+        :return: The session cookie from ``cookies`` which would be sent
+                 with requests to ``self.url``
+        :rtype: http.cookiejar.Cookie
+        """
+        # let the cookie jar select the cookies for the server
+        request = urllib.request.Request(self.url)
+        cookies.add_cookie_header(request)
+        sent = dict(
+            pair.strip().split("=", 1)
+            for pair in request.get_header("Cookie", "").split(";")
+            if "=" in pair
+        )
+        for cookie in cookies:
+            if (
+                cookie.name == self.session_cookie_name
+                and sent.get(cookie.name) == cookie.value
+            ):
+                return cookie
+
+        raise RuntimeError(f"No {self.session_cookie_name} cookie after login")
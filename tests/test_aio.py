@@ -0,0 +1,245 @@
+# pylint: disable=invalid-name
+import asyncio
+import gzip
+import threading
+import unittest
+from xmlrpc.client import Fault
+
+from tcms_api.aio import AsyncTCMS, read_response
+from tcms_api.records import Record
+from tcms_api.testing import FakeKiwiServer
+from tests.test_jsonrpc import JsonRpcRequestHandler
+from tests.test_pool import KeepAliveRequestHandler, ThreadingXMLRPCServer
+
+
+class CountingRequestHandler(KeepAliveRequestHandler):
+    rpc_paths = ()
+    connections = 0
+
+    def setup(self):
+        CountingRequestHandler.connections += 1
+        super().setup()
+
+
+class LoginJsonRpcRequestHandler(JsonRpcRequestHandler):
+    @staticmethod
+    def dispatch(request):
+        if request["method"] == "Auth.login":
+            return {"jsonrpc": "2.0", "id": request["id"], "result": "session"}
+        return JsonRpcRequestHandler.dispatch(request)
+
+
+class GivenAsyncClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingXMLRPCServer(
+            ("127.0.0.1", 0),
+            requestHandler=CountingRequestHandler,
+            logRequests=False,
+        )
+        cls.server.register_function(cls.login, "Auth.login")
+        cls.server.register_function(lambda value: value, "Echo.echo")
+        cls.server.register_function(cls.expire_session, "Session.expire")
+        cls.server.register_function(cls.deny, "Product.create")
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+        host, port = cls.server.server_address
+        cls.url = f"http://{host}:{port}/xml-rpc/"
+        cls.expired = False
+        cls.logins = 0
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    @classmethod
+    def login(cls, *_args):
+        cls.logins += 1
+        return "session"
+
+    @staticmethod
+    def deny(*_args):
+        raise Fault(-32603, "Authentication failed when calling Product.create")
+
+    @classmethod
+    def expire_session(cls):
+        cls.expired = not cls.expired
+        if cls.expired:
+            raise Fault(-32603, "Authentication failed when calling Session.expire")
+        return True
+
+    def test_when_calling_concurrently_then_sockets_are_shared(self):
+        async def calls():
+            async with AsyncTCMS(self.url, "user", "pass", pool_size=2).exec as rpc:
+                return await asyncio.gather(*[rpc.Echo.echo(i) for i in range(100)])
+
+        CountingRequestHandler.connections = 0
+        results = asyncio.run(calls())
+
+        self.assertEqual(results, list(range(100)))
+        # one connection is used by the synchronous client to log in
+        self.assertLessEqual(CountingRequestHandler.connections, 3)
+
+    def test_when_server_returns_fault_then_raises(self):
+        async def call():
+            async with AsyncTCMS(self.url, "user", "pass").exec as rpc:
+                return await rpc.Missing.method()
+
+        with self.assertRaises(Fault):
+            asyncio.run(call())
+
+    def test_when_session_is_rejected_then_logs_in_again(self):
+        async def call():
+            async with AsyncTCMS(self.url, "user", "pass").exec as rpc:
+                return await rpc.Session.expire(), rpc.connection_stats()
+
+        result, stats = asyncio.run(call())
+
+        self.assertTrue(result)
+        self.assertEqual(stats["relogins"], 1)
+
+    def test_when_option_is_unknown_then_fails(self):
+        with self.assertRaisesRegex(TypeError, "AsyncTCMS.*'pool_sise'"):
+            AsyncTCMS(self.url, "user", "pass", pool_sise=2)
+
+    def test_when_permission_is_missing_then_logs_in_only_once(self):
+        async def calls():
+            async with AsyncTCMS(self.url, "user", "pass").exec as rpc:
+                for _ in range(5):
+                    with self.assertRaises(Fault):
+                        await rpc.Product.create({"name": "denied"})
+                return rpc.connection_stats()
+
+        GivenAsyncClient.logins = 0
+        stats = asyncio.run(calls())
+
+        # the first login is made when the client is created
+        self.assertEqual(GivenAsyncClient.logins, 2)
+        self.assertEqual(stats["relogins"], 1)
+
+
+class GivenAsyncClientWithConnectionOptions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeKiwiServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def call(self, calls, **options):
+        """
+        :return: Results of ``calls(rpc)`` and the synchronous proxy
+        """
+
+        async def run():
+            async with AsyncTCMS(
+                self.server.url, "tester", "password", **options
+            ).exec as rpc:
+                results = await calls(rpc)
+                return results, (await rpc.connection()).server
+
+        return asyncio.run(run())
+
+    def test_when_rate_limited_then_calls_pass_through_shared_limiter(self):
+        _, proxy = self.call(
+            lambda rpc: asyncio.gather(*[rpc.Priority.filter({}) for _ in range(5)]),
+            read_rate_limit=1000,
+            max_in_flight=2,
+        )
+
+        # Auth.login of the synchronous client counts as well
+        self.assertEqual(proxy.rate_limiter.stats()["read"]["calls"], 6)
+        self.assertEqual(proxy.rate_limiter.stats()["in_flight"], 0)
+
+    def test_when_server_is_unavailable_then_call_is_retried(self):
+        def calls(rpc):
+            self.server.fail_requests(503)
+            return rpc.Priority.filter({})
+
+        result, proxy = self.call(calls, retry_backoff=0.01)
+
+        self.assertEqual(len(result), 5)
+        self.assertEqual(proxy.retry_policy.retries, 1)
+
+    def test_when_reading_twice_then_result_is_cached(self):
+        async def calls(rpc):
+            await rpc.Priority.filter({"value": "P1"})
+            return await rpc.Priority.filter({"value": "P1"})
+
+        before = self.server.calls["Priority.filter"]
+        result, proxy = self.call(calls, cache_ttl=60)
+
+        self.assertEqual(result[0]["value"], "P1")
+        self.assertEqual(self.server.calls["Priority.filter"], before + 1)
+        self.assertEqual(proxy.cache.stats()["hits"], 1)
+
+    def test_when_compact_records_and_metrics_then_they_apply(self):
+        result, proxy = self.call(
+            lambda rpc: rpc.Priority.filter({}), compact_records=True, metrics=True
+        )
+
+        self.assertIsInstance(result[0], Record)
+        self.assertEqual(proxy.metrics.stats()["Priority.filter"]["calls"], 1)
+
+
+class GivenAsyncJsonRpcClient(unittest.TestCase):
+    def test_when_calling_then_returns_result(self):
+        server = ThreadingXMLRPCServer(("127.0.0.1", 0), LoginJsonRpcRequestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+
+        async def call():
+            url = f"http://{host}:{port}/json-rpc/"
+            async with AsyncTCMS(url, "user", "pass").exec as rpc:
+                return await rpc.Echo.echo(1, "two")
+
+        try:
+            self.assertEqual(asyncio.run(call()), [1, "two"])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class GivenHttpResponse(unittest.TestCase):
+    @staticmethod
+    def read(data):
+        async def read():
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            return await read_response(reader)
+
+        return asyncio.run(read())
+
+    def test_when_body_is_chunked_and_compressed_then_it_is_decoded(self):
+        body = gzip.compress(b"response body")
+        data = (
+            b"HTTP/1.1 200 OK\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Content-Encoding: gzip\r\n\r\n"
+            + f"{len(body) - 5:x}\r\n".encode()
+            + body[:-5]
+            + b"\r\n5\r\n"
+            + body[-5:]
+            + b"\r\n0\r\n\r\n"
+        )
+
+        status, _, _, result, keep_alive = self.read(data)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(result, b"response body")
+        self.assertTrue(keep_alive)
+
+    def test_when_server_closes_connection_then_it_is_not_reused(self):
+        data = b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 2\r\n\r\nok"
+
+        _, _, _, result, keep_alive = self.read(data)
+
+        self.assertEqual(result, b"ok")
+        self.assertFalse(keep_alive)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,26 +1,128 @@
-# pylint: disable=invalid-name
+# pylint: disable=invalid-name,protected-access
+import os
+import shutil
+import tempfile
 import unittest
+from unittest.mock import patch
+
+import tcms_api
+from tcms_api import TCMS
+from tcms_api.testing import FakeKiwiServer
+
+
+def write_config(path, url):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(f"[tcms]\nurl = {url}\nusername = tester\npassword = password\n")
 
 
 class GivenConfigurationFileExists(unittest.TestCase):
-    @unittest.skip("not implemented")
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeKiwiServer().start()
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, "tcms.conf")
+        write_config(cls.path, cls.server.url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        shutil.rmtree(cls.directory)
+
+    def setUp(self):
+        patcher = patch("tcms_api._CONFIG_PATHS", ("/missing/tcms.conf", self.path))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_when_backend_initializes_then_uses_config(self):
-        pass
+        with patch.dict(os.environ, {"TCMS_URL": ""}):
+            self.assertEqual(len(TCMS().exec.Priority.filter({})), 5)
+
+    def test_when_reading_again_then_file_is_not_parsed_again(self):
+        path, config = tcms_api._read_config()
+
+        self.assertEqual(path, self.path)
+        self.assertIs(tcms_api._read_config()[1], config)
+
+    def test_when_file_is_modified_then_it_is_parsed_again(self):
+        config = tcms_api._read_config()[1]
+
+        write_config(self.path, "https://modified.example.com/xml-rpc/")
+        os.utime(self.path, ns=(0, 0))
+        try:
+            modified = tcms_api._read_config()[1]
+        finally:
+            write_config(self.path, self.server.url)
+
+        self.assertIsNot(modified, config)
+        self.assertEqual(
+            modified["tcms"]["url"], "https://modified.example.com/xml-rpc/"
+        )
 
 
 class GivenConfigurationFileDoesntExist(unittest.TestCase):
-    @unittest.skip("not implemented")
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeKiwiServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        patcher = patch("tcms_api._CONFIG_PATHS", ("/missing/tcms.conf",))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def environment(self, **variables):
+        values = {
+            "TCMS_URL": self.server.url,
+            "TCMS_USERNAME": "tester",
+            "TCMS_PASSWORD": "password",
+        }
+        values.update(variables)
+        return patch.dict(
+            os.environ,
+            {name: value for name, value in values.items() if value is not None},
+            clear=True,
+        )
+
     def test_when_backend_initializes_then_uses_environment(self):
-        pass
+        with self.environment(), patch("tcms_api._read_config") as read_config:
+            self.assertEqual(len(TCMS().exec.Priority.filter({})), 5)
 
-    @unittest.skip("not implemented")
-    def test_when_TCMS_API_URL_is_not_configured_then_fails(self):
-        pass
+        read_config.assert_not_called()
+
+    def test_when_arguments_are_passed_then_environment_is_ignored(self):
+        with self.environment(TCMS_URL="http://127.0.0.1:9/xml-rpc/"):
+            rpc = TCMS(self.server.url, "tester", "password").exec
+            self.assertEqual(len(rpc.Priority.filter({})), 5)
+
+    def test_when_TCMS_URL_is_not_configured_then_fails(self):
+        with self.environment(TCMS_URL=None):
+            with self.assertRaisesRegex(RuntimeError, "/missing/tcms.conf"):
+                TCMS().exec.Priority.filter({})
 
-    @unittest.skip("not implemented")
     def test_when_TCMS_USERNAME_is_not_configured_then_fails(self):
-        pass
+        with self.environment(TCMS_USERNAME=None):
+            with self.assertRaisesRegex(RuntimeError, "TCMS_USERNAME/TCMS_PASSWORD"):
+                TCMS().exec.Priority.filter({})
 
-    @unittest.skip("not implemented")
     def test_when_TCMS_PASSWORD_is_not_configured_then_fails(self):
-        pass
+        with self.environment(TCMS_PASSWORD=None):
+            with self.assertRaisesRegex(RuntimeError, "TCMS_USERNAME/TCMS_PASSWORD"):
+                TCMS().exec.Priority.filter({})
+
+
+class GivenKeywordArguments(unittest.TestCase):
+    def test_when_option_is_unknown_then_fails(self):
+        with self.assertRaisesRegex(TypeError, "'retry_polcy'"):
+            TCMS("http://127.0.0.1:9/xml-rpc/", "tester", "password", retry_polcy=1)
+
+    def test_when_options_are_known_then_they_are_accepted(self):
+        rpc = TCMS("http://127.0.0.1:9/xml-rpc/", max_retries=0, use_kerberos=False)
+
+        self.assertEqual(rpc.config["tcms"]["max_retries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
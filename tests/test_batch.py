@@ -0,0 +1,96 @@
+# pylint: disable=invalid-name
+import threading
+import unittest
+from unittest.mock import patch
+from xmlrpc.client import Fault
+from xmlrpc.server import SimpleXMLRPCServer
+
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+
+
+def update(pk, values):
+    if pk < 0:
+        raise ValueError(f"TestExecution matching query does not exist: {pk}")
+    return {"id": pk, **values}
+
+
+class XmlRpcServerTestCase(unittest.TestCase):
+    multicall = True
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = SimpleXMLRPCServer(("127.0.0.1", 0), logRequests=False)
+        cls.server.register_function(update, "TestExecution.update")
+        if cls.multicall:
+            cls.server.register_multicall_functions()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        host, port = self.server.server_address
+        self.rpc = TCMSProxy(f"http://{host}:{port}/RPC2", transport=CookieTransport())
+
+
+class GivenServerSupportsMulticall(XmlRpcServerTestCase):
+    def test_when_calling_in_batch_then_returns_results_and_faults(self):
+        with self.rpc.batch(max_size=2) as batch:
+            results = [
+                batch.TestExecution.update(pk, {"status": 4}) for pk in (1, -1, 3)
+            ]
+
+        self.assertTrue(batch.multicall_supported)
+        self.assertEqual(results[0].result(), {"id": 1, "status": 4})
+        self.assertIsInstance(results[1].fault, Fault)
+        self.assertEqual(results[2].result(), {"id": 3, "status": 4})
+        with self.assertRaises(Fault):
+            results[1].result()
+
+    def test_when_batch_not_sent_then_result_is_not_available(self):
+        batch = self.rpc.batch()
+        result = batch.TestExecution.update(1, {"status": 4})
+
+        with self.assertRaises(RuntimeError):
+            result.result()
+
+        batch.flush()
+        self.assertEqual(result.result(), {"id": 1, "status": 4})
+
+    def test_when_sending_batch_fails_then_calls_get_the_error(self):
+        for error in (Fault(-32603, "Internal error"), ConnectionRefusedError()):
+            with self.subTest(error=error):
+                batch = self.rpc.batch()
+                results = [
+                    batch.TestExecution.update(pk, {"status": 4}) for pk in (1, 2)
+                ]
+
+                with patch.object(
+                    self.rpc, "_ServerProxy__request", side_effect=error
+                ), self.assertRaises(type(error)):
+                    batch.flush()
+
+                for result in results:
+                    self.assertTrue(result.done)
+                    self.assertIs(result.fault, error)
+                    with self.assertRaises(type(error)):
+                        result.result()
+
+
+class GivenServerDoesNotSupportMulticall(XmlRpcServerTestCase):
+    multicall = False
+
+    def test_when_calling_in_batch_then_falls_back_to_one_by_one(self):
+        with self.rpc.batch() as batch:
+            ok = batch.TestExecution.update(1, {"status": 4})
+            failed = batch.TestExecution.update(-1, {"status": 4})
+
+        self.assertFalse(batch.multicall_supported)
+        self.assertEqual(ok.result(), {"id": 1, "status": 4})
+        self.assertIsInstance(failed.fault, Fault)
+
+
+if __name__ == "__main__":
+    unittest.main()
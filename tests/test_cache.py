@@ -0,0 +1,149 @@
+# pylint: disable=invalid-name
+import unittest
+
+from tcms_api import TCMS
+from tcms_api.cache import ResponseCache
+from tcms_api.testing import FakeKiwiServer
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class GivenResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(60, clock=self.clock)
+        self.calls = []
+
+    def server(self, methodname, params):
+        self.calls.append(methodname)
+        return [{"method": methodname, "params": list(params)}]
+
+    def call(self, methodname, *params):
+        return self.cache.call(self.server, methodname, params)
+
+    def test_when_calling_again_then_result_is_cached(self):
+        first = self.call("Priority.filter", {"value": "P1", "is_active": True})
+        second = self.call("Priority.filter", {"is_active": True, "value": "P1"})
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, ["Priority.filter"])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_when_result_is_modified_then_cache_is_not(self):
+        self.call("Priority.filter", {})[0]["method"] = "modified"
+        self.call("Priority.filter", {})[0]["method"] = "modified"
+
+        self.assertEqual(
+            self.call("Priority.filter", {})[0]["method"], "Priority.filter"
+        )
+
+    def test_when_ttl_has_passed_then_result_is_fetched_again(self):
+        self.call("Product.filter", {})
+        self.clock.now = 61
+        self.call("Product.filter", {})
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.cache.stats()["expired"], 1)
+
+    def test_when_method_is_not_a_filter_then_it_is_not_cached(self):
+        self.call("TestCase.history", 1)
+        self.call("TestCase.history", 1)
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_when_model_is_updated_then_only_its_results_are_dropped(self):
+        self.call("TestCase.filter", {})
+        self.call("Priority.filter", {})
+        self.call("TestCase.update", 1, {"summary": "changed"})
+
+        self.call("TestCase.filter", {})
+        self.call("Priority.filter", {})
+        self.assertEqual(self.calls.count("TestCase.filter"), 2)
+        self.assertEqual(self.calls.count("Priority.filter"), 1)
+
+    def test_when_other_write_is_made_then_all_results_are_dropped(self):
+        self.call("TestExecution.filter", {"run": 1})
+        self.call("Priority.filter", {})
+        self.call("TestRun.add_case", 1, 2)
+
+        self.assertEqual(self.cache.stats()["entries"], 0)
+        self.assertEqual(self.cache.stats()["invalidated"], 2)
+
+    def test_when_batch_contains_write_then_model_results_are_dropped(self):
+        self.call("Build.filter", {})
+        self.call(
+            "system.multicall",
+            [{"methodName": "Build.create", "params": [{"name": "b1"}]}],
+        )
+
+        self.call("Build.filter", {})
+        self.assertEqual(self.calls.count("Build.filter"), 2)
+
+    def test_when_cache_is_full_then_least_recently_used_is_evicted(self):
+        self.call("Priority.filter", {})
+        size = self.cache.stats()["bytes"]
+        self.cache.max_bytes = 2 * size + size // 2
+
+        self.call("Product.filter", {})
+        self.call("Priority.filter", {})
+        self.call("Category.filter", {})
+
+        self.assertEqual(self.cache.stats()["evicted"], 1)
+        self.call("Priority.filter", {})
+        self.call("Product.filter", {})
+        self.assertEqual(self.calls.count("Priority.filter"), 1)
+        self.assertEqual(self.calls.count("Product.filter"), 2)
+
+    def test_when_write_happens_during_read_then_result_is_not_cached(self):
+        def server(methodname, params):
+            self.cache.invalidate("Build")
+            return self.server(methodname, params)
+
+        self.cache.call(server, "Build.filter", ({},))
+        self.call("Build.filter", {})
+
+        self.assertEqual(self.calls.count("Build.filter"), 2)
+
+
+class GivenCacheIsEnabled(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeKiwiServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_when_reading_repeatedly_then_server_is_called_once(self):
+        rpc = TCMS(self.server.url, "tester", "password", cache_ttl=60).exec
+        calls = self.server.calls["Priority.filter"]
+
+        for _ in range(5):
+            self.assertEqual(len(rpc.Priority.filter({})), 5)
+
+        self.assertEqual(self.server.calls["Priority.filter"], calls + 1)
+        self.assertEqual(rpc.cache_stats()["hits"], 4)
+
+    def test_when_creating_then_filter_returns_new_record(self):
+        rpc = TCMS(self.server.url, "tester", "password", cache_ttl=60).exec
+        before = rpc.Product.filter({"name": "Cached"})
+
+        rpc.Product.create({"name": "Cached", "classification": 1})
+
+        self.assertEqual(before, [])
+        self.assertEqual(len(rpc.Product.filter({"name": "Cached"})), 1)
+
+    def test_when_not_enabled_then_stats_are_none(self):
+        rpc = TCMS(self.server.url, "tester", "password").exec
+
+        self.assertIsNone(rpc.cache_stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# pylint: disable=invalid-name
+import unittest
+
+from tcms_api import TCMS
+from tcms_api.callbudget import shape
+from tcms_api.testing import FakeKiwiServer
+
+
+class GivenCallProfile(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeKiwiServer().start()
+        cls.rpc = TCMS(cls.server.url, "tester", "password").exec
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_when_describing_arguments_then_values_are_left_out(self):
+        self.assertEqual(
+            shape({"pk": 1, "name__in": ["a"], "plan": None}),
+            '{"name__in": [...], "pk": int, "plan": NoneType}',
+        )
+
+    def test_when_filtering_in_a_loop_then_in_query_is_suggested(self):
+        with self.rpc.profile() as profile:
+            for status_id in range(1, 6):
+                self.rpc.TestExecutionStatus.filter({"pk": status_id})
+
+        self.assertEqual(len(profile), 5)
+        self.assertEqual(
+            profile.by_shape(), {'TestExecutionStatus.filter({"pk": int})': 5}
+        )
+        finding = profile.findings()[0]
+        self.assertEqual(finding["kind"], "loop")
+        self.assertEqual(
+            finding["suggestion"], 'TestExecutionStatus.filter({"pk__in": [...]})'
+        )
+        self.assertIn("test_callbudget.py", finding["sites"][0])
+
+    def test_when_repeating_identical_calls_then_duplicate_is_reported(self):
+        with self.rpc.profile() as profile:
+            for _ in range(4):
+                self.rpc.Priority.filter({"value": "P1"})
+
+        findings = profile.findings()
+        self.assertEqual([finding["kind"] for finding in findings], ["duplicate"])
+        self.assertEqual(findings[0]["count"], 4)
+        self.assertIn("duplicate: Priority.filter", profile.report())
+
+    def test_when_calls_are_made_from_threads_then_they_are_recorded(self):
+        with self.rpc.profile() as profile:
+            list(self.rpc.map("PlanType.filter", [{"pk": pk} for pk in range(1, 6)]))
+
+        self.assertEqual(profile.by_method(), {"PlanType.filter": 5})
+        self.assertEqual(
+            profile.findings()[0]["suggestion"], 'PlanType.filter({"pk__in": [...]})'
+        )
+
+    def test_when_budget_is_exceeded_then_assertion_fails(self):
+        with self.assertRaisesRegex(AssertionError, "3 calls made, expected at most 2"):
+            with self.rpc.profile(max_calls=2):
+                for _ in range(3):
+                    self.rpc.Classification.filter({})
+
+        # profiling has stopped
+        with self.rpc.profile() as profile:
+            pass
+        self.assertEqual(len(profile), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# pylint: disable=invalid-name
+import email.message
+import gzip
+import io
+import unittest
+from unittest.mock import MagicMock
+from xmlrpc.client import dumps
+
+from tcms_api.xmlrpc import CookieTransport
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, body, headers=None):
+        super().__init__(body)
+        self.msg = email.message.Message()
+        self.headers = headers or {}
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+
+class GivenCompressThresholdIsSet(unittest.TestCase):
+    def setUp(self):
+        self.transport = CookieTransport(compress_threshold=100)
+        self.connection = MagicMock()
+
+    def test_when_body_is_small_then_it_is_not_compressed(self):
+        self.transport.send_content(self.connection, b"x" * 100)
+
+        self.connection.putheader.assert_called_once_with("Content-Length", "100")
+        self.connection.endheaders.assert_called_once_with(b"x" * 100)
+
+    def test_when_body_is_large_then_it_is_compressed(self):
+        self.transport.send_content(self.connection, b"x" * 1000)
+
+        self.connection.putheader.assert_any_call("Content-Encoding", "gzip")
+        body = self.connection.endheaders.call_args[0][0]
+        self.assertEqual(gzip.decompress(body), b"x" * 1000)
+
+        stats = self.transport.transfer_stats()
+        self.assertEqual(stats["sent"], len(body))
+        self.assertEqual(stats["sent_uncompressed"], 1000)
+
+
+class GivenResponseIsGzipEncoded(unittest.TestCase):
+    def test_when_parsing_then_decompresses_it(self):
+        rows = [{"id": pk, "summary": "Automated test case"} for pk in range(1000)]
+        body = dumps((rows,), methodresponse=True).encode()
+        compressed = gzip.compress(body)
+
+        transport = CookieTransport()
+        result = transport.parse_response(
+            FakeResponse(compressed, {"Content-Encoding": "gzip"})
+        )
+
+        self.assertEqual(result, (rows,))
+        stats = transport.transfer_stats()
+        self.assertEqual(stats["received"], len(compressed))
+        self.assertEqual(stats["received_uncompressed"], len(body))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# pylint: disable=invalid-name
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from xmlrpc.client import Fault
+
+from tcms_api.concurrency import AdaptiveConcurrency
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+
+
+def call(controller, duration=0.0, error=None):
+    try:
+        with controller.slot():
+            time.sleep(duration)
+            if error is not None:
+                raise error
+    except (ConnectionResetError, Fault):
+        pass
+
+
+class GivenAdaptiveConcurrency(unittest.TestCase):
+    def test_when_latency_is_flat_and_calls_wait_then_limit_increases(self):
+        # sleep() overshoots on a busy machine, don't mistake that for rising latency
+        controller = AdaptiveConcurrency(
+            max_limit=4, initial_limit=1, window=5, latency_tolerance=100
+        )
+
+        def worker():
+            for _ in range(20):
+                call(controller, 0.001)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = controller.stats()
+        self.assertGreater(stats["limit"], 1)
+        self.assertLessEqual(stats["limit"], 4)
+        self.assertIn("increase", [d["reason"] for d in stats["decisions"]])
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_when_latency_rises_then_limit_is_halved(self):
+        controller = AdaptiveConcurrency(max_limit=8, initial_limit=4, window=2)
+
+        for duration in (0.001, 0.001, 0.001, 0.001, 0.05, 0.05, 0.05, 0.05):
+            call(controller, duration)
+
+        decision = controller.stats()["decisions"][-1]
+        self.assertEqual(decision["reason"], "latency")
+        self.assertEqual(decision["previous_limit"], 4)
+        self.assertEqual(decision["limit"], 2)
+
+    def test_when_calls_fail_then_limit_is_halved(self):
+        controller = AdaptiveConcurrency(max_limit=8, initial_limit=2, window=2)
+
+        call(controller, error=ConnectionResetError())
+        call(controller)
+
+        self.assertEqual(controller.stats()["decisions"][-1]["reason"], "errors")
+        self.assertEqual(controller.stats()["limit"], 1)
+
+    def test_when_server_returns_fault_then_it_is_not_an_error(self):
+        controller = AdaptiveConcurrency(max_limit=8, initial_limit=2, window=2)
+
+        call(controller, error=Fault(-32603, "Internal error"))
+        call(controller, error=Fault(-32603, "Internal error"))
+
+        self.assertEqual(controller.stats()["decisions"][-1]["error_rate"], 0)
+
+    def test_when_proxy_has_controller_then_calls_pass_through_it(self):
+        controller = AdaptiveConcurrency(max_limit=2, window=1)
+        rpc = TCMSProxy(
+            "http://example.com/xml-rpc/",
+            transport=CookieTransport(),
+            concurrency=controller,
+        )
+
+        with patch.object(rpc, "_ServerProxy__request", return_value=[]):
+            rpc.TestCase.filter({})
+
+        self.assertEqual(len(controller.stats()["decisions"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
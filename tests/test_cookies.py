@@ -0,0 +1,153 @@
+# pylint: disable=invalid-name
+import threading
+import time
+import unittest
+from email.utils import formatdate
+
+from tcms_api.cookies import CookieJar
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+from tests.test_pool import KeepAliveRequestHandler, ThreadingXMLRPCServer
+
+
+class SetCookieRequestHandler(KeepAliveRequestHandler):
+    rpc_paths = ()
+
+    def end_headers(self):
+        self.send_header("Set-Cookie", "csrftoken=token; Path=/; SameSite=Lax")
+        super().end_headers()
+
+
+class CookieRecordingRequestHandler(KeepAliveRequestHandler):
+    rpc_paths = ()
+
+    def do_POST(self):
+        self.server.cookies.append(self.headers.get("Cookie"))
+        super().do_POST()
+
+
+class GivenCookieJar(unittest.TestCase):
+    def setUp(self):
+        self.jar = CookieJar()
+
+    def test_when_cookie_is_set_again_then_it_is_replaced(self):
+        self.jar.update(["sessionid=first; Path=/"], "tcms.example.com")
+        self.jar.update(["sessionid=second; Path=/"], "tcms.example.com")
+
+        self.assertEqual(self.jar.header("tcms.example.com"), "sessionid=second")
+        self.assertEqual(len(self.jar), 1)
+
+    def test_when_cookie_expires_then_it_is_removed(self):
+        self.jar.update(
+            [
+                "sessionid=secret; Max-Age=0",
+                "csrftoken=old; Expires=" + formatdate(time.time() - 60, usegmt=True),
+                "theme=dark; Expires=" + formatdate(time.time() + 60, usegmt=True),
+            ],
+            "tcms.example.com",
+        )
+
+        self.assertEqual(self.jar.header("tcms.example.com"), "theme=dark")
+
+    def test_when_cookie_is_for_another_domain_then_it_is_not_sent(self):
+        self.jar.update(["host=only"], "tcms.example.com:8443")
+        self.jar.update(["parent=domain; Domain=.example.com"], "tcms.example.com")
+        self.jar.update(["other=domain; Domain=example.org"], "tcms.example.com")
+
+        self.assertEqual(
+            self.jar.header("tcms.example.com"), "host=only; parent=domain"
+        )
+        self.assertEqual(self.jar.header("www.example.com"), "parent=domain")
+        self.assertEqual(self.jar.header("example.org"), "")
+
+    def test_when_cookie_has_path_then_it_is_sent_only_below_it(self):
+        self.jar.update(["api=1; Path=/xml-rpc"], "tcms.example.com")
+        self.jar.update(["root=1; Path=/"], "tcms.example.com")
+
+        self.assertEqual(
+            self.jar.header("tcms.example.com", "/xml-rpc/"), "api=1; root=1"
+        )
+        self.assertEqual(self.jar.header("tcms.example.com", "/xml-rpc-2/"), "root=1")
+
+    def test_when_header_is_too_large_then_cookies_are_skipped(self):
+        self.jar.max_header_size = 32
+        self.jar.update(["sessionid=secret", "big=" + "x" * 100], "tcms.example.com")
+
+        self.assertEqual(self.jar.header("tcms.example.com"), "sessionid=secret")
+
+    def test_when_there_are_too_many_cookies_then_oldest_are_removed(self):
+        self.jar.max_cookies = 2
+        self.jar.update(["a=1", "b=2", "c=3"], "tcms.example.com")
+
+        self.assertEqual(self.jar.header("tcms.example.com"), "b=2; c=3")
+
+    def test_when_cookie_is_secure_then_it_is_sent_only_over_https(self):
+        self.jar.update(["sessionid=secret; Secure", "theme=dark"], "tcms.example.com")
+
+        self.assertEqual(self.jar.header("tcms.example.com"), "theme=dark")
+        self.assertEqual(
+            self.jar.header("tcms.example.com", secure=True),
+            "sessionid=secret; theme=dark",
+        )
+        self.assertIsNone(self.jar.get("sessionid", "tcms.example.com"))
+
+
+class GivenServerSetsCookiesOnEveryResponse(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingXMLRPCServer(
+            ("127.0.0.1", 0),
+            requestHandler=SetCookieRequestHandler,
+            logRequests=False,
+        )
+        cls.server.register_function(lambda value: value, "Echo.echo")
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_when_making_many_calls_then_cookie_header_does_not_grow(self):
+        host, port = self.server.server_address
+        transport = CookieTransport()
+        rpc = TCMSProxy(f"http://{host}:{port}/xml-rpc/", transport=transport)
+
+        lengths = set()
+        for i in range(10000):
+            rpc.Echo.echo(i)
+            lengths.add(len(transport.cookies.header(f"{host}:{port}", "/xml-rpc/")))
+
+        self.assertEqual(lengths, {len("sessionid=secret; csrftoken=token")})
+
+
+class GivenHttpServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingXMLRPCServer(
+            ("127.0.0.1", 0),
+            requestHandler=CookieRecordingRequestHandler,
+            logRequests=False,
+        )
+        cls.server.cookies = []
+        cls.server.register_function(lambda value: value, "Echo.echo")
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_when_cookie_is_secure_then_it_is_not_sent(self):
+        host, port = self.server.server_address
+        transport = CookieTransport()
+        transport.cookies.set("sessionid", "secret", host, secure=True)
+        transport.cookies.set("theme", "dark", host)
+        rpc = TCMSProxy(f"http://{host}:{port}/xml-rpc/", transport=transport)
+
+        rpc.Echo.echo(1)
+
+        self.assertEqual(self.server.cookies, ["theme=dark"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# pylint: disable=invalid-name,protected-access
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+import tcms_api
+from tcms_api import xmlrpc
+
+# cumulative time of `import tcms_api` in seconds, excluding the interpreter
+# start up. Without setuptools and requests it takes about 0.1 seconds
+IMPORT_TIME_BUDGET = 0.3
+
+# only needed for Kerberos or not at all
+DEFERRED_MODULES = ("requests", "gssapi", "setuptools", "distutils")
+
+
+def import_times(module):
+    """
+    :return: Cumulative import time in seconds per module name
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1_000_000
+    return times
+
+
+class GivenImportOfTcmsApi(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.times = import_times("tcms_api")
+
+    def test_when_importing_then_kerberos_dependencies_are_not_imported(self):
+        for module in DEFERRED_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, self.times)
+
+    def test_when_importing_then_time_is_within_budget(self):
+        self.assertLess(self.times["tcms_api"], IMPORT_TIME_BUDGET)
+
+
+class GivenGssapiIsNotInstalled(unittest.TestCase):
+    @patch("tcms_api.xmlrpc.gssapi", None)
+    @patch.dict(sys.modules, {"gssapi": None})
+    def test_when_using_kerberos_then_error_is_raised(self):
+        with self.assertRaisesRegex(RuntimeError, "gssapi not found"):
+            xmlrpc.TCMSKerbXmlrpc(None, None, "https://tcms.example.com/xml-rpc/")
+
+
+class GivenBooleanConfigValue(unittest.TestCase):
+    def test_when_value_is_true_then_result_is_true(self):
+        for value in ("y", "Yes", "t", "TRUE", "on", "1"):
+            with self.subTest(value=value):
+                self.assertTrue(tcms_api._boolean(value))
+
+    def test_when_value_is_false_then_result_is_false(self):
+        for value in ("n", "No", "f", "False", "OFF", "0"):
+            with self.subTest(value=value):
+                self.assertFalse(tcms_api._boolean(value))
+
+    def test_when_value_is_invalid_then_error_is_raised(self):
+        with self.assertRaisesRegex(ValueError, "invalid truth value"):
+            tcms_api._strtobool("maybe")
+
+
+if __name__ == "__main__":
+    unittest.main()
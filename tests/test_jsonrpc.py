@@ -0,0 +1,104 @@
+# pylint: disable=invalid-name
+import json
+import threading
+import unittest
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xmlrpc.client import Fault
+
+from tcms_api import _ConnectionProxy
+from tcms_api.jsonrpc import JSON_CONTENT_TYPE, TCMSJsonProxy
+from tcms_api.xmlrpc import CookieTransport
+
+
+class JsonRpcRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if isinstance(request, list):
+            response = [self.dispatch(item) for item in request]
+        else:
+            response = self.dispatch(request)
+
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", self.headers["Content-Type"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def dispatch(request):
+        response = {"jsonrpc": "2.0", "id": request["id"]}
+        if request["method"] == "Echo.echo":
+            response["result"] = request["params"]
+        else:
+            response["error"] = {"code": -32601, "message": "Method not found"}
+        return response
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class GivenJsonRpcServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), JsonRpcRequestHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+        host, port = cls.server.server_address
+        cls.rpc = TCMSJsonProxy(
+            f"http://{host}:{port}/json-rpc/",
+            transport=CookieTransport(content_type=JSON_CONTENT_TYPE),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_when_calling_method_then_returns_result(self):
+        result = self.rpc.Echo.echo({"pk": 1}, datetime(2025, 1, 2, 3, 4, 5))
+
+        self.assertEqual(result, [{"pk": 1}, "2025-01-02 03:04:05"])
+
+    def test_when_server_returns_error_then_raises_fault(self):
+        with self.assertRaises(Fault) as context:
+            self.rpc.Missing.method()
+
+        self.assertEqual(context.exception.faultCode, -32601)
+
+    def test_when_calling_in_batch_then_sends_batch_request(self):
+        with self.rpc.batch() as batch:
+            echo = batch.Echo.echo(1)
+            missing = batch.Missing.method()
+
+        self.assertTrue(batch.multicall_supported)
+        self.assertEqual(echo.result(), [1])
+        self.assertEqual(missing.fault.faultCode, -32601)
+
+
+class GivenServerUrl(unittest.TestCase):
+    def setUp(self):
+        self.config = {"tcms": {"url": "https://tcms.example.com/json-rpc/"}}
+
+    def test_when_protocol_not_specified_then_url_is_not_changed(self):
+        self.assertEqual(
+            _ConnectionProxy.server_url(self.config),
+            "https://tcms.example.com/json-rpc/",
+        )
+
+    def test_when_protocol_is_xml_rpc_then_url_is_rewritten(self):
+        self.assertEqual(
+            _ConnectionProxy.server_url(self.config, "xml-rpc"),
+            "https://tcms.example.com/xml-rpc/",
+        )
+
+    def test_when_protocol_is_not_supported_then_fails(self):
+        with self.assertRaises(RuntimeError):
+            _ConnectionProxy.server_url(self.config, "soap")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# pylint: disable=invalid-name,protected-access
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from xmlrpc.client import ProtocolError, dumps
+
+from tcms_api.replay import BufferedResponse, Recorder
+from tcms_api.xmlrpc import (
+    CookieTransport,
+    KerbTransport,
+    ReplayTransport,
+    TCMSKerbXmlrpc,
+)
+
+GSSAPI = MagicMock()
+GSSAPI.SecurityContext.return_value.step.return_value = b"token"
+
+
+def header_names(transport):
+    return [name for name, _ in transport._extra_headers]
+
+
+@patch("tcms_api.xmlrpc.gssapi", GSSAPI)
+class GivenKerberosTransportWithoutKeepAlive(unittest.TestCase):
+    def setUp(self):
+        self.transport = KerbTransport()
+        self.transport.cookies.set("sessionid", "secret", "example.com")
+        self.transport._extra_headers = [("Referer", "Auth.login@example.com")]
+
+    def test_when_making_connection_then_negotiates_and_closes_it(self):
+        self.transport.make_connection("example.com")
+
+        self.assertEqual(
+            header_names(self.transport), ["Referer", "Authorization", "Connection"]
+        )
+
+
+@patch("tcms_api.xmlrpc.gssapi", GSSAPI)
+class GivenKerberosTransportWithKeepAlive(unittest.TestCase):
+    def setUp(self):
+        self.transport = KerbTransport(keep_alive=True)
+        self.transport._extra_headers = [("Referer", "Auth.login@example.com")]
+
+    def test_when_there_is_no_session_then_negotiates(self):
+        self.transport.make_connection("example.com")
+
+        self.assertEqual(header_names(self.transport), ["Referer", "Authorization"])
+
+    def test_when_session_exists_then_reuses_it(self):
+        self.transport.cookies.set("sessionid", "secret", "example.com")
+        self.transport.make_connection("example.com")
+
+        self.assertEqual(header_names(self.transport), ["Referer"])
+
+    def test_when_server_responds_401_then_negotiates_again(self):
+        negotiate = []
+
+        def single_request(*_args):
+            negotiate.append(getattr(self.transport._local, "negotiate", False))
+            if len(negotiate) == 1:
+                raise ProtocolError("example.com/xml-rpc/", 401, "Unauthorized", {})
+            return "result"
+
+        with patch.object(
+            CookieTransport, "single_request", side_effect=single_request
+        ):
+            result = self.transport.single_request("example.com", "/xml-rpc/", b"")
+
+        self.assertEqual(result, "result")
+        self.assertEqual(negotiate, [False, True])
+        self.assertFalse(self.transport._local.negotiate)
+
+
+@patch("tcms_api.xmlrpc.gssapi", GSSAPI)
+class GivenKerberosClientLogsIn(unittest.TestCase):
+    def setUp(self):
+        self.client = TCMSKerbXmlrpc.__new__(TCMSKerbXmlrpc)
+        self.client.url = "https://kiwi.example.com/xml-rpc/"
+        self.client.transport = KerbTransport()
+        self.sessions = []
+
+    def get(self, session, url, **_kwargs):
+        self.sessions.append(session)
+        session.cookies.set("sessionid", "other", domain="other.example.com")
+        session.cookies.set("sessionid", "kiwi", domain="kiwi.example.com")
+        return MagicMock(status_code=200, url=url)
+
+    def login(self):
+        requests = importlib.import_module("requests")
+        with patch.object(
+            requests.sessions.Session, "get", autospec=True, side_effect=self.get
+        ), patch.object(
+            requests.sessions.Session,
+            "close",
+            autospec=True,
+            side_effect=self.sessions.remove,
+        ):
+            self.client._do_login()
+
+    def test_when_logged_in_then_cookie_for_the_server_is_copied(self):
+        self.login()
+
+        self.assertEqual(
+            self.client.transport.cookies.header("kiwi.example.com", "/xml-rpc/"),
+            "sessionid=kiwi",
+        )
+
+    def test_when_logged_in_then_session_is_closed(self):
+        self.login()
+
+        self.assertEqual(self.sessions, [])
+
+
+class GivenKerberosClientReplaysARecording(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "calls.jsonl")
+        recorder = Recorder(self.path)
+        recorder.record(
+            dumps(("value",), "Echo.echo").encode(),
+            BufferedResponse(
+                200, "OK", [], dumps(("value",), methodresponse=True).encode()
+            ),
+            0.1,
+        )
+        recorder.close()
+
+    def test_when_gssapi_is_missing_then_calls_are_answered_offline(self):
+        with patch("tcms_api.xmlrpc.gssapi", None), patch.dict(
+            sys.modules, {"gssapi": None}
+        ):
+            client = TCMSKerbXmlrpc(
+                None, None, "https://127.0.0.1:9/xml-rpc/", replay=self.path
+            )
+
+        self.assertIsInstance(client.transport, ReplayTransport)
+        self.assertEqual(client.server.Echo.echo("value"), "value")
+
+
+if __name__ == "__main__":
+    unittest.main()
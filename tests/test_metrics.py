@@ -0,0 +1,120 @@
+# pylint: disable=invalid-name
+import os
+import tempfile
+import threading
+import unittest
+from xmlrpc.client import Fault
+
+from tcms_api.metrics import Metrics
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+from tests.test_pool import KeepAliveRequestHandler, ThreadingXMLRPCServer
+
+
+class GivenMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_when_recording_from_many_threads_then_shards_are_summed(self):
+        def worker():
+            for _ in range(1000):
+                self.metrics.record("TestCase.filter", 0.02, sent=10, received=100)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = self.metrics.stats()["TestCase.filter"]
+        self.assertEqual(stats["calls"], 4000)
+        self.assertEqual(stats["bytes_sent"], 40000)
+        self.assertEqual(stats["bytes_received"], 400000)
+        self.assertAlmostEqual(stats["latency_sum"], 80.0)
+
+    def test_when_threads_exit_then_their_shards_are_released(self):
+        self.metrics.record("TestCase.filter", 0.02)
+        for _ in range(50):
+            thread = threading.Thread(
+                target=self.metrics.record, args=("TestCase.filter", 0.02)
+            )
+            thread.start()
+            thread.join()
+
+        # pylint: disable-next=protected-access
+        self.assertEqual(len(self.metrics._shards), 1)
+        self.assertEqual(self.metrics.stats()["TestCase.filter"]["calls"], 51)
+
+        self.metrics.clear()
+        self.assertEqual(self.metrics.stats(), {})
+
+    def test_when_recording_then_histogram_is_cumulative(self):
+        self.metrics.record("TestCase.create", 0.003)
+        self.metrics.record("TestCase.create", 0.3, failed=True, reconnects=1)
+        self.metrics.record("TestCase.create", 60)
+
+        stats = self.metrics.stats()["TestCase.create"]
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["reconnects"], 1)
+        self.assertEqual(stats["latency_buckets"][0.005], 1)
+        self.assertEqual(stats["latency_buckets"][0.5], 2)
+        self.assertEqual(stats["latency_buckets"][10.0], 2)
+        self.assertEqual(stats["latency_buckets"][float("inf")], 3)
+
+    def test_when_writing_prometheus_file_then_it_contains_metrics(self):
+        self.metrics.record("TestCase.filter", 0.02, sent=10, received=100)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tcms-api.prom")
+            self.metrics.write_prometheus(path)
+            with open(path, encoding="utf-8") as file:
+                text = file.read()
+
+        self.assertIn('tcms_api_rpc_calls_total{method="TestCase.filter"} 1\n', text)
+        self.assertIn(
+            'tcms_api_rpc_latency_seconds_bucket{method="TestCase.filter",le="0.025"} 1',
+            text,
+        )
+        self.assertIn(
+            'tcms_api_rpc_latency_seconds_bucket{method="TestCase.filter",le="+Inf"} 1',
+            text,
+        )
+        self.assertIn("# TYPE tcms_api_rpc_latency_seconds histogram", text)
+
+
+class GivenProxyCollectsMetrics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingXMLRPCServer(
+            ("127.0.0.1", 0),
+            requestHandler=KeepAliveRequestHandler,
+            logRequests=False,
+        )
+        cls.server.register_function(lambda value: value, "Echo.echo")
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_when_calling_then_metrics_are_recorded_per_method(self):
+        host, port = self.server.server_address
+        metrics = Metrics()
+        rpc = TCMSProxy(
+            f"http://{host}:{port}/RPC2", transport=CookieTransport(), metrics=metrics
+        )
+
+        rpc.Echo.echo("x" * 1000)
+        with self.assertRaises(Fault):
+            rpc.Missing.method()
+
+        stats = metrics.stats()
+        self.assertEqual(stats["Echo.echo"]["calls"], 1)
+        self.assertEqual(stats["Echo.echo"]["errors"], 0)
+        self.assertGreater(stats["Echo.echo"]["bytes_sent"], 1000)
+        self.assertGreater(stats["Echo.echo"]["bytes_received"], 1000)
+        self.assertEqual(stats["Missing.method"]["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+# pylint: disable=invalid-name,protected-access
+import gzip
+import os
+import signal
+import tempfile
+import threading
+import unittest
+from concurrent.futures import Future
+from xmlrpc.client import Fault, ProtocolError
+
+from tcms_api import TCMS
+from tcms_api.parallel import ProcessPool, WorkerError
+from tcms_api.testing import FakeKiwiServer
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+from tests.test_pool import KeepAliveRequestHandler, ThreadingXMLRPCServer
+
+
+class GivenThreadPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingXMLRPCServer(
+            ("127.0.0.1", 0),
+            requestHandler=KeepAliveRequestHandler,
+            logRequests=False,
+        )
+        cls.server.register_function(lambda *args: list(args), "Echo.echo")
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        host, port = self.server.server_address
+        self.transport = CookieTransport(pool_size=4)
+        self.rpc = TCMSProxy(f"http://{host}:{port}/RPC2", transport=self.transport)
+
+    def test_when_submitting_then_returns_future(self):
+        future = self.rpc.Echo.echo.submit(1, 2)
+
+        self.assertIsInstance(future, Future)
+        self.assertEqual(future.result(), [1, 2])
+
+    def test_when_mapping_then_results_are_in_order(self):
+        arguments = (i if i % 2 else (i, "tuple") for i in range(50))
+
+        results = list(self.rpc.map("Echo.echo", arguments, workers=4))
+
+        self.assertEqual(results, [[i] if i % 2 else [i, "tuple"] for i in range(50)])
+        self.assertLessEqual(self.transport.pool.stats()["created"], 4)
+
+    def test_when_call_fails_then_map_raises_fault(self):
+        with self.assertRaises(Fault):
+            list(self.rpc.map("Missing.method", range(10)))
+
+    def test_when_workers_is_not_positive_then_fails(self):
+        with self.assertRaises(ValueError):
+            list(self.rpc.map("Echo.echo", range(10), workers=0))
+
+
+def values(records):
+    return sorted(record["value"] for record in records)
+
+
+class UnpicklableError(Exception):
+    def __init__(self, reason, detail):
+        # pickle calls __init__ with args, i.e. without detail
+        super().__init__(f"{reason}: {detail}")
+
+
+def unpicklable_failure(_records):
+    raise UnpicklableError("cannot transform", "records")
+
+
+class GivenProcesses(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeKiwiServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def connect(self):
+        return TCMS(self.server.url, "tester", "password").exec
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork()")
+    def test_when_forked_then_child_opens_new_sockets_and_keeps_session(self):
+        rpc = self.connect()
+        rpc.Priority.filter({})
+        transport = rpc.connection()("transport")
+        self.assertEqual(transport.pool.stats()["idle"], 1)
+        logins = self.server.calls["Auth.login"]
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            status = 1
+            try:
+                if transport.pool.stats()["idle"] == 0:
+                    status = 0 if len(rpc.Priority.filter({})) == 5 else 2
+            finally:
+                os._exit(status)
+
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.assertEqual(self.server.calls["Auth.login"], logins)
+        # the parent still uses its socket
+        self.assertEqual(len(rpc.Priority.filter({})), 5)
+        self.assertEqual(transport.pool.stats()["created"], 1)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork()")
+    def test_when_forked_while_locks_are_held_then_child_is_not_blocked(self):
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        rpc = TCMS(
+            self.server.url,
+            "tester",
+            "password",
+            max_in_flight=1,
+            adaptive_concurrency=True,
+            metrics=True,
+            cache_ttl=60,
+            record=os.path.join(directory.name, "calls.jsonl.gz"),
+        ).exec
+        proxy = rpc.connection()
+        recorder = proxy("transport").recorder
+        holding, release = threading.Event(), threading.Event()
+
+        def hold_locks():
+            with proxy.rate_limiter.limit("Priority.filter"), proxy.concurrency.slot():
+                with proxy.metrics._lock, proxy.cache._lock, recorder._lock:
+                    holding.set()
+                    release.wait()
+
+        thread = threading.Thread(target=hold_locks)
+        thread.start()
+        holding.wait()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            status = 1
+            try:
+                signal.alarm(10)
+                status = 0 if len(rpc.Priority.filter({})) == 5 else 2
+                # must not write the end of the gzip stream into the file
+                recorder.close()
+            finally:
+                os._exit(status)
+
+        _, status = os.waitpid(pid, 0)
+        release.set()
+        thread.join()
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+        self.assertEqual(len(rpc.Priority.filter({})), 5)
+        recorder.close()
+        with gzip.open(recorder.path, "rt", encoding="utf-8") as file:
+            self.assertIn("Priority.filter", file.read())
+
+    def test_when_mapping_in_processes_then_results_are_in_order(self):
+        queries = [{"value": f"P{value}"} for value in (3, 1, 2)]
+
+        with self.connect().process_pool(workers=2) as pool:
+            results = list(pool.map("Priority.filter", queries, transform=values))
+
+        self.assertEqual(results, [["P3"], ["P1"], ["P2"]])
+
+    def test_when_call_fails_in_process_then_fault_is_raised(self):
+        with ProcessPool(1, self.server.url, "tester", "password") as pool:
+            with self.assertRaises(Fault):
+                pool.submit("Missing.method").result()
+
+    def test_when_http_request_fails_in_process_then_pool_keeps_working(self):
+        with ProcessPool(
+            1, self.server.url, "tester", "password", max_retries=0
+        ) as pool:
+            self.assertEqual(len(pool.submit("Priority.filter", {}).result()), 5)
+            self.server.fail_requests(500)
+
+            with self.assertRaises(ProtocolError) as context:
+                pool.submit("Priority.filter", {}).result()
+
+            self.assertEqual(context.exception.errcode, 500)
+            self.assertEqual(len(pool.submit("Priority.filter", {}).result()), 5)
+
+    def test_when_error_cannot_be_pickled_then_worker_error_is_raised(self):
+        with ProcessPool(1, self.server.url, "tester", "password") as pool:
+            future = pool.submit("Priority.filter", {}, transform=unpicklable_failure)
+            with self.assertRaises(WorkerError) as context:
+                future.result()
+
+            self.assertEqual(context.exception.type_name, "UnpicklableError")
+            self.assertIn("cannot transform", context.exception.message)
+            self.assertEqual(len(pool.submit("Priority.filter", {}).result()), 5)
+
+    def test_when_processes_is_not_positive_then_fails(self):
+        with self.assertRaises(ValueError):
+            ProcessPool(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# pylint: disable=invalid-name,protected-access
+import threading
+import time
+import unittest
+from socketserver import ThreadingMixIn
+from unittest.mock import MagicMock
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+from tcms_api.xmlrpc import ConnectionPool, CookieTransport, TCMSProxy
+
+
+class KeepAliveRequestHandler(SimpleXMLRPCRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def end_headers(self):
+        self.send_header("Set-Cookie", "sessionid=secret; Path=/")
+        super().end_headers()
+
+
+class ThreadingXMLRPCServer(ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+
+
+class GivenConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.factory = MagicMock(side_effect=lambda host: MagicMock())
+        self.pool = ConnectionPool(self.factory, size=2, idle_timeout=60)
+
+    def test_when_connection_is_released_then_it_is_reused(self):
+        connection = self.pool.acquire("example.com")
+        self.pool.release("example.com", connection)
+
+        self.assertIs(self.pool.acquire("example.com"), connection)
+        self.assertEqual(self.factory.call_count, 1)
+        self.assertEqual(self.pool.stats()["reused"], 1)
+
+    def test_when_connection_is_discarded_then_it_is_closed(self):
+        connection = self.pool.acquire("example.com")
+        self.pool.discard("example.com", connection)
+
+        connection.close.assert_called_once()
+        self.assertIsNot(self.pool.acquire("example.com"), connection)
+        self.assertEqual(self.pool.stats()["discarded"], 1)
+
+    def test_when_connection_is_idle_for_too_long_then_it_is_closed(self):
+        self.pool.idle_timeout = 0
+        connection = self.pool.acquire("example.com")
+        self.pool.release("example.com", connection)
+        time.sleep(0.01)
+
+        self.assertIsNot(self.pool.acquire("example.com"), connection)
+        connection.close.assert_called_once()
+        self.assertEqual(self.pool.stats()["expired"], 1)
+
+    def test_when_pool_is_exhausted_then_acquire_waits(self):
+        first = self.pool.acquire("example.com")
+        self.pool.acquire("example.com")
+
+        thread = threading.Thread(target=self.pool.acquire, args=("example.com",))
+        thread.start()
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+
+        self.pool.release("example.com", first)
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.pool.stats()["waited"], 1)
+        self.assertEqual(self.pool.stats()["in_use"], 2)
+
+
+class GivenCookieTransportIsSharedBetweenThreads(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingXMLRPCServer(
+            ("127.0.0.1", 0),
+            requestHandler=KeepAliveRequestHandler,
+            logRequests=False,
+        )
+        cls.server.register_function(lambda value: value, "Echo.echo")
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_when_calling_in_parallel_then_connections_are_pooled(self):
+        host, port = self.server.server_address
+        transport = CookieTransport(pool_size=4)
+        rpc = TCMSProxy(f"http://{host}:{port}/RPC2", transport=transport)
+        results = []
+
+        def worker(number):
+            for i in range(25):
+                results.append(rpc.Echo.echo(number * 100 + i) == number * 100 + i)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = transport.pool.stats()
+        self.assertEqual(len(results), 200)
+        self.assertTrue(all(results))
+        self.assertLessEqual(stats["created"], 4)
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(transport.cookies.get("sessionid", host), "secret")
+
+
+if __name__ == "__main__":
+    unittest.main()
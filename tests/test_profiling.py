@@ -0,0 +1,115 @@
+# pylint: disable=invalid-name
+import socket
+import threading
+import unittest
+from unittest.mock import patch
+
+from tcms_api.profiling import PHASES, ProfiledHTTPConnection, Profiler, percentile
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+from tests.test_pool import KeepAliveRequestHandler, ThreadingXMLRPCServer
+
+
+class GivenProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = Profiler(top=2)
+
+    def test_when_computing_percentile_then_nearest_rank_is_used(self):
+        ordered = list(range(1, 101))
+        self.assertEqual(percentile(ordered, 50), 50)
+        self.assertEqual(percentile(ordered, 99), 99)
+        self.assertEqual(percentile([7], 90), 7)
+
+    def test_when_recording_then_percentiles_are_per_phase(self):
+        for index in range(1, 101):
+            self.profiler.record("TestCase.filter", {"send": 0.001, "wait": index})
+        self.profiler.record("TestCase.filter", {"dns": 0.5, "send": 0.001, "wait": 1})
+
+        phases = self.profiler.stats()["phases"]
+        self.assertEqual(phases["wait"]["count"], 101)
+        self.assertEqual(phases["wait"]["p50"], 50)
+        self.assertEqual(phases["wait"]["max"], 100)
+        self.assertEqual(phases["dns"]["count"], 1)
+        self.assertEqual(phases["tls"]["count"], 0)
+        self.assertIsNone(phases["tls"]["p90"])
+
+    def test_when_recording_then_only_slowest_calls_are_kept(self):
+        self.profiler.record("TestCase.create", {"wait": 0.2})
+        self.profiler.record("TestCase.filter", {"wait": 0.1})
+        self.profiler.record("TestRun.create", {"wait": 0.3})
+
+        slowest = self.profiler.stats()["slowest"]
+        self.assertEqual(
+            [call["method"] for call in slowest], ["TestRun.create", "TestCase.create"]
+        )
+        self.assertEqual(slowest[0]["total"], 0.3)
+        self.assertIn("TestRun.create", self.profiler.report())
+
+        self.profiler.clear()
+        self.assertEqual(self.profiler.stats()["slowest"], [])
+
+
+class GivenProfiledConnection(unittest.TestCase):
+    def test_when_address_is_ipv6_link_local_then_scope_id_is_kept(self):
+        sockaddr = ("fe80::1%eth0", 80, 0, 2)
+        addresses = [(socket.AF_INET6, socket.SOCK_STREAM, 6, "", sockaddr)]
+        connection = ProfiledHTTPConnection("fe80::1%eth0", 80, timeout=5)
+
+        with patch("socket.getaddrinfo", return_value=addresses) as getaddrinfo, patch(
+            "socket.socket"
+        ) as socket_class:
+            connection.connect()
+
+        # the numeric address isn't resolved again
+        getaddrinfo.assert_called_once()
+        self.assertIs(connection.sock, socket_class.return_value)
+        socket_class.assert_called_once_with(socket.AF_INET6, socket.SOCK_STREAM, 6)
+        sock = socket_class.return_value
+        sock.settimeout.assert_called_once_with(5)
+        sock.connect.assert_called_once_with(sockaddr)
+        self.assertIn("connect", connection.timings)
+
+
+class GivenTransportWithProfiler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingXMLRPCServer(
+            ("127.0.0.1", 0),
+            requestHandler=KeepAliveRequestHandler,
+            logRequests=False,
+        )
+        cls.server.register_function(lambda value: value, "Echo.echo")
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_when_calling_then_phases_are_recorded(self):
+        host, port = self.server.server_address
+        profiler = Profiler()
+        rpc = TCMSProxy(
+            f"http://{host}:{port}/RPC2",
+            transport=CookieTransport(profiler=profiler),
+        )
+
+        rpc.Echo.echo(1)
+        rpc.Echo.echo(2)
+
+        stats = profiler.stats()
+        # the connection is opened once and then reused
+        self.assertEqual(stats["phases"]["dns"]["count"], 1)
+        self.assertEqual(stats["phases"]["connect"]["count"], 1)
+        self.assertEqual(stats["phases"]["tls"]["count"], 0)
+        for phase in ("send", "wait", "parse"):
+            self.assertEqual(stats["phases"][phase]["count"], 2)
+
+        self.assertEqual(len(stats["slowest"]), 2)
+        for call in stats["slowest"]:
+            self.assertEqual(call["method"], "Echo.echo")
+            self.assertTrue(set(call["phases"]) <= set(PHASES))
+            self.assertGreaterEqual(min(call["phases"].values()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
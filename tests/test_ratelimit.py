@@ -0,0 +1,163 @@
+# pylint: disable=invalid-name
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tcms_api.ratelimit import RateLimiter, TokenBucket, is_read, shared_limiter
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+
+
+class GivenTokenBucket(unittest.TestCase):
+    def test_when_burst_is_used_up_then_waits_for_next_token(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        bucket.sleep = MagicMock()
+
+        waits = [bucket.acquire() for _ in range(4)]
+
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1, delta=0.01)
+        self.assertAlmostEqual(waits[3], 0.2, delta=0.01)
+
+    def test_when_rate_is_not_positive_then_fails(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+class GivenRateLimiter(unittest.TestCase):
+    def test_when_classifying_then_filter_is_read_and_create_is_write(self):
+        self.assertTrue(is_read("TestCase.filter"))
+        self.assertFalse(is_read("TestCase.create"))
+        self.assertFalse(
+            is_read(
+                "system.multicall",
+                ([{"methodName": "TestExecution.update", "params": []}],),
+            )
+        )
+
+    def test_when_writes_are_limited_then_reads_do_not_wait(self):
+        limiter = RateLimiter(write_rate=20)
+
+        started = time.monotonic()
+        for _ in range(3):
+            with limiter.limit("TestCase.filter"):
+                pass
+            with limiter.limit("TestExecution.update"):
+                pass
+        elapsed = time.monotonic() - started
+
+        stats = limiter.stats()
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertEqual(stats["read"]["calls"], 3)
+        self.assertEqual(stats["read"]["waited_calls"], 0)
+        self.assertEqual(stats["write"]["calls"], 3)
+        self.assertEqual(stats["write"]["waited_calls"], 2)
+        self.assertGreaterEqual(stats["write"]["waited"], 0.09)
+
+    def test_when_max_in_flight_is_reached_then_calls_wait(self):
+        limiter = RateLimiter(max_in_flight=1)
+        entered = threading.Event()
+        leave = threading.Event()
+
+        def call():
+            with limiter.limit("TestCase.filter"):
+                entered.set()
+                leave.wait()
+
+        first = threading.Thread(target=call)
+        first.start()
+        entered.wait()
+        entered.clear()
+
+        second = threading.Thread(target=call)
+        second.start()
+        self.assertFalse(entered.wait(0.1))
+        self.assertEqual(limiter.stats()["in_flight"], 1)
+
+        leave.set()
+        first.join()
+        second.join()
+        self.assertTrue(entered.is_set())
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+
+    def test_when_coroutines_are_limited_then_event_loop_is_not_blocked(self):
+        limiter = RateLimiter(write_rate=20, max_in_flight=1)
+
+        async def call():
+            async with limiter.async_limit("TestExecution.update", sleep=asyncio.sleep):
+                await asyncio.sleep(0.01)
+
+        async def calls():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            ticker = asyncio.ensure_future(tick())
+            await asyncio.gather(*[call() for _ in range(3)])
+            ticker.cancel()
+            return ticks
+
+        started = time.monotonic()
+        ticks = asyncio.run(calls())
+        elapsed = time.monotonic() - started
+
+        stats = limiter.stats()
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertGreater(ticks, 5)
+        self.assertEqual(stats["write"]["calls"], 3)
+        self.assertEqual(stats["write"]["waited_calls"], 2)
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_when_reconfigured_during_call_then_slot_is_released(self):
+        limiter = RateLimiter(max_in_flight=1)
+
+        with limiter.limit("TestCase.filter"):
+            limiter.configure(max_in_flight=2)
+        with limiter.limit("TestCase.filter"), limiter.limit("TestCase.filter"):
+            self.assertEqual(limiter.stats()["in_flight"], 2)
+
+        self.assertEqual(limiter.stats()["max_in_flight"], 2)
+
+
+class GivenSharedLimiter(unittest.TestCase):
+    def test_when_limits_are_the_same_then_limiter_is_shared(self):
+        first = shared_limiter("shared.example.com", read_rate=5, max_in_flight=2)
+        second = shared_limiter("shared.example.com", read_rate=5, max_in_flight=2)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, shared_limiter("other.example.com", read_rate=5))
+
+    def test_when_limits_differ_then_shared_limiter_is_reconfigured(self):
+        first = shared_limiter("reconfigured.example.com", read_rate=5)
+        second = shared_limiter("reconfigured.example.com", max_in_flight=3)
+
+        self.assertIs(first, second)
+        self.assertEqual(first.stats()["max_in_flight"], 3)
+        self.assertIsNone(first._buckets["read"])  # pylint: disable=protected-access
+
+    def test_when_no_limits_are_specified_then_there_is_no_limiter(self):
+        self.assertIsNone(shared_limiter("example.com", read_rate=None, burst=1))
+
+    def test_when_proxy_has_limiter_then_calls_pass_through_it(self):
+        limiter = RateLimiter(max_in_flight=4)
+        rpc = TCMSProxy(
+            "http://example.com/xml-rpc/",
+            transport=CookieTransport(),
+            rate_limiter=limiter,
+        )
+
+        with patch.object(rpc, "_ServerProxy__request", return_value=[]):
+            rpc.TestCase.filter({})
+            rpc.TestCase.create({})
+
+        self.assertEqual(limiter.stats()["read"]["calls"], 1)
+        self.assertEqual(limiter.stats()["write"]["calls"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+# pylint: disable=invalid-name,protected-access
+import threading
+import time
+import unittest
+from http.client import RemoteDisconnected
+from unittest.mock import MagicMock, patch
+from xmlrpc.client import Fault, dumps, loads
+
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+from tests.test_pool import KeepAliveRequestHandler, ThreadingXMLRPCServer
+
+AUTH_FAILED = Fault(-32603, 'Authentication failed when calling "TestCase.filter"')
+
+
+class GivenServerDropsTheSocket(unittest.TestCase):
+    def test_when_calling_then_retries_on_new_socket(self):
+        transport = CookieTransport()
+        reconnect = []
+
+        def single_request(*_args):
+            reconnect.append(getattr(transport._local, "reconnect", False))
+            if len(reconnect) == 1:
+                # the kept alive socket was closed before the request was sent
+                transport._local.reused = True
+                transport._local.request_sent = False
+                raise RemoteDisconnected("Remote end closed connection")
+            return "result"
+
+        with patch.object(transport, "single_request", side_effect=single_request):
+            result = transport.request("example.com", "/xml-rpc/", b"")
+
+        self.assertEqual(result, "result")
+        self.assertEqual(reconnect, [False, True])
+        self.assertEqual(transport.reconnects, 1)
+
+    def test_when_request_has_been_sent_then_does_not_retry(self):
+        transport = CookieTransport()
+
+        def single_request(*_args):
+            transport._local.reused = True
+            transport._local.request_sent = True
+            raise RemoteDisconnected("Remote end closed connection")
+
+        with patch.object(
+            transport, "single_request", side_effect=single_request
+        ) as request, self.assertRaises(RemoteDisconnected):
+            transport.request("example.com", "/xml-rpc/", b"")
+
+        request.assert_called_once()
+        self.assertEqual(transport.reconnects, 0)
+
+    def test_when_retry_fails_then_raises(self):
+        transport = CookieTransport()
+
+        with patch.object(
+            transport, "single_request", side_effect=BrokenPipeError
+        ), self.assertRaises(BrokenPipeError):
+            transport.request("example.com", "/xml-rpc/", b"")
+
+
+class DropsConnectionAfterCreate(KeepAliveRequestHandler):
+    # idle keep-alive connections are closed by the server after this long
+    timeout = 0.1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        params, methodname = loads(body)
+        self.server.calls.append(methodname)
+        if methodname == "TestCase.create":
+            # processed, but the connection is lost before the answer is sent
+            self.close_connection = True
+            return
+
+        response = dumps((params[0],), methodresponse=True).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+
+class GivenServerDropsTheConnection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingXMLRPCServer(
+            ("127.0.0.1", 0),
+            requestHandler=DropsConnectionAfterCreate,
+            logRequests=False,
+        )
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.calls = []
+        self.transport = CookieTransport()
+        host, port = self.server.server_address
+        self.rpc = TCMSProxy(f"http://{host}:{port}/RPC2", transport=self.transport)
+
+    def test_when_creating_on_new_socket_then_create_is_not_sent_again(self):
+        with self.assertRaises(RemoteDisconnected):
+            self.rpc.TestCase.create({"summary": "test"})
+
+        self.assertEqual(self.server.calls, ["TestCase.create"])
+        self.assertEqual(self.transport.reconnects, 0)
+
+    def test_when_creating_on_reused_socket_then_create_is_not_sent_again(self):
+        self.assertEqual(self.rpc.Echo.echo(1), 1)
+
+        with self.assertRaises(RemoteDisconnected):
+            self.rpc.TestCase.create({"summary": "test"})
+
+        self.assertEqual(self.server.calls, ["Echo.echo", "TestCase.create"])
+        self.assertEqual(self.transport.pool.stats()["reused"], 1)
+        self.assertEqual(self.transport.reconnects, 0)
+
+    def test_when_idle_socket_was_closed_then_uses_new_socket(self):
+        self.assertEqual(self.rpc.Echo.echo(1), 1)
+        time.sleep(DropsConnectionAfterCreate.timeout * 3)
+
+        self.assertEqual(self.rpc.Echo.echo(2), 2)
+
+        stats = self.transport.pool.stats()
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["created"], 2)
+        self.assertEqual(self.transport.reconnects, 0)
+
+
+class GivenServerRejectsTheSession(unittest.TestCase):
+    def setUp(self):
+        self.login = MagicMock()
+        self.rpc = TCMSProxy(
+            "http://example.com/xml-rpc/", transport=CookieTransport(), login=self.login
+        )
+
+    def test_when_calling_then_logs_in_again_and_retries(self):
+        with patch.object(
+            self.rpc, "_ServerProxy__request", side_effect=[AUTH_FAILED, [{"id": 1}]]
+        ):
+            result = self.rpc.TestCase.filter({})
+
+        self.assertEqual(result, [{"id": 1}])
+        self.login.assert_called_once()
+        self.assertEqual(self.rpc.relogins, 1)
+
+    def test_when_login_fails_then_does_not_retry(self):
+        with patch.object(
+            self.rpc, "_ServerProxy__request", side_effect=AUTH_FAILED
+        ), self.assertRaises(Fault):
+            self.rpc.Auth.login("user", "wrong-password")
+
+        self.login.assert_not_called()
+
+    def test_when_permission_is_missing_then_logs_in_only_once(self):
+        with patch.object(
+            self.rpc, "_ServerProxy__request", side_effect=AUTH_FAILED
+        ) as request:
+            for _ in range(3):
+                with self.assertRaises(Fault):
+                    self.rpc.TestCase.filter({})
+
+        self.login.assert_called_once()
+        # the first call is sent again after logging in, the others are not
+        self.assertEqual(request.call_count, 4)
+
+    def test_when_logged_in_recently_then_does_not_log_in_again(self):
+        with patch.object(self.rpc, "_ServerProxy__request", side_effect=AUTH_FAILED):
+            with self.assertRaises(Fault):
+                self.rpc.TestCase.filter({})
+            with self.assertRaises(Fault):
+                self.rpc.TestPlan.filter({})
+
+        self.login.assert_called_once()
+
+    def test_when_other_fault_then_does_not_log_in(self):
+        with patch.object(
+            self.rpc, "_ServerProxy__request", side_effect=Fault(-32602, "Invalid")
+        ), self.assertRaises(Fault):
+            self.rpc.TestCase.filter({})
+
+        self.login.assert_not_called()
+        self.assertEqual(self.rpc.relogins, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
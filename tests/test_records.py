@@ -0,0 +1,114 @@
+# pylint: disable=invalid-name,no-member
+import pickle
+import unittest
+
+from tcms_api import TCMS
+from tcms_api.records import Record, compact, schema, to_dicts
+from tcms_api.testing import FakeKiwiServer
+
+
+def rows():
+    return [
+        # equal strings which are different objects, like after parsing
+        {"id": 1, "status__name": "".join(["PASS", "ED"]), "count": 3},
+        {"id": 2, "status__name": "".join(["PASS", "ED"]), "count": 4},
+    ]
+
+
+class GivenCompactRecords(unittest.TestCase):
+    def setUp(self):
+        self.records = compact(rows())
+
+    def test_when_accessing_fields_then_values_are_returned(self):
+        record = self.records[0]
+
+        self.assertIsInstance(record, Record)
+        self.assertEqual(record["id"], 1)
+        self.assertEqual(record.status__name, "PASSED")
+        self.assertEqual(record.get("missing", "default"), "default")
+        self.assertIn("status__name", record)
+        self.assertEqual(list(record.items())[0], ("id", 1))
+
+    def test_when_field_is_missing_then_errors_are_raised(self):
+        with self.assertRaises(KeyError):
+            self.records[0]["missing"]  # pylint: disable=pointless-statement
+        with self.assertRaises(AttributeError):
+            self.records[0].missing  # pylint: disable=pointless-statement
+
+    def test_when_field_collides_with_method_then_item_access_works(self):
+        self.assertEqual(self.records[1]["count"], 4)
+
+    def test_when_rows_have_same_fields_then_schema_is_shared(self):
+        self.assertIs(type(self.records[0]), type(self.records[1]))
+        self.assertIs(type(self.records[0]), schema(("id", "status__name", "count")))
+
+    def test_when_strings_repeat_then_they_are_shared(self):
+        self.assertIs(self.records[0]["status__name"], self.records[1]["status__name"])
+
+    def test_when_converting_back_then_dicts_are_equal(self):
+        self.assertEqual(to_dicts(self.records), rows())
+        self.assertEqual(dict(self.records[0]), rows()[0])
+        self.assertEqual(self.records, rows())
+
+    def test_when_pickling_then_record_is_restored(self):
+        restored = pickle.loads(pickle.dumps(self.records[0]))
+
+        self.assertEqual(restored, self.records[0])
+        self.assertEqual(restored["count"], 3)
+
+    def test_when_result_is_not_a_list_then_it_is_unchanged(self):
+        self.assertEqual(compact({"id": 1}), {"id": 1})
+        self.assertEqual(compact(["a", 1]), ["a", 1])
+
+
+class GivenCompactRecordsAreEnabled(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeKiwiServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_when_filtering_then_records_are_returned(self):
+        for protocol in ("xml-rpc", "json-rpc"):
+            with self.subTest(protocol=protocol):
+                rpc = TCMS(
+                    self.server.url,
+                    "tester",
+                    "password",
+                    protocol=protocol,
+                    compact_records=True,
+                ).exec
+
+                priorities = rpc.Priority.filter({"value": "P1"})
+
+                self.assertIsInstance(priorities[0], Record)
+                self.assertEqual(priorities[0].value, "P1")
+
+    def test_when_using_stdlib_unmarshaller_then_records_are_returned(self):
+        rpc = TCMS(
+            self.server.url,
+            "tester",
+            "password",
+            compact_records=True,
+            fast_unmarshaller=False,
+        ).exec
+
+        priorities = rpc.Priority.filter({"value": "P1"})
+
+        self.assertIsInstance(priorities[0], Record)
+        self.assertEqual(priorities[0].value, "P1")
+
+    def test_when_batching_then_results_are_records(self):
+        rpc = TCMS(self.server.url, "tester", "password", compact_records=True).exec
+
+        with rpc.batch() as batch:
+            result = batch.Priority.filter({"value": "P2"})
+
+        self.assertIsInstance(result.result()[0], Record)
+        self.assertEqual(result.result()[0]["value"], "P2")
+
+
+if __name__ == "__main__":
+    unittest.main()
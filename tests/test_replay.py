@@ -0,0 +1,168 @@
+# pylint: disable=invalid-name
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from xmlrpc.client import Fault
+
+from tcms_api import TCMS
+from tcms_api.replay import BufferedResponse, Recorder, RecordedCall, Recording
+from tcms_api.xmlrpc import ReplayTransport, TCMSProxy
+from tests.test_pool import KeepAliveRequestHandler, ThreadingXMLRPCServer
+
+# nothing listens on this address, replayed calls must not reach the network
+OFFLINE_URL = "http://127.0.0.1:9/xml-rpc/"
+
+
+class AnyPathRequestHandler(KeepAliveRequestHandler):
+    rpc_paths = ()
+
+
+class GivenRecordedCalls(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        server = ThreadingXMLRPCServer(
+            ("127.0.0.1", 0),
+            requestHandler=AnyPathRequestHandler,
+            logRequests=False,
+        )
+        server.register_function(lambda *_args: "session", "Auth.login")
+        server.register_function(lambda value: value, "Echo.echo")
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, "calls.jsonl.gz")
+        host, port = server.server_address
+        try:
+            rpc = TCMS(
+                f"http://{host}:{port}/xml-rpc/", "tester", "secret", record=cls.path
+            ).exec
+            rpc.Echo.echo("first")
+            rpc.Echo.echo({"pk": 2})
+            with cls.assertRaises(cls, Fault):
+                rpc.Missing.method()
+            rpc.connection()("transport").recorder.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_when_loading_then_all_calls_are_recorded(self):
+        recording = Recording(self.path)
+        self.assertEqual(
+            [call.methodname for call in recording.calls],
+            ["Auth.login", "Echo.echo", "Echo.echo", "Missing.method"],
+        )
+        self.assertTrue(all(call.elapsed > 0 for call in recording.calls))
+
+    def test_when_loading_then_credentials_are_not_recorded(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            content = file.read()
+        login = Recording(self.path).calls[0]
+
+        # the password and the session cookie are both "secret"
+        self.assertNotIn("secret", content)
+        self.assertIn(b"[redacted]", login.request)
+        self.assertIn(["Set-Cookie", "sessionid=[redacted]; Path=/"], login.headers)
+
+    def test_when_replaying_then_responses_match_the_server(self):
+        rpc = TCMS(OFFLINE_URL, "tester", "secret", replay=self.path).exec
+
+        self.assertEqual(rpc.Echo.echo({"pk": 2}), {"pk": 2})
+        self.assertEqual(rpc.Echo.echo("first"), "first")
+        with self.assertRaises(Fault):
+            rpc.Missing.method()
+
+    def test_when_params_differ_then_next_response_for_method_is_used(self):
+        rpc = TCMSProxy(OFFLINE_URL, transport=ReplayTransport(self.path))
+
+        self.assertEqual(rpc.Echo.echo("other"), "first")
+        self.assertEqual(rpc.Echo.echo("other"), {"pk": 2})
+        # the last response is repeated
+        self.assertEqual(rpc.Echo.echo("other"), {"pk": 2})
+
+    def test_when_method_was_not_recorded_then_error_is_raised(self):
+        rpc = TCMSProxy(OFFLINE_URL, transport=ReplayTransport(self.path))
+
+        with self.assertRaisesRegex(RuntimeError, "TestRun.create"):
+            rpc.TestRun.create({})
+
+    def test_when_latency_is_scaled_then_replay_sleeps(self):
+        delays = []
+        transport = ReplayTransport(self.path, latency_scale=2.0, sleep=delays.append)
+        rpc = TCMSProxy(OFFLINE_URL, transport=transport)
+
+        rpc.Echo.echo("first")
+
+        recorded = Recording(self.path).calls[1].elapsed
+        self.assertEqual(delays, [recorded * 2.0])
+
+
+class GivenRecordedJsonRpcCall(unittest.TestCase):
+    def test_when_replaying_then_response_has_id_of_request(self):
+        call = RecordedCall(
+            "Echo.echo",
+            b'{"jsonrpc": "2.0", "method": "Echo.echo", "params": [1], "id": 7}',
+            status=200,
+            reason="OK",
+            headers=[("Content-Type", "application/json")],
+            body=b'{"jsonrpc": "2.0", "id": 7, "result": 1}',
+            elapsed=0.1,
+        )
+
+        response = call.response(
+            b'{"jsonrpc": "2.0", "method": "Echo.echo", "params": [1], "id": 1}'
+        )
+
+        self.assertEqual(
+            json.loads(response.read()), {"jsonrpc": "2.0", "id": 1, "result": 1}
+        )
+        self.assertEqual(response.getheader("content-type"), "application/json")
+
+    def test_when_recording_without_gzip_then_file_is_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "calls.jsonl")
+            recorder = Recorder(path)
+            recorder.record(
+                b'{"jsonrpc": "2.0", "method": "Echo.echo", "params": [1], "id": 1}',
+                BufferedResponse(200, "OK", [], b'{"id": 1, "result": 1}'),
+                0.25,
+            )
+            recorder.close()
+
+            with open(path, encoding="utf-8") as file:
+                values = json.loads(file.readline())
+
+        self.assertEqual(values["method"], "Echo.echo")
+        self.assertEqual(values["elapsed"], 0.25)
+
+    def test_when_recording_login_then_password_and_session_are_redacted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "calls.jsonl")
+            recorder = Recorder(path)
+            recorder.record(
+                b'{"jsonrpc": "2.0", "method": "Auth.login", '
+                b'"params": ["tester", "password"], "id": 1}',
+                BufferedResponse(200, "OK", [], b'{"id": 1, "result": "session-key"}'),
+                0.25,
+            )
+            recorder.close()
+
+            with open(path, encoding="utf-8") as file:
+                content = file.read()
+            login = Recording(path).calls[0]
+
+        self.assertNotIn("password", content)
+        self.assertNotIn("session-key", content)
+        self.assertEqual(login.methodname, "Auth.login")
+        self.assertEqual(json.loads(login.request)["params"], ["[redacted]"] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
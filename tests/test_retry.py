@@ -0,0 +1,107 @@
+# pylint: disable=invalid-name
+import unittest
+from unittest.mock import MagicMock, patch
+from xmlrpc.client import Fault, ProtocolError
+
+from tcms_api.retry import RetryPolicy
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+
+
+def error(status, headers=None):
+    return ProtocolError("example.com/xml-rpc/", status, "Error", headers or {})
+
+
+class GivenRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_retries=3, backoff=0.1, budget=10)
+        self.policy.sleep = MagicMock()
+
+    def call(self, methodname, *side_effect, params=()):
+        function = MagicMock(side_effect=side_effect)
+        return self.policy.call(function, methodname, params), function.call_count
+
+    def test_when_server_is_unavailable_then_any_method_is_retried(self):
+        result = self.call("TestCase.create", error(503), error(429), "created")
+
+        self.assertEqual(result, ("created", 3))
+        self.assertEqual(self.policy.retries, 2)
+
+    def test_when_outcome_is_unknown_then_idempotent_method_is_retried(self):
+        result = self.call("TestExecution.update", error(502), ConnectionResetError, 1)
+
+        self.assertEqual(result, (1, 3))
+
+    def test_when_outcome_is_unknown_then_create_is_not_retried(self):
+        with self.assertRaises(ProtocolError):
+            self.call("TestCase.create", error(502), "duplicate")
+
+        self.assertEqual(self.policy.retries, 0)
+
+    def test_when_create_has_recover_then_found_object_is_returned(self):
+        recover = MagicMock(return_value={"id": 1})
+        self.policy.classify("TestCase.create", False, recover=recover)
+
+        result = self.call("TestCase.create", error(504), params=({"summary": "s"},))
+
+        self.assertEqual(result, ({"id": 1}, 1))
+        recover.assert_called_once_with(None, {"summary": "s"})
+
+    def test_when_method_is_classified_then_it_takes_precedence(self):
+        self.policy.classify("TestRun.add_case", True)
+
+        self.assertTrue(self.policy.is_idempotent("TestRun.add_case"))
+        self.assertFalse(self.policy.is_idempotent("TestCase.add_comment"))
+        self.assertTrue(self.policy.is_idempotent("TestCase.add_tag"))
+
+    def test_when_multicall_contains_create_then_it_is_not_idempotent(self):
+        calls = [
+            {"methodName": "TestCase.filter", "params": [{}]},
+            {"methodName": "TestCase.create", "params": [{}]},
+        ]
+
+        self.assertTrue(self.policy.is_idempotent("system.multicall", (calls[:1],)))
+        self.assertFalse(self.policy.is_idempotent("system.multicall", (calls,)))
+
+    def test_when_server_sends_retry_after_then_waits_for_it(self):
+        self.call("TestCase.filter", error(503, {"Retry-After": "2"}), [])
+
+        self.assertGreaterEqual(self.policy.sleep.call_args[0][0], 2)
+
+    def test_when_budget_is_exhausted_then_raises(self):
+        with self.assertRaises(ProtocolError):
+            self.call("TestCase.filter", error(503, {"Retry-After": "60"}), [])
+
+        self.policy.sleep.assert_not_called()
+
+    def test_when_retries_are_exhausted_then_raises(self):
+        with self.assertRaises(ConnectionResetError):
+            self.call("TestCase.filter", *[ConnectionResetError] * 4)
+
+        self.assertEqual(self.policy.retries, 3)
+
+    def test_when_server_returns_fault_then_it_is_not_retried(self):
+        with self.assertRaises(Fault):
+            self.call("TestCase.filter", Fault(-32603, "Internal error"), [])
+
+
+class GivenProxyWithRetryPolicy(unittest.TestCase):
+    def test_when_server_is_unavailable_then_call_is_retried(self):
+        policy = RetryPolicy()
+        policy.sleep = MagicMock()
+        rpc = TCMSProxy(
+            "http://example.com/xml-rpc/",
+            transport=CookieTransport(),
+            retry_policy=policy,
+        )
+
+        with patch.object(
+            rpc, "_ServerProxy__request", side_effect=[error(503), [{"id": 1}]]
+        ):
+            result = rpc.TestCase.filter({})
+
+        self.assertEqual(result, [{"id": 1}])
+        self.assertEqual(policy.retries, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
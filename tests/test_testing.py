@@ -0,0 +1,164 @@
+# pylint: disable=invalid-name
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from xmlrpc.client import Fault, ProtocolError
+
+from tcms_api import TCMS, plugin_helpers
+from tcms_api.testing import FakeKiwi, FakeKiwiServer
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+
+
+class GivenFakeKiwiServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeKiwiServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def connect(self, **options):
+        return TCMS(self.server.url, "tester", "password", **options).exec
+
+    def test_when_not_logged_in_then_calls_are_rejected(self):
+        rpc = TCMSProxy(self.server.url, transport=CookieTransport())
+
+        with self.assertRaisesRegex(Fault, "Authentication failed"):
+            rpc.Product.filter({})
+
+    def test_when_password_is_wrong_then_login_fails(self):
+        with self.assertRaisesRegex(Fault, "Wrong username or password"):
+            TCMS(self.server.url, "tester", "wrong").exec.Product.filter({})
+
+    def test_when_creating_product_then_defaults_are_created(self):
+        rpc = self.connect()
+        product = rpc.Product.create({"name": "Defaults", "classification": 1})
+
+        categories = rpc.Category.filter({"product": product["id"]})
+        self.assertEqual(categories[0]["name"], "--default--")
+        versions = rpc.Version.filter({"product__name": "Defaults"})
+        self.assertEqual(versions[0]["value"], "unspecified")
+
+    def test_when_foreign_key_is_invalid_then_fault_is_raised(self):
+        with self.assertRaisesRegex(Fault, "classification"):
+            self.connect().Product.create({"name": "Invalid", "classification": 999})
+
+    def test_when_fault_is_injected_then_method_fails_given_times(self):
+        rpc = self.connect(max_retries=0)
+        self.server.fail("Priority.filter", message="Database is locked", times=1)
+
+        with self.assertRaisesRegex(Fault, "Database is locked"):
+            rpc.Priority.filter({})
+        self.assertEqual(len(rpc.Priority.filter({})), 5)
+
+    def test_when_http_failure_is_injected_then_request_is_retried(self):
+        rpc = self.connect(retry_backoff=0)
+        self.server.fail_requests(503)
+
+        self.assertEqual(len(rpc.PlanType.filter({"name": "Integration"})), 1)
+        self.assertEqual(rpc.connection_stats()["retries"], 1)
+
+    def test_when_http_failure_is_not_retried_then_protocol_error_is_raised(self):
+        rpc = self.connect(max_retries=0)
+        self.server.fail_requests(502)
+
+        with self.assertRaises(ProtocolError):
+            rpc.PlanType.filter({})
+
+    def test_when_sessions_expire_then_client_logs_in_again(self):
+        rpc = self.connect()
+        rpc.Priority.filter({})
+        logins = self.server.calls["Auth.login"]
+
+        self.server.expire_sessions()
+
+        self.assertEqual(len(rpc.Priority.filter({})), 5)
+        self.assertEqual(self.server.calls["Auth.login"], logins + 1)
+
+    def test_when_using_json_rpc_then_results_are_the_same(self):
+        rpc = self.connect(protocol="json-rpc")
+
+        statuses = rpc.TestExecutionStatus.filter({"weight__gt": 0})
+        self.assertEqual(
+            sorted(status["name"] for status in statuses), ["PASSED", "WAIVED"]
+        )
+
+        with rpc.batch() as batch:
+            results = [batch.Priority.filter({"value": "P1"}), batch.Missing.method()]
+        self.assertEqual(results[0].result()[0]["value"], "P1")
+        self.assertIsNotNone(results[1].fault)
+
+    @staticmethod
+    def report_results(backend):
+        backend.configure()
+
+        for summary in ("test_one", "test_two", "test_one"):
+            test_case, _ = backend.test_case_get_or_create(summary)
+            backend.add_test_case_to_plan(test_case["id"], backend.plan_id)
+            for execution in backend.add_test_case_to_run(
+                test_case["id"], backend.run_id
+            ):
+                backend.update_test_execution(
+                    execution["id"], backend.get_status_id("PASSED"), "ok"
+                )
+        backend.finish_test_run()
+
+    def test_when_backend_reports_results_then_records_are_created(self):
+        backend = plugin_helpers.Backend(prefix="[fake]")
+        with tempfile.TemporaryDirectory() as home:
+            with open(os.path.join(home, ".tcms.conf"), "w", encoding="utf-8") as file:
+                file.write(
+                    f"[tcms]\nurl = {self.server.url}\n"
+                    "username = tester\npassword = password\n"
+                )
+
+            environment = {
+                "HOME": home,
+                "TCMS_PRODUCT": "Backend",
+                "TCMS_PRODUCT_VERSION": "1.0",
+                "TCMS_BUILD": "42",
+            }
+            with patch.dict(os.environ, environment, True):
+                self.report_results(backend)
+
+        records = self.server.kiwi.records
+        executions = [
+            execution
+            for execution in records["TestExecution"].values()
+            if execution["run"] == backend.run_id
+        ]
+        self.assertEqual(len(executions), 2)
+        self.assertTrue(all(execution["status"] == 4 for execution in executions))
+        self.assertIsNotNone(records["TestRun"][backend.run_id]["stop_date"])
+        self.assertEqual(
+            records["TestPlan"][backend.plan_id]["name"],
+            "[fake] Plan for Backend (1.0)",
+        )
+
+
+class GivenFakeKiwi(unittest.TestCase):
+    def setUp(self):
+        self.kiwi = FakeKiwi()
+        self.plan = self.kiwi.create("TestPlan", {"name": "Plan"}, 1)
+
+    def test_when_filtering_by_many_to_many_field_then_records_are_found(self):
+        case = self.kiwi.create("TestCase", {"summary": "Case"}, 1)
+        self.kiwi.plan_add_case(1, self.plan["id"], case["id"])
+        run = self.kiwi.create("TestRun", {"summary": "Run", "tag": ["smoke"]}, 1)
+
+        cases = self.kiwi.filter("TestCase", {"plan": self.plan["id"]})
+        runs = self.kiwi.filter("TestRun", {"tag": "smoke"})
+
+        self.assertEqual([item["id"] for item in cases], [case["id"]])
+        self.assertEqual([item["id"] for item in runs], [run["id"]])
+
+    def test_when_field_is_not_indexed_then_records_are_scanned(self):
+        plans = self.kiwi.filter("TestPlan", {"parent": None})
+
+        self.assertEqual([item["id"] for item in plans], [self.plan["id"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# pylint: disable=invalid-name
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from tcms_api import tracing
+from tcms_api.xmlrpc import CookieTransport, TCMSProxy
+from tests.test_pool import KeepAliveRequestHandler, ThreadingXMLRPCServer
+
+
+class HeaderRecordingRequestHandler(KeepAliveRequestHandler):
+    headers_seen = []
+
+    def do_POST(self):
+        HeaderRecordingRequestHandler.headers_seen.append(dict(self.headers))
+        super().do_POST()
+
+
+class Operations:  # pylint: disable=too-few-public-methods
+    @tracing.traced
+    def get_or_create(self, rpc):  # pylint: disable=no-self-use
+        return rpc.Echo.echo(1)
+
+
+class GivenTracer(unittest.TestCase):
+    def setUp(self):
+        self.exporter = tracing.InMemoryExporter()
+        self.tracer = tracing.Tracer(self.exporter)
+
+    def test_when_spans_are_nested_then_child_has_parent(self):
+        with self.tracer.span("parent", job="nightly") as parent:
+            with self.tracer.span("child") as child:
+                self.assertIs(tracing.current_span(), child)
+
+        self.assertIsNone(tracing.current_span())
+        self.assertEqual(
+            [span.name for span in self.exporter.spans], ["child", "parent"]
+        )
+        self.assertEqual(child.parent_id, parent.span_id)
+        self.assertEqual(child.trace_id, parent.trace_id)
+        self.assertEqual(parent.attributes, {"job": "nightly"})
+        self.assertGreaterEqual(parent.duration, child.duration)
+
+    def test_when_block_raises_then_span_records_error(self):
+        with self.assertRaises(ValueError):
+            with self.tracer.span("failing"):
+                raise ValueError("boom")
+
+        self.assertEqual(self.exporter.spans[0].error, "ValueError('boom')")
+
+    def test_when_disabled_then_no_span_is_created(self):
+        with tracing.Tracer().span("disabled") as span:
+            self.assertIsNone(span)
+
+    def test_when_exporting_to_json_lines_then_each_span_is_a_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spans.jsonl")
+            tracer = tracing.Tracer(tracing.JsonLinesExporter(path))
+            with tracer.span("first"):
+                pass
+            with tracer.span("second"):
+                pass
+
+            with open(path, encoding="utf-8") as file:
+                spans = [json.loads(line) for line in file]
+
+        self.assertEqual([span["name"] for span in spans], ["first", "second"])
+        self.assertIsNone(spans[0]["parent_id"])
+
+
+class GivenProxyWithTracing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingXMLRPCServer(
+            ("127.0.0.1", 0),
+            requestHandler=HeaderRecordingRequestHandler,
+            logRequests=False,
+        )
+        cls.server.register_function(lambda value: value, "Echo.echo")
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        host, port = self.server.server_address
+        self.rpc = TCMSProxy(f"http://{host}:{port}/RPC2", transport=CookieTransport())
+        self.exporter = tracing.InMemoryExporter()
+        tracing.set_exporter(self.exporter)
+        HeaderRecordingRequestHandler.headers_seen.clear()
+
+    def tearDown(self):
+        tracing.set_exporter(None)
+
+    def test_when_calling_then_span_is_propagated_to_server(self):
+        Operations().get_or_create(self.rpc)
+
+        rpc_span = self.exporter.spans[0]
+        operation_span = self.exporter.spans[1]
+        self.assertEqual(rpc_span.name, "Echo.echo")
+        self.assertEqual(operation_span.name, "Operations.get_or_create")
+        self.assertEqual(rpc_span.parent_id, operation_span.span_id)
+
+        headers = HeaderRecordingRequestHandler.headers_seen[-1]
+        self.assertEqual(
+            headers["traceparent"],
+            f"00-{rpc_span.trace_id}-{rpc_span.span_id}-01",
+        )
+        self.assertEqual(headers["X-Request-ID"], rpc_span.span_id)
+
+    def test_when_submitting_then_span_keeps_parent(self):
+        with tracing.span("job") as job:
+            self.rpc.Echo.echo.submit(1).result()
+
+        self.assertEqual(self.exporter.spans[0].parent_id, job.span_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
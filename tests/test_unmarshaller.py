@@ -0,0 +1,138 @@
+# pylint: disable=invalid-name
+import unittest
+from datetime import datetime
+from xmlrpc.client import Binary, DateTime, Fault, dumps, loads
+
+from tcms_api.records import Record
+from tcms_api.unmarshaller import FastUnmarshaller, LazyDateTime
+
+PARAMS = (
+    [
+        {
+            "id": 1,
+            "summary": "Test <&> case",
+            "is_automated": True,
+            "setup_duration": 1.5,
+            "text": None,
+            "tags": ["smoke", "regression"],
+            "plan": {"id": 3, "product": {"id": 4, "name": ""}},
+            "attachment": Binary(b"\x00\x01binary"),
+            "create_date": DateTime("20250102T03:04:05"),
+        },
+        {
+            "id": 2,
+            "summary": "Another test case",
+            "is_automated": False,
+            "setup_duration": 0.0,
+            "text": "text",
+            "tags": [],
+            "plan": {},
+            "attachment": Binary(b""),
+            "create_date": DateTime("20250102T03:04:06"),
+        },
+    ],
+)
+
+
+def fast_loads(body, chunk_size=7, **kwargs):
+    unmarshaller = FastUnmarshaller(**kwargs)
+    for i in range(0, len(body), chunk_size):
+        unmarshaller.feed(body[i : i + chunk_size])
+    return unmarshaller.close()
+
+
+class GivenXmlRpcResponse(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.body = dumps(PARAMS, methodresponse=True, allow_none=True).encode()
+
+    def test_when_decoding_then_result_matches_stdlib(self):
+        self.assertEqual(fast_loads(self.body), loads(self.body)[0])
+
+    def test_when_decoding_then_struct_keys_are_shared(self):
+        first, second = fast_loads(self.body)[0]
+
+        for key_1, key_2 in zip(first.keys(), second.keys()):
+            self.assertIs(key_1, key_2)
+
+    def test_when_decoding_then_dates_are_lazy(self):
+        create_date = fast_loads(self.body)[0][0]["create_date"]
+
+        self.assertIsInstance(create_date, LazyDateTime)
+        self.assertEqual(create_date.datetime, datetime(2025, 1, 2, 3, 4, 5))
+
+    def test_when_use_builtin_types_then_dates_are_datetime(self):
+        result = fast_loads(self.body, use_builtin_types=True)
+
+        self.assertEqual(result, loads(self.body, use_builtin_types=True)[0])
+        self.assertIsInstance(result[0][0]["create_date"], datetime)
+
+    def test_when_value_has_no_type_then_it_is_string(self):
+        body = b"<methodResponse><params><param><value>text</value></param></params>"
+        body += b"</methodResponse>"
+
+        self.assertEqual(fast_loads(body), ("text",))
+
+
+class GivenCompactRecords(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.body = dumps(PARAMS, methodresponse=True, allow_none=True).encode()
+
+    def test_when_decoding_then_rows_are_records(self):
+        result = fast_loads(self.body, compact_records=True)[0]
+
+        self.assertIsInstance(result[0], Record)
+        self.assertIsInstance(result[1], Record)
+        self.assertEqual(result, loads(self.body)[0][0])
+
+    def test_when_decoding_then_nested_structs_are_dicts(self):
+        row = fast_loads(self.body, compact_records=True)[0][0]
+
+        self.assertIs(type(row["plan"]), dict)
+        self.assertIs(type(row["plan"]["product"]), dict)
+        self.assertEqual(row["tags"], ["smoke", "regression"])
+
+    def test_when_strings_repeat_then_they_are_shared(self):
+        body = dumps(
+            (
+                [
+                    {"status": "".join(["PASS", "ED"])},
+                    {"status": "".join(["PASS", "ED"])},
+                ],
+            ),
+            methodresponse=True,
+        ).encode()
+
+        first, second = fast_loads(body, compact_records=True)[0]
+
+        self.assertIs(first["status"], second["status"])
+
+    def test_when_result_is_not_a_list_then_structs_are_dicts(self):
+        body = dumps(({"id": 1, "rows": [{"id": 2}]},), methodresponse=True).encode()
+
+        result = fast_loads(body, compact_records=True)[0]
+
+        self.assertIs(type(result), dict)
+        self.assertIs(type(result["rows"][0]), dict)
+
+    def test_when_decoding_fault_then_raises_fault(self):
+        body = dumps(Fault(-32603, "Internal error"), methodresponse=True).encode()
+
+        with self.assertRaises(Fault):
+            fast_loads(body, compact_records=True)
+
+
+class GivenXmlRpcFault(unittest.TestCase):
+    def test_when_decoding_then_raises_fault(self):
+        body = dumps(Fault(-32603, "Internal error"), methodresponse=True).encode()
+
+        with self.assertRaises(Fault) as context:
+            fast_loads(body)
+
+        self.assertEqual(context.exception.faultCode, -32603)
+        self.assertEqual(context.exception.faultString, "Internal error")
+
+
+if __name__ == "__main__":
+    unittest.main()